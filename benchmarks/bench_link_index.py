@@ -0,0 +1,97 @@
+"""
+링크 퍼지 매칭 벤치마크 (10k 링크 페이지)
+
+실행: python -m benchmarks.bench_link_index [--links 10000] [--queries 500]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from rapidfuzz import process
+
+from models.content_model import Link
+from utils.link_utils import LinkIndex
+
+SYLLABLES = "가나다라마바사아자차카타파하경제정치사회문화스포츠연예날씨국제부동산증권산업과학"
+WORDS = ["뉴스", "경제", "정치", "사회", "스포츠", "연예", "날씨", "랭킹", "오피니언", "구독", "로그인", "더보기"]
+
+
+def make_links(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    links = []
+    for i in range(count):
+        if rng.random() < 0.3:
+            text = rng.choice(WORDS)  # 메뉴/더보기처럼 중복 텍스트가 많은 링크
+        else:
+            text = " ".join(
+                "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+                for _ in range(rng.randint(1, 4))
+            )
+        links.append(Link(id=i, text=text, url=f"https://example.com/{i}"))
+    return links
+
+
+def make_queries(links: list, count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        text = rng.choice(links).text
+        if rng.random() < 0.5 and len(text) > 3:
+            # 일부 글자를 빼서 오타/부분 발화를 흉내
+            cut = rng.randint(0, len(text) - 2)
+            text = text[:cut] + text[cut + 1:]
+        queries.append(f"{text} 보여줘")
+    return queries
+
+
+def legacy_find_best_link(query: str, links: list):
+    # 이전 구현: 질의마다 dict를 다시 만들고 전체 텍스트에 extractOne 수행
+    candidates = {link.text: link for link in links}
+    best_match, score, _ = process.extractOne(query, candidates.keys())
+    if score > 60:
+        return candidates[best_match]
+    return None
+
+
+def _timed(fn, queries: list) -> dict:
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "mean_us": round(statistics.mean(samples), 1),
+        "p50_us": round(samples[len(samples) // 2], 1),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    links = make_links(args.links)
+    queries = make_queries(links, args.queries)
+
+    start = time.perf_counter()
+    index = LinkIndex(links)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    report = {
+        "links": args.links,
+        "unique_texts": len(index.texts),
+        "queries": args.queries,
+        "index_build_ms": round(build_ms, 2),
+        "indexed": _timed(index.best, queries),
+        "legacy": _timed(lambda q: legacy_find_best_link(q, links), queries[:50]),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+벤치마크용 가짜 업스트림 (OpenAI, 클로바 STT, 네이버 뉴스)
+
+실제 API 대신 httpx.MockTransport로 응답하며, 지연 시간은 로그정규 분포(중앙값, sigma)로 흉내낸다.
+install()은 서비스들이 공유하는 커넥션 풀 클라이언트를 가짜 전송 계층을 쓰는 클라이언트로 바꾼다.
+"""
+import asyncio
+import json
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict
+
+import httpx
+
+from services.content_service import NOT_FOUND_ANSWER
+
+# 이 문구가 질문에 들어 있으면 가짜 OpenAI가 "본문에는 없습니다" 안내문으로 답한다 (네/아니요 흐름용)
+NOT_IN_DOCUMENT_MARKER = "본문에없는질문"
+
+
+@dataclass
+class Latency:
+    """로그정규 분포 지연 시간 (median_ms=0이면 지연 없음)"""
+    median_ms: float
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median_ms / 1000), self.sigma)
+
+
+@dataclass
+class FakeUpstreams:
+    openai: Latency
+    stt: Latency
+    news: Latency
+    seed: int = 7
+    calls: Dict[str, int] = field(default_factory=lambda: {"openai": 0, "stt": 0, "news": 0})
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+
+    async def _delay(self, latency: Latency) -> None:
+        seconds = latency.sample(self.rng)
+        if seconds:
+            await asyncio.sleep(seconds)
+
+    async def handle_openai(self, request: httpx.Request) -> httpx.Response:
+        self.calls["openai"] += 1
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"data": [{"id": "gpt-4o"}, {"id": "gpt-4o-mini"}]})
+
+        payload = json.loads(request.content)
+        await self._delay(self.openai)
+
+        content = self._completion(payload)
+        usage = {"prompt_tokens": sum(len(m["content"]) for m in payload["messages"]) // 2,
+                 "completion_tokens": len(content) // 2}
+
+        if payload.get("stream"):
+            chunks = [content[i:i + 8] for i in range(0, len(content), 8)]
+            lines = [f"data: {json.dumps({'choices': [{'delta': {'content': c}}]}, ensure_ascii=False)}" for c in chunks]
+            lines.append(f"data: {json.dumps({'choices': [], 'usage': usage})}")
+            lines.append("data: [DONE]")
+            return httpx.Response(200, text="\n\n".join(lines) + "\n\n",
+                                  headers={"Content-Type": "text/event-stream"})
+
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": usage,
+        })
+
+    @staticmethod
+    def _completion(payload: dict) -> str:
+        user = payload["messages"][-1]["content"]
+        if payload["model"] == "gpt-4o-mini":
+            # 질문 분류 (yesno_service.classify_and_expand)
+            category = "term" if "뜻" in user else "article"
+            return json.dumps({"category": category, "keyword": "경제 전망"}, ensure_ascii=False)
+        if NOT_IN_DOCUMENT_MARKER in user:
+            return NOT_FOUND_ANSWER
+        return "본문에 따르면 올해 경제 성장률은 2퍼센트로 전망됩니다. " * 3
+
+    async def handle_stt(self, request: httpx.Request) -> httpx.Response:
+        self.calls["stt"] += 1
+        await request.aread()
+        await self._delay(self.stt)
+        return httpx.Response(200, json={"text": "오늘 경제 뉴스 보여줘", "confidence": 0.93})
+
+    async def handle_news(self, request: httpx.Request) -> httpx.Response:
+        self.calls["news"] += 1
+        await self._delay(self.news)
+        keyword = request.url.params.get("query", "")
+        display = int(request.url.params.get("display", 4))
+        return httpx.Response(200, json={"items": [
+            {"title": f"<b>{keyword}</b> 관련 기사 {i + 1}", "link": f"https://news.example.com/{i + 1}"}
+            for i in range(display)
+        ]})
+
+    def install(self) -> None:
+        from services import naver_stt_service
+        from services.llm_gateway import llm_gateway
+        from utils import naver_news_service
+
+        limits = httpx.Limits(max_connections=None)
+        llm_gateway._client = httpx.AsyncClient(
+            base_url=llm_gateway.base_url, limits=limits,
+            transport=httpx.MockTransport(self.handle_openai),
+        )
+        naver_stt_service._async_client = httpx.AsyncClient(
+            limits=limits, transport=httpx.MockTransport(self.handle_stt),
+        )
+        naver_news_service._client = httpx.AsyncClient(
+            limits=limits, transport=httpx.MockTransport(self.handle_news),
+        )
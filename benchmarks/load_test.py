@@ -0,0 +1,239 @@
+"""
+API 부하 테스트 (가짜 업스트림 + 프로세스 내 세션 저장소)
+
+main.py의 app을 같은 프로세스에서 띄우고 OpenAI / 클로바 STT / 네이버 뉴스는 가짜 업스트림으로 대체한다.
+엔드포인트별로 목표 동시성으로 요청을 보내 p50/p95/p99, 처리량, RSS를 JSON으로 출력한다.
+stt, summary_text는 요청마다 다른 음성/문서를 보내 결과 캐시 적중이 아닌 업스트림 경로를 잰다.
+
+실행: python -m benchmarks.load_test [--requests 500] [--concurrency 32] [--openai-ms 800] [--output report.json]
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import struct
+import time
+import wave
+from typing import Awaitable, Callable, Dict, List
+
+# 앱을 불러오기 전에 설정 (실제 키나 Redis 없이 기동)
+for _name in ("OPENAI_API_KEY", "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET",
+              "NAVER_NEWS_CLIENT_ID", "NAVER_NEWS_CLIENT_SECRET"):
+    os.environ.setdefault(_name, "benchmark")
+os.environ.setdefault("SESSION_STORE_BACKEND", "memory")
+
+# 요청마다 남는 INFO 로그가 측정을 왜곡하지 않도록 줄인다
+logging.disable(logging.INFO)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_upstreams import FakeUpstreams, Latency, NOT_IN_DOCUMENT_MARKER  # noqa: E402
+
+SCENARIOS = ["stt", "content_load", "content_ask", "content_yesno", "news_select", "summary_text"]
+
+PARAGRAPH = (
+    "한국은행은 올해 경제 성장률 전망을 2퍼센트로 유지했다. 물가 상승률은 점차 둔화될 것으로 보이며, "
+    "수출은 반도체를 중심으로 회복세를 이어가고 있다. 다만 내수 부진과 대외 불확실성은 여전히 위험 요인으로 꼽힌다. "
+)
+
+
+def make_wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    # 최소 업로드 크기(10KB)를 넘는 16bit 모노 WAV (무음 전처리에서 걸러지지 않도록 가운데에 440Hz 톤)
+    n = int(seconds * rate)
+    samples = bytearray()
+    for i in range(n):
+        value = int(8000 * math.sin(2 * math.pi * 440 * i / rate)) if n // 4 <= i < 3 * n // 4 else 0
+        samples += struct.pack("<h", value)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(bytes(samples))
+    return buffer.getvalue()
+
+
+def vary_wav(audio: bytes, index: int) -> bytes:
+    # 톤 가운데 샘플 하나를 요청마다 바꿔 STT 결과 캐시에 걸리지 않는 서로 다른 녹음을 만든다
+    varied = bytearray(audio)
+    struct.pack_into("<h", varied, len(audio) // 2 & ~1, 1000 + (4 * index) % 30000)
+    return bytes(varied)
+
+
+def make_document(index: int, paragraphs: int) -> dict:
+    text = "\n\n".join(f"[{index}-{p}] {PARAGRAPH * 2}" for p in range(paragraphs))
+    links = [{"id": i, "text": t, "url": f"https://example.com/{index}/{i}"}
+             for i, t in enumerate(["경제", "정치", "사회", "국제", "스포츠", "날씨"])]
+    return {"inner_text": text, "links": links}
+
+
+def rss_mb() -> float:
+    # 현재 RSS (리눅스는 /proc, 그 외에는 최대 RSS로 대신)
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return round(peak / 2**20 if platform.system() == "Darwin" else peak / 2**10, 1)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, int(round(q / 100 * len(samples) + 0.5)) - 1))
+    return samples[rank]
+
+
+async def run_scenario(name: str, request: Callable[[int], Awaitable[httpx.Response]],
+                       total: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                status = str((await request(i)).status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": total - statuses.get("200", 0),
+        "statuses": statuses,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "rss_mb_before": rss_before,
+        "rss_mb_after": rss_mb(),
+    }
+
+
+async def run(args) -> dict:
+    from main import app  # 환경 변수 설정 이후에 불러온다
+
+    upstreams = FakeUpstreams(
+        openai=Latency(args.openai_ms, args.sigma),
+        stt=Latency(args.stt_ms, args.sigma),
+        news=Latency(args.news_ms, args.sigma),
+        seed=args.seed,
+    )
+    upstreams.install()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        documents = [make_document(i, args.paragraphs) for i in range(args.documents)]
+        audio = make_wav()
+
+        # 질의/요약/뉴스 시나리오가 사용할 세션을 미리 만든다
+        contexts = []
+        for document in documents:
+            response = await client.post("/content/load", json=document)
+            contexts.append(response.json()["context_session_id"])
+
+        async def pending_session(i: int) -> str:
+            response = await client.post("/content/ask", params={"context_session_id": contexts[i % len(contexts)]},
+                                         json={"query": f"{NOT_IN_DOCUMENT_MARKER} {i}"})
+            return response.json()["pending_session_id"]
+
+        pendings = [await pending_session(i) for i in range(args.documents)]
+
+        # 요약은 요청마다 다른 문서로 보내 요약 캐시/요청 합치기가 아닌 실제 요약 경로를 잰다
+        summary_contexts = []
+        if "summary_text" in args.scenarios:
+            for i in range(args.requests):
+                response = await client.post("/content/load", json=make_document(args.documents + i, args.paragraphs))
+                summary_contexts.append(response.json()["context_session_id"])
+        news_response = await client.post("/content/yesno",
+                                          params={"pending_session_id": pendings[0], "context_session_id": contexts[0]},
+                                          json={"answer": "네"})
+        news_session_id = news_response.json()["news_session_id"]
+
+        queries = ["경제 성장률 전망은?", "물가는 어떻게 되나요", "수출 동향 알려줘", "경제 보여줘", "위험 요인은 뭐야"]
+        ordinals = ["첫 번째", "두번째", "세 번째 기사", "네번째 뉴스"]
+
+        requests = {
+            "stt": lambda i: client.post("/stt/", files={"audio_file": ("bench.wav", vary_wav(audio, i), "audio/wav")},
+                                         data={"lang": "Kor"}),
+            "content_load": lambda i: client.post("/content/load", json=documents[i % len(documents)]),
+            "content_ask": lambda i: client.post("/content/ask", params={"context_session_id": contexts[i % len(contexts)]},
+                                                 json={"query": f"{queries[i % len(queries)]} ({i})"}),
+            "content_yesno": lambda i: client.post("/content/yesno", params={
+                "pending_session_id": pendings[i % len(pendings)], "context_session_id": contexts[i % len(contexts)]},
+                json={"answer": "네"}),
+            "news_select": lambda i: client.post("/news/select", params={
+                "news_session_id": news_session_id, "query": ordinals[i % len(ordinals)]}),
+            "summary_text": lambda i: client.post("/summary/text", params={"context_session_id": summary_contexts[i]}),
+        }
+
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(name, requests[name], args.requests, args.concurrency)
+
+    return {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "documents": args.documents,
+            "paragraphs": args.paragraphs,
+            "latency_ms": {"openai": args.openai_ms, "stt": args.stt_ms, "news": args.news_ms, "sigma": args.sigma},
+            "session_store": os.environ["SESSION_STORE_BACKEND"],
+            "python": platform.python_version(),
+        },
+        "scenarios": results,
+        "upstream_calls": upstreams.calls,
+        "rss_mb": {"end": rss_mb(), "peak": max(rss_mb(), peak_rss_mb())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500, help="시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--documents", type=int, default=20, help="번갈아 사용할 서로 다른 문서 수")
+    parser.add_argument("--paragraphs", type=int, default=12, help="문서당 문단 수")
+    parser.add_argument("--openai-ms", type=float, default=800, help="가짜 OpenAI 지연 시간 중앙값")
+    parser.add_argument("--stt-ms", type=float, default=300, help="가짜 STT 지연 시간 중앙값")
+    parser.add_argument("--news-ms", type=float, default=80, help="가짜 뉴스 검색 지연 시간 중앙값")
+    parser.add_argument("--sigma", type=float, default=0.4, help="지연 시간 로그정규 분포 sigma")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="리포트를 저장할 JSON 파일 경로 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,23 @@ class Settings:
         # API 설정
         self.NAVER_STT_URL: str = "https://naveropenapi.apigw.ntruss.com/recog/v1/stt"
 
+        # STT 커넥션 풀 설정 (keep-alive로 TLS 세션 재사용)
+        self.STT_MAX_CONNECTIONS: int = int(os.getenv('STT_MAX_CONNECTIONS', '64'))
+        self.STT_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('STT_MAX_KEEPALIVE_CONNECTIONS', '32'))
+        self.STT_KEEPALIVE_EXPIRY: float = float(os.getenv('STT_KEEPALIVE_EXPIRY', '120'))  # 초
+        self.STT_TIMEOUT: float = float(os.getenv('STT_TIMEOUT', '30'))  # 초
+        self.STT_WARMUP_CONNECTIONS: int = int(os.getenv('STT_WARMUP_CONNECTIONS', '0'))  # 기동 시 미리 열어둘 커넥션 수
+
+        # Redis 설정 (docker-compose의 REDIS_URL 사용)
+        self.REDIS_URL: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self.REDIS_MAX_CONNECTIONS: int = int(os.getenv('REDIS_MAX_CONNECTIONS', '128'))
+        self.REDIS_SOCKET_TIMEOUT: float = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5'))  # 초
+        self.REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', '30'))  # 초
+
+        # 세션 저장소 백엔드 ('redis' 또는 단일 노드/테스트용 'memory')
+        self.SESSION_STORE_BACKEND: str = os.getenv('SESSION_STORE_BACKEND', 'redis').lower()
+        self.SESSION_STORE_MAX_ENTRIES: int = int(os.getenv('SESSION_STORE_MAX_ENTRIES', '10000'))  # memory 백엔드 최대 항목 수
+
         # Qdrant 설정
         self.QDRANT_HOST: str = os.getenv('QDRANT_HOST', 'localhost')
         self.QDRANT_PORT: int = int(os.getenv('QDRANT_PORT', '6333'))
@@ -29,9 +46,42 @@ class Settings:
         cors_env = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://localhost:5173')
         self.CORS_ORIGINS: list[str] = [o.strip() for o in cors_env.split(',') if o.strip()]
 
+        # 업스트림 상태 점검 주기 (/ready 응답은 이 주기로 갱신된 캐시 사용)
+        self.HEALTH_PROBE_INTERVAL: float = float(os.getenv('HEALTH_PROBE_INTERVAL', '60'))  # 초
+        self.HEALTH_PROBE_TIMEOUT: float = float(os.getenv('HEALTH_PROBE_TIMEOUT', '5'))  # 초
+
         # 파일 업로드 제한
         self.MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
         self.MIN_FILE_SIZE: int = 10000  # 10KB
+        self.STT_STREAM_CHUNK_SIZE: int = int(os.getenv('STT_STREAM_CHUNK_SIZE', str(64 * 1024)))  # 스트리밍 업로드 청크 크기 (64KB)
+
+        # 오디오 전처리 (/stt/ WAV 업로드를 모노/16kHz로 바꾸고 앞뒤 무음 제거)
+        self.STT_PREPROCESS_ENABLED: bool = os.getenv('STT_PREPROCESS_ENABLED', 'true').lower() == 'true'
+        # 전처리는 파일 전체를 메모리에 올리므로(원본의 몇 배) 이보다 큰 WAV는 전처리 없이 청크 단위로 그대로 보낸다
+        self.STT_PREPROCESS_MAX_BYTES: int = int(os.getenv('STT_PREPROCESS_MAX_BYTES', str(10 * 1024 * 1024)))  # 10MB (16kHz 모노 PCM16 약 5분)
+        self.STT_TARGET_SAMPLE_RATE: int = int(os.getenv('STT_TARGET_SAMPLE_RATE', '16000'))  # 이보다 높으면 다운샘플
+        self.STT_VAD_FRAME_MS: int = int(os.getenv('STT_VAD_FRAME_MS', '20'))  # 에너지 계산 프레임 길이
+        self.STT_SILENCE_THRESHOLD_DB: float = float(os.getenv('STT_SILENCE_THRESHOLD_DB', '-45'))  # 이 에너지(dBFS) 이하는 무음
+        self.STT_VAD_DYNAMIC_RANGE_DB: float = float(os.getenv('STT_VAD_DYNAMIC_RANGE_DB', '40'))  # 최대 에너지보다 이만큼 낮으면 무음
+        self.STT_SILENCE_PADDING_MS: int = int(os.getenv('STT_SILENCE_PADDING_MS', '200'))  # 음성 앞뒤로 남길 여유
+
+        # 긴 음성 분할 인식 (클로바 단문 인식 길이 제한 60초 안쪽으로 무음 지점에서 나눠 동시에 인식)
+        self.STT_SEGMENT_MAX_SECONDS: float = float(os.getenv('STT_SEGMENT_MAX_SECONDS', '50'))  # 이보다 길면 분할
+        self.STT_SEGMENT_MIN_SILENCE_MS: int = int(os.getenv('STT_SEGMENT_MIN_SILENCE_MS', '300'))  # 경계로 찾을 쉼 길이
+        self.STT_SEGMENT_CONCURRENCY: int = int(os.getenv('STT_SEGMENT_CONCURRENCY', '8'))  # 요청당 동시 구간 인식 수 (5분 음성의 구간 7개 안팎을 한 번에 처리)
+
+        # STT 결과 캐시 (정규화된 오디오 해시 + 언어 기준)
+        self.STT_CACHE_ENABLED: bool = os.getenv('STT_CACHE_ENABLED', 'true').lower() == 'true'
+        self.STT_CACHE_TTL: int = int(os.getenv('STT_CACHE_TTL', '86400'))  # 초 (1일)
+        self.STT_CACHE_MAX_ENTRIES: int = int(os.getenv('STT_CACHE_MAX_ENTRIES', '5000'))
+        self.STT_CACHE_MAX_BYTES: int = int(os.getenv('STT_CACHE_MAX_BYTES', str(2 * 1024 * 1024)))  # WAV가 아닌 업로드는 이 크기 이하만 모아서 캐시
+        self.STT_CACHE_FINGERPRINT_ENABLED: bool = os.getenv('STT_CACHE_FINGERPRINT_ENABLED', 'false').lower() == 'true'  # 거의 같은 녹음도 음향 지문으로 적중
+        self.STT_CACHE_FINGERPRINT_FRAME_MS: int = int(os.getenv('STT_CACHE_FINGERPRINT_FRAME_MS', '50'))
+        self.STT_CACHE_FINGERPRINT_MIN_FRAMES: int = int(os.getenv('STT_CACHE_FINGERPRINT_MIN_FRAMES', '16'))  # 이보다 짧은 녹음은 지문을 쓰지 않음
+
+        # 스트리밍 인식 (/stt/ws 발화 경계 판정)
+        self.STT_WS_END_SILENCE_MS: int = int(os.getenv('STT_WS_END_SILENCE_MS', '600'))  # 이만큼 조용하면 발화 끝
+        self.STT_WS_MIN_SPEECH_MS: int = int(os.getenv('STT_WS_MIN_SPEECH_MS', '200'))  # 이보다 짧은 소리는 무시
 
         # 지원 언어
         self.SUPPORTED_LANGUAGES: list[str] = ['Kor', 'Eng', 'Jpn', 'Chn']
@@ -45,6 +95,47 @@ class Settings:
         self.MAX_SUMMARY_LENGTH: int = int(os.getenv('MAX_SUMMARY_LENGTH', '800'))  # 기본값을 800자로 증가
         self.MIN_TEXT_LENGTH_FOR_SUMMARY: int = 1  # 최소 길이를 1자로 변경 (사실상 제거)
 
+        # 긴 문서 요약 (문단/문장 경계로 나눠 병렬 요약 후 합침)
+        self.SUMMARY_LONG_TEXT_CHARS: int = int(os.getenv('SUMMARY_LONG_TEXT_CHARS', '8000'))  # 이보다 길면 분할 요약
+        self.SUMMARY_CHUNK_CHARS: int = int(os.getenv('SUMMARY_CHUNK_CHARS', '3000'))
+        self.SUMMARY_MAP_CONCURRENCY: int = int(os.getenv('SUMMARY_MAP_CONCURRENCY', '4'))  # 요청당 동시 청크 요약 수
+        self.SUMMARY_CHUNK_MAX_TOKENS: int = int(os.getenv('SUMMARY_CHUNK_MAX_TOKENS', '300'))  # 청크 요약 출력 상한
+        self.SUMMARY_MAX_INPUT_TOKENS: int = int(os.getenv('SUMMARY_MAX_INPUT_TOKENS', '12000'))  # 한 번에 보내는 본문 토큰 상한 (추정치)
+
+        # 문서 질의 패시지 검색 설정 (/content/ask에 관련 패시지만 전송)
+        self.RETRIEVAL_ENABLED: bool = os.getenv('RETRIEVAL_ENABLED', 'true').lower() == 'true'
+        self.RETRIEVAL_TOP_K: int = int(os.getenv('RETRIEVAL_TOP_K', '4'))
+        self.RETRIEVAL_PASSAGE_CHARS: int = int(os.getenv('RETRIEVAL_PASSAGE_CHARS', '400'))
+        self.RETRIEVAL_MIN_TEXT_LENGTH: int = int(os.getenv('RETRIEVAL_MIN_TEXT_LENGTH', '2000'))  # 이보다 짧은 본문은 전체 전송
+
+        # 문서 질의 일괄 처리 (/content/ask/batch)
+        self.CONTENT_BATCH_MAX_QUERIES: int = int(os.getenv('CONTENT_BATCH_MAX_QUERIES', '20'))
+        self.CONTENT_BATCH_CONCURRENCY: int = int(os.getenv('CONTENT_BATCH_CONCURRENCY', '8'))  # 요청당 동시 LLM 호출 수
+
+        # 문서별 답변 캐시 (정규화 질문 일치 + 문자 bigram 유사도)
+        self.ANSWER_CACHE_ENABLED: bool = os.getenv('ANSWER_CACHE_ENABLED', 'true').lower() == 'true'
+        self.ANSWER_CACHE_SIMILARITY: float = float(os.getenv('ANSWER_CACHE_SIMILARITY', '0.85'))  # 유사 질문 판정 임계값 (0~1)
+        self.ANSWER_CACHE_MIN_FUZZY_LENGTH: int = int(os.getenv('ANSWER_CACHE_MIN_FUZZY_LENGTH', '6'))  # 이보다 짧은 질문은 정확히 일치할 때만
+        self.ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', '200'))  # 문서당 보관 질문 수
+        self.ANSWER_CACHE_TTL: int = int(os.getenv('ANSWER_CACHE_TTL', '3600'))  # 초
+
+        # 요약 캐시 설정 (본문 해시 기반, Redis 저장)
+        self.SUMMARY_CACHE_ENABLED: bool = os.getenv('SUMMARY_CACHE_ENABLED', 'true').lower() == 'true'
+        self.SUMMARY_CACHE_TTL: int = int(os.getenv('SUMMARY_CACHE_TTL', '86400'))  # 초 (1일)
+        self.SUMMARY_CACHE_MAX_ENTRIES: int = int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', '10000'))
+
+        # LLM 게이트웨이 설정 (공유 비동기 커넥션 풀)
+        self.OPENAI_API_BASE: str = os.getenv('OPENAI_API_BASE', 'https://api.openai.com/v1')
+        self.LLM_MAX_CONCURRENCY: int = int(os.getenv('LLM_MAX_CONCURRENCY', '256'))  # 동시에 진행 가능한 LLM 호출 수
+        self.LLM_MAX_CONNECTIONS: int = int(os.getenv('LLM_MAX_CONNECTIONS', '256'))
+        self.LLM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('LLM_MAX_KEEPALIVE_CONNECTIONS', '64'))
+        self.LLM_TIMEOUT: float = float(os.getenv('LLM_TIMEOUT', '60'))  # 초
+
+        # 동일 요청 합치기 (요약 / 문서 질의). DISTRIBUTED면 세션 저장소 잠금으로 워커 간에도 합친다
+        self.SINGLEFLIGHT_DISTRIBUTED: bool = os.getenv('SINGLEFLIGHT_DISTRIBUTED', 'false').lower() == 'true'
+        self.SINGLEFLIGHT_LOCK_TTL: int = int(os.getenv('SINGLEFLIGHT_LOCK_TTL', '90'))  # 초 (LLM_TIMEOUT보다 길게)
+        self.SINGLEFLIGHT_RESULT_TTL: int = int(os.getenv('SINGLEFLIGHT_RESULT_TTL', '10'))  # 초 (대기 중인 워커가 결과를 가져갈 시간)
+
     def validate(self):
         if not self.NAVER_CLIENT_ID or not self.NAVER_CLIENT_SECRET:
             raise ValueError("NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 .env 파일에 설정해주세요.")
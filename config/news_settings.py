@@ -7,6 +7,14 @@ class NewsSettings:
     def __init__(self):
         self.NAVER_CLIENT_ID: str = os.getenv("NAVER_NEWS_CLIENT_ID")
         self.NAVER_CLIENT_SECRET: str = os.getenv("NAVER_NEWS_CLIENT_SECRET")
+        self.NAVER_NEWS_URL: str = os.getenv("NAVER_NEWS_URL", "https://openapi.naver.com/v1/search/news.json")
+
+        # 검색 호출 (커넥션 풀 / 타임아웃)
+        self.NEWS_MAX_CONNECTIONS: int = int(os.getenv("NEWS_MAX_CONNECTIONS", "32"))
+        self.NEWS_TIMEOUT: float = float(os.getenv("NEWS_TIMEOUT", "3"))  # 초
+
+        # 키워드별 검색 결과 캐시 (속보 상황에서 같은 키워드 반복 검색 대비)
+        self.NEWS_CACHE_TTL: int = int(os.getenv("NEWS_CACHE_TTL", "60"))  # 초
 
         if not self.NAVER_CLIENT_ID or not self.NAVER_CLIENT_SECRET:
             raise ValueError("❌ NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 .env에 설정해주세요.")
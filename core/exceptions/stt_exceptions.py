@@ -20,6 +20,16 @@ class SummaryException(Exception):
     super().__init__(self.message)
 
 
+class LLMGatewayException(Exception):
+  """LLM 게이트웨이 호출 관련 예외"""
+
+  def __init__(self, message: str, code: str = None, status_code: int = None):
+    self.message = message
+    self.code = code
+    self.status_code = status_code
+    super().__init__(self.message)
+
+
 class VoiceOrderException(Exception):
 
   def __init__(self, message: str, code: str = None):
@@ -67,6 +77,56 @@ def validate_audio_file(audio_data: bytes, filename: str = None) -> None:
     )
 
 
+class AudioStreamValidator:
+  """업로드 청크를 받으면서 크기와 형식을 점진적으로 검사합니다."""
+
+  def __init__(self, expected_size: int = None):
+    from config.naver_stt_settings import settings
+
+    self.max_size = settings.MAX_FILE_SIZE
+    self.min_size = settings.MIN_FILE_SIZE
+    self.received = 0
+    self.format = None
+    self.header = None
+
+    # Content-Length 등으로 크기를 미리 알 수 있으면 업로드 전에 거른다
+    if expected_size is not None:
+      self._check_upper(expected_size)
+      if 0 < expected_size < self.min_size:
+        raise HTTPException(
+            status_code=400,
+            detail="음성이 너무 짧습니다. 최소 1초 이상 녹음해주세요."
+        )
+
+  def feed(self, chunk: bytes) -> None:
+    from utils.audio_utils import inspect_audio_header, unsupported_reason
+
+    if self.received == 0 and chunk:
+      # 컨테이너/코덱을 헤더로 판별해 클로바가 처리할 수 없는 입력은 업로드 전에 거른다
+      self.header = inspect_audio_header(chunk)
+      reason = unsupported_reason(self.header)
+      if reason:
+        raise HTTPException(status_code=400, detail=reason)
+      self.format = self.header.format
+
+    self.received += len(chunk)
+    self._check_upper(self.received)
+
+  def finish(self) -> None:
+    if self.received == 0:
+      raise HTTPException(status_code=400, detail="비어있는 오디오 파일입니다.")
+
+    if self.received < self.min_size:
+      raise HTTPException(
+          status_code=400,
+          detail="음성이 너무 짧습니다. 최소 1초 이상 녹음해주세요."
+      )
+
+  def _check_upper(self, size: int) -> None:
+    if size > self.max_size:
+      raise HTTPException(status_code=400, detail="파일 크기가 너무 큽니다. (최대 50MB)")
+
+
 def validate_language(lang: str) -> None:
   from config.naver_stt_settings import settings
 
@@ -1,13 +1,21 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from config.naver_stt_settings import settings, logger
 from routers import content_router, yesno_router, news_router
+from services.llm_gateway import llm_gateway
+from services import naver_stt_service
+from services.health_prober import health_prober
+from utils.redis_utils import close_store
+from utils import naver_news_service
+from utils.metrics import HTTP_REQUEST_LATENCY, HTTP_REQUESTS_IN_FLIGHT
 
 # 라우터 임포트
-from routers import stt
+from routers import stt, metrics
 try:
     from routers import summary
     HAS_SUMMARY = True
@@ -42,7 +50,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 지연 시간 / 처리 중 요청 수 기록
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    method = request.method
+    in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+    in_flight.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        in_flight.dec()
+        # 실제 URL 대신 라우트 템플릿으로 묶어 라벨 수가 늘어나지 않게 한다
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        HTTP_REQUEST_LATENCY.labels(method, route_path, str(status)).observe(time.perf_counter() - start)
+
 # 라우터 등록
+app.include_router(metrics.router)
 app.include_router(stt.router)
 app.include_router(content_router.router)
 app.include_router(yesno_router.router)
@@ -52,6 +80,23 @@ if HAS_SUMMARY:
 if HAS_HEALTH:
     app.include_router(health.router)
 
+# 기동 시 STT 커넥션 예열 (STT_WARMUP_CONNECTIONS > 0 인 경우) 및 상태 점검 시작
+@app.on_event("startup")
+async def warmup_upstream_clients():
+    if stt.stt_service:
+        await stt.stt_service.warmup()
+    # 업스트림 상태 백그라운드 점검 시작
+    health_prober.start()
+
+# 종료 시 공유 커넥션 풀 정리
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    await health_prober.stop()
+    await llm_gateway.aclose()
+    await naver_stt_service.close_clients()
+    await naver_news_service.close_client()
+    await close_store()
+
 # 루트 핑
 @app.get("/")
 def ping():
@@ -12,3 +12,6 @@ class ContentRequest(BaseModel):
 
 class UserQuery(BaseModel):
     query: str
+
+class BatchQuery(BaseModel):
+    queries: List[str]
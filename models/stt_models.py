@@ -1,6 +1,15 @@
 from pydantic import BaseModel
 from typing import Optional, List
 
+class STTSegment(BaseModel):
+    index: int
+    start: float  # 초
+    end: float
+    success: bool
+    text: Optional[str] = None
+    confidence: Optional[float] = None
+    error: Optional[str] = None
+
 class STTResponse(BaseModel):
     success: bool
     text: Optional[str] = None
@@ -8,6 +17,7 @@ class STTResponse(BaseModel):
     error: Optional[str] = None
     details: Optional[str] = None
     code: Optional[str] = None
+    segments: Optional[List[STTSegment]] = None  # 긴 음성을 나눠 인식한 경우 구간별 결과
 
 class SummaryRequest(BaseModel):
     language: Optional[str] = "ko"
@@ -33,3 +43,10 @@ class HealthResponse(BaseModel):
     service: str
     stt_service_available: bool
     openai_service_available: bool
+
+class ReadinessResponse(BaseModel):
+    status: str
+    stt_service_available: bool
+    openai_service_available: bool
+    checked_at: Optional[float] = None
+    age_seconds: Optional[float] = None
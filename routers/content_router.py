@@ -1,17 +1,48 @@
 from fastapi import APIRouter, HTTPException
-from models.content_model import ContentRequest, UserQuery
+from fastapi.responses import StreamingResponse
+from models.content_model import ContentRequest, UserQuery, BatchQuery
 from services import content_service
+from utils.sse_utils import format_sse
 
 
 router = APIRouter(prefix="/content", tags=["Content"])
 
 @router.post("/load")
-def load_content(content: ContentRequest):
-    return content_service.load_content(content.inner_text, content.links)
+async def load_content(content: ContentRequest):
+    return await content_service.load_content(content.inner_text, content.links)
 
 @router.post("/ask")
-def ask(context_session_id:str, query: UserQuery):
-    result = content_service.handle_query(context_session_id, query.query)
+async def ask(context_session_id:str, query: UserQuery):
+    result = await content_service.handle_query(context_session_id, query.query)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
+
+@router.post("/ask/batch")
+async def ask_batch(context_session_id: str, batch: BatchQuery):
+    # 같은 문서에 대한 여러 질문을 한 번에 처리 (결과는 질문 순서대로)
+    result = await content_service.handle_query_batch(context_session_id, batch.queries)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@router.post("/ask/stream")
+async def ask_stream(context_session_id: str, query: UserQuery):
+    # 답변을 token 이벤트로 흘려보내고, /ask와 같은 결과를 done 이벤트로 마무리
+    async def event_stream():
+        try:
+            async for item in content_service.handle_query_stream(context_session_id, query.query):
+                if isinstance(item, str):
+                    yield format_sse("token", {"delta": item})
+                elif "error" in item:
+                    yield format_sse("error", {"detail": item["error"]})
+                else:
+                    yield format_sse("done", item)
+        except Exception as e:
+            yield format_sse("error", {"detail": f"서버 처리 중 오류: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,43 +1,43 @@
-from fastapi import APIRouter
-from models.stt_models import HealthResponse, LanguagesResponse, LanguageInfo
+from fastapi import APIRouter, Response
+from models.stt_models import HealthResponse, ReadinessResponse, LanguagesResponse, LanguageInfo
 from config.naver_stt_settings import settings
+from services.health_prober import health_prober
+from utils.redis_utils import store
 
 router = APIRouter(tags=["Health"])
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-  # STT 서비스 사용 가능 여부 확인
-  try:
-    from services.naver_stt_service import NaverSTTService
-    stt_available = True
-    try:
-      NaverSTTService()
-    except:
-      stt_available = False
-  except:
-    stt_available = False
-
-  # OpenAI 서비스 사용 가능 여부 확인
-  try:
-    from services.openai_service import OpenAIService
-    openai_available = True
-    try:
-      openai_service = OpenAIService()
-      openai_available = openai_service.get_service_status()
-    except:
-      openai_available = False
-  except:
-    openai_available = False
-
+  # 프로세스 생존 여부만 즉시 응답 (업스트림 상태는 백그라운드 점검 결과 사용)
+  status = health_prober.status
   return HealthResponse(
       status="healthy",
       service="Naver STT & OpenAI Summary API",
-      stt_service_available=stt_available,
-      openai_service_available=openai_available
+      stt_service_available=status["stt_service_available"],
+      openai_service_available=status["openai_service_available"]
   )
 
 
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response):
+  # 마지막 점검 결과 기준 준비 상태 (업스트림 미사용 시 503)
+  ready = health_prober.ready
+  if not ready:
+    response.status_code = 503
+
+  return ReadinessResponse(
+      status="ready" if ready else "not_ready",
+      **health_prober.snapshot()
+  )
+
+
+@router.get("/store/stats")
+async def session_store_stats():
+  # 세션 저장소 백엔드와 저장 항목 수 / 사용량
+  return await store.size()
+
+
 @router.get("/languages", response_model=LanguagesResponse)
 async def get_supported_languages():
   language_map = {
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+  # Prometheus 수집용 (워커 프로세스별 값)
+  return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+import asyncio
+import json
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from services.naver_stt_service import NaverSTTService
+from services.streaming_stt_service import StreamingTranscriber
+from services.stt_cache import stt_cache
 from core.exceptions.stt_exceptions import (
-    validate_audio_file,
+    STTException,
     validate_language,
     handle_stt_errors,
 )
-from config.naver_stt_settings import logger
+from utils.audio_utils import validated_audio_stream, iter_upload_chunks
+from utils.audio_preprocess import preprocess_audio
+from config.naver_stt_settings import settings, logger
 
 router = APIRouter(prefix="/stt", tags=["STT"])
 
@@ -31,30 +39,30 @@ async def speech_to_text(
     validate_language(lang)
 
     try:
-        # 파일 읽기
-        audio_data = await audio_file.read()
-
-        # 파일 유효성 검사
-        validate_audio_file(audio_data, audio_file.filename)
+        # 파일 전체를 읽지 않고 청크 단위로 검사하면서 네이버로 전달
+        audio_stream = await validated_audio_stream(
+            iter_upload_chunks(audio_file), expected_size=audio_file.size
+        )
 
         logger.info(
-            f"음성 파일 처리 시작: {audio_file.filename}, 크기: {len(audio_data)} bytes, 언어: {lang}"
+            f"음성 파일 처리 시작: {audio_file.filename}, 크기: {audio_file.size} bytes, 언어: {lang}"
         )
 
-        # STT 변환
-        result = stt_service.convert_speech_to_text(audio_data, lang)
+        # STT_PREPROCESS_MAX_BYTES 이하 WAV는 모노/16kHz로 바꾸고 앞뒤 무음을 잘라 업로드 크기와 인식 시간을 줄인다
+        # (더 큰 파일은 청크 스트리밍 그대로)
+        audio_stream, upload_size, prepared = await preprocess_audio(audio_stream, audio_file.size)
 
-        # 에러 처리
-        error_response = handle_stt_errors(result)
-        if error_response:
-            return error_response
+        # 단문 인식 길이 제한을 넘는 음성은 무음 지점에서 나눠 동시에 인식한다
+        if prepared is not None and prepared.duration > settings.STT_SEGMENT_MAX_SECONDS:
+            return _respond(await stt_service.transcribe_long_async(prepared, lang))
 
-        if result["success"]:
-            logger.info(f"STT 변환 성공: {result['text'][:50]}...")
-        else:
-            logger.error(f"STT 변환 실패: {result['error']}")
+        # 전처리한 오디오나 작은 파일은 바이트로 넘겨 인식 결과 캐시를 쓴다
+        if prepared is not None:
+            return await _transcribe(prepared.data, lang, upload_size)
+        if stt_cache.enabled and upload_size and upload_size <= settings.STT_CACHE_MAX_BYTES:
+            return await _transcribe(b"".join([chunk async for chunk in audio_stream]), lang, upload_size)
 
-        return JSONResponse(content=result)
+        return await _transcribe(audio_stream, lang, upload_size)
 
     except HTTPException:
         raise
@@ -64,3 +72,122 @@ async def speech_to_text(
             status_code=500,
             content={"success": False, "error": f"서버 처리 중 오류: {str(e)}"},
         )
+
+
+@router.post("/stream")
+async def speech_to_text_stream(request: Request, lang: str = "Kor"):
+    """요청 본문(application/octet-stream)을 도착하는 대로 네이버로 스트리밍합니다."""
+    if not stt_service:
+        raise HTTPException(status_code=500, detail="STT 서비스가 초기화되지 않았습니다.")
+
+    validate_language(lang)
+
+    content_length = request.headers.get("content-length")
+    expected_size = int(content_length) if content_length and content_length.isdigit() else None
+
+    try:
+        audio_stream = await validated_audio_stream(request.stream(), expected_size=expected_size)
+
+        logger.info(f"스트리밍 음성 처리 시작: 크기: {expected_size} bytes, 언어: {lang}")
+
+        return await _transcribe(audio_stream, lang, expected_size)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"STT 스트리밍 처리 중 오류: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "error": f"서버 처리 중 오류: {str(e)}"},
+        )
+
+
+@router.get("/cache/stats")
+async def get_stt_cache_stats():
+    """STT 결과 캐시 적중/미적중 통계를 반환합니다."""
+    return JSONResponse(content=await stt_cache.stats())
+
+
+@router.websocket("/ws")
+async def speech_to_text_ws(websocket: WebSocket, lang: str = "Kor", sample_rate: int = 16000):
+    """녹음 중인 음성을 받아 발화가 끝날 때마다 인식 결과를 돌려줍니다.
+
+    클라이언트 → 서버: PCM16LE 모노 바이너리 프레임, 녹음이 끝나면 텍스트 {"type": "end"}
+    서버 → 클라이언트: 발화별 {"type": "partial", ...}, 마지막에 {"type": "final", ...}
+    """
+    await websocket.accept()
+
+    error = None
+    if not stt_service:
+        error = "STT 서비스가 초기화되지 않았습니다."
+    elif lang not in settings.SUPPORTED_LANGUAGES:
+        error = f"지원되지 않는 언어입니다. 지원 언어: {settings.SUPPORTED_LANGUAGES}"
+    elif not 8000 <= sample_rate <= 48000:
+        error = "지원하지 않는 샘플레이트입니다. (8000 ~ 48000Hz)"
+    if error:
+        await websocket.send_json({"type": "error", "error": error})
+        await websocket.close(code=1008)
+        return
+
+    transcriber = StreamingTranscriber(stt_service, lang, sample_rate)
+    # 수신과 별개로 결과가 나오는 대로 보낸다 (사용자가 말하는 도중에도 partial 전송)
+    sender = asyncio.create_task(_send_results(websocket, transcriber))
+    logger.info(f"스트리밍 음성 인식 시작: 언어: {lang}, 샘플레이트: {sample_rate}Hz")
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                transcriber.feed(message["bytes"])
+            elif message.get("text") and _is_end_message(message["text"]):
+                break
+
+        transcriber.finish()
+        await sender
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info("스트리밍 음성 인식 연결 종료")
+    except STTException as e:
+        await websocket.send_json({"type": "error", "error": e.message, "code": e.code})
+        await websocket.close(code=1009)
+    finally:
+        sender.cancel()
+        await transcriber.close()
+
+
+def _is_end_message(text: str) -> bool:
+    try:
+        return json.loads(text).get("type") == "end"
+    except (ValueError, AttributeError):
+        return False
+
+
+async def _send_results(websocket: WebSocket, transcriber: StreamingTranscriber) -> None:
+    async for message in transcriber.results():
+        await websocket.send_json(message)
+
+
+async def _transcribe(audio: Union[bytes, AsyncIterator[bytes]], lang: str,
+                      content_length: Optional[int] = None):
+    # STT 변환
+    result = await stt_service.convert_speech_to_text_async(
+        audio, lang, content_length=content_length
+    )
+    return _respond(result)
+
+
+def _respond(result: dict):
+    # 에러 처리
+    error_response = handle_stt_errors(result)
+    if error_response:
+        return error_response
+
+    if result["success"]:
+        logger.info(f"STT 변환 성공: {result['text'][:50]}...")
+    else:
+        logger.error(f"STT 변환 실패: {result['error']}")
+
+    return JSONResponse(content=result)
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from services.openai_service import OpenAIService
+from services.summary_cache import summary_cache
+from services.health_prober import health_prober
 from models.stt_models import SummaryResponse
 from core.exceptions.stt_exceptions import (
     validate_summary_text, 
     validate_summary_parameters
 )
 from config.naver_stt_settings import logger
-from utils.redis_utils import r   # Redis 클라이언트 가져오기
+from utils.redis_utils import get_context   # 세션 포인터 → 본문 문서 해석
+from utils.sse_utils import format_sse
 import json
 
 router = APIRouter(prefix="/summary", tags=["Summary"])
@@ -27,18 +30,7 @@ async def summarize_text(context_session_id: str, language: str = "ko"):
     if not openai_service:
         raise HTTPException(status_code=503, detail="요약 서비스를 사용할 수 없습니다.")
 
-    raw_context = r.get(f"context:{context_session_id}")
-    if not raw_context:
-        raise HTTPException(status_code=404, detail="해당 세션의 본문을 찾을 수 없습니다.")
-
-    try:
-        context_data = json.loads(raw_context)
-        text = context_data.get("inner_text", "")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="본문 데이터를 불러오는 중 오류가 발생했습니다.")
-
-    if not text.strip():
-        raise HTTPException(status_code=400, detail="본문이 비어 있습니다.")
+    text = await _load_session_text(context_session_id)
     # 입력 검증
     # validate_summary_text(request.text)
     # validate_summary_parameters(request.language)
@@ -47,7 +39,7 @@ async def summarize_text(context_session_id: str, language: str = "ko"):
     try:
         logger.info(f"텍스트 요약 요청: 길이={len(text)}자, 언어={language}")
         
-        result = openai_service.summarize_text(
+        result = await openai_service.summarize_text(
             text=text,
             language=language
         )
@@ -70,17 +62,62 @@ async def summarize_text(context_session_id: str, language: str = "ko"):
         raise HTTPException(status_code=500, detail=f"서버 처리 중 오류: {str(e)}")
 
 
+@router.post("/text/stream")
+async def summarize_text_stream(context_session_id: str, language: str = "ko"):
+    """텍스트 요약을 SSE로 스트리밍합니다. (token 이벤트 반복 후 done 이벤트로 종료)"""
+    if not openai_service:
+        raise HTTPException(status_code=503, detail="요약 서비스를 사용할 수 없습니다.")
+
+    text = await _load_session_text(context_session_id)
+    validate_summary_parameters(language)
+
+    logger.info(f"텍스트 요약 스트리밍 요청: 길이={len(text)}자, 언어={language}")
+
+    async def event_stream():
+        async for item in openai_service.summarize_text_stream(text, language):
+            if isinstance(item, SummaryResponse):
+                # 마지막 이벤트: /summary/text와 같은 SummaryResponse 필드 (원문 제외)
+                yield format_sse("done", item.dict(exclude={"original_text"}))
+            else:
+                yield format_sse("token", {"delta": item})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _load_session_text(context_session_id: str) -> str:
+    # 세션에 저장된 본문을 불러온다
+    try:
+        context_data = await get_context(context_session_id)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=500, detail="본문 데이터를 불러오는 중 오류가 발생했습니다.")
+
+    if not context_data:
+        raise HTTPException(status_code=404, detail="해당 세션의 본문을 찾을 수 없습니다.")
+
+    text = context_data.get("inner_text", "")
+
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="본문이 비어 있습니다.")
+    return text
+
+
 @router.get("/status")
 async def get_summary_service_status():
     """요약 서비스 상태를 반환합니다."""
-    try:
-        openai_available = openai_service is not None
-        if openai_service:
-            openai_available = openai_service.get_service_status()
-    except:
-        openai_available = False
+    # 업스트림 호출 없이 백그라운드 점검 결과 사용
+    openai_available = openai_service is not None and health_prober.status["openai_service_available"]
     
     return JSONResponse(content={
         "status": "ok" if openai_available else "unavailable",
         "openai_service_available": openai_available
     })
+
+
+@router.get("/cache/stats")
+async def get_summary_cache_stats():
+    """요약 캐시 적중/미적중 통계를 반환합니다."""
+    return JSONResponse(content=await summary_cache.stats())
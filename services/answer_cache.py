@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from config.naver_stt_settings import settings, logger
+from utils.metrics import record_cache
+from utils.query_classifier import content_words, strip_particle
+from utils.redis_utils import store
+from utils.session_store import SessionStore
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def normalize_question(query: str) -> str:
+    """띄어쓰기, 문장부호, 대소문자, 어절 끝 조사 차이를 없앤 질문 문자열"""
+    words = _WORD_RE.findall(unicodedata.normalize("NFKC", query).lower())
+    return "".join(strip_particle(word) for word in words)
+
+
+def char_ngrams(text: str, n: int = 2) -> set:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def similarity(a: set, b: set) -> float:
+    # Dice 계수 (조사/어미가 조금 달라도 높게 나온다)
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class AnswerCache:
+    """문서(내용 해시)별 질문-답변 캐시
+
+    정규화한 질문이 같으면 바로 적중하고, 다르면 문자 bigram 유사도가 임계값 이상인 가장 비슷한 질문의 답을 쓴다.
+    유사 적중은 내용어 서명(content_signature)이 같을 때만 인정해 띄어쓰기, 조사, 어미 차이만 흡수한다.
+    ("한국/미국", "장점/단점"처럼 내용어가 다르면 글자가 비슷해도 다른 질문)
+
+    답변은 문서와 내용어 서명별 해시(버킷)에 질문별 필드로 저장해, 조회 시 같은 서명의 버킷 하나만 읽고 비교한다.
+    문서별 색인 해시에는 질문마다 버킷과 저장 시각을 적어 최근 max_entries개만 남긴다.
+    필드 단위 저장이라 동시에 여러 답을 저장해도 서로 덮어쓰지 않으며,
+    해시는 마지막 저장부터 ANSWER_CACHE_TTL 동안 유지된다.
+    답변 원문만 저장하므로 "본문에는 없습니다" 답변도 적중 시 새 pending 세션으로 처리된다.
+    """
+
+    KEY_PREFIX = "answer_cache:v3:"
+
+    def __init__(self, threshold: float = None, max_entries: int = None, ttl: int = None,
+                 entries: SessionStore = store):
+        self.enabled = settings.ANSWER_CACHE_ENABLED
+        self.threshold = threshold or settings.ANSWER_CACHE_SIMILARITY
+        self.max_entries = max_entries or settings.ANSWER_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.ANSWER_CACHE_TTL
+        self.entries = entries
+
+    def _key(self, content_hash: str) -> str:
+        return f"{self.KEY_PREFIX}{content_hash}"
+
+    def _bucket_key(self, content_hash: str, signature: str) -> str:
+        digest = hashlib.sha256(signature.encode("utf-8")).hexdigest()[:16]
+        return f"{self.KEY_PREFIX}{content_hash}:{digest}"
+
+    async def _load(self, key: str) -> List[dict]:
+        try:
+            fields = await self.entries.hgetall(key)
+            return [json.loads(raw) for raw in fields.values()]
+        except (redis.RedisError, json.JSONDecodeError) as e:
+            logger.warning(f"답변 캐시 조회 실패: {str(e)}")
+            return []
+
+    async def get(self, content_hash: str, query: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        bucket = self._bucket_key(content_hash, content_signature(content_words(query)))
+        match = self.find(await self._load(bucket), query)
+        record_cache("answer", match is not None)
+        if match is None:
+            return None
+
+        entry, score = match
+        if score < 1.0:
+            logger.info(f"답변 캐시 유사 질문 적중: '{query}' ≈ '{entry['q']}' ({score:.2f})")
+        return entry["answer"]
+
+    def find(self, entries: List[dict], query: str) -> Optional[Tuple[dict, float]]:
+        normalized = normalize_question(query)
+        signature = content_signature(content_words(query))
+        # 버킷 해시가 겹치더라도 서명이 다른 질문은 후보에서 뺀다
+        entries = [entry for entry in entries if content_signature(entry.get("w", [])) == signature]
+        for entry in entries:
+            if entry["q"] == normalized:
+                return entry, 1.0
+
+        # 너무 짧은 질문은 글자 하나 차이로 뜻이 달라지므로 정확히 일치할 때만 사용
+        if len(normalized) < settings.ANSWER_CACHE_MIN_FUZZY_LENGTH:
+            return None
+
+        # 숫자(연도, 금액 등)가 다르면 비슷해 보여도 다른 질문
+        digits = _DIGITS_RE.findall(normalized)
+        grams = char_ngrams(normalized)
+        best, best_score = None, 0.0
+        for entry in entries:
+            if _DIGITS_RE.findall(entry["q"]) != digits:
+                continue
+            score = similarity(grams, char_ngrams(entry["q"]))
+            if score > best_score:
+                best, best_score = entry, score
+        if best is not None and best_score >= self.threshold:
+            return best, best_score
+        return None
+
+    async def set(self, content_hash: str, query: str, answer: str) -> None:
+        if not self.enabled:
+            return
+
+        normalized = normalize_question(query)
+        words = content_words(query)
+        now = time.time()
+        entry = {"q": normalized, "w": words, "answer": answer, "t": now}
+        key = self._key(content_hash)
+        bucket = self._bucket_key(content_hash, content_signature(words))
+        try:
+            count, _ = await asyncio.gather(
+                self.entries.hset(key, normalized, json.dumps({"b": bucket, "t": now}), self.ttl),
+                self.entries.hset(bucket, normalized, json.dumps(entry, ensure_ascii=False), self.ttl),
+            )
+            if count > self.max_entries:
+                await self._evict(key, count - self.max_entries)
+        except redis.RedisError as e:
+            logger.warning(f"답변 캐시 저장 실패: {str(e)}")
+
+    async def _evict(self, key: str, overflow: int) -> None:
+        # 가장 오래전에 저장된 질문부터 색인과 버킷에서 지운다 (필드 단위 삭제라 다른 저장과 충돌하지 않음)
+        index = {field: json.loads(raw) for field, raw in (await self.entries.hgetall(key)).items()}
+        oldest = sorted(index, key=lambda field: index[field].get("t", 0))[:overflow]
+        buckets: Dict[str, List[str]] = {}
+        for field in oldest:
+            buckets.setdefault(index[field]["b"], []).append(field)
+        await asyncio.gather(
+            self.entries.hdel(key, *oldest),
+            *(self.entries.hdel(bucket, *fields) for bucket, fields in buckets.items()),
+        )
+
+
+def content_signature(words: List[str]) -> str:
+    """유사 질문 후보를 묶는 내용어 서명
+
+    내용어 집합이 같으면 같은 값이고, 정렬해 붙여 쓰므로 "경제 성장률"/"경제성장률"처럼
+    띄어쓰기만 다른 내용어도 대개 같은 값이 된다.
+    """
+    return "".join(sorted(set(words)))
+
+
+# 전역 캐시 인스턴스
+answer_cache = AnswerCache()
@@ -1,14 +1,20 @@
+import asyncio
 from typing import List, Optional
 from models.content_model import Link
 from services.openai_service import OpenAIService  # OpenAIService 있는 파일 import
-import openai
-from utils.link_utils import find_best_link
-from utils.redis_utils import save_pending_query
+from services.llm_gateway import llm_gateway
+from utils.link_utils import LinkIndex, get_cached_link_index, cache_link_index
+from utils.intent_router import route_utterance
+from utils.redis_utils import (
+    save_pending_query, save_context, get_context, save_passage_index
+)
+from utils.passage_index import build_passage_index, select_passages
+from utils.singleflight import create_singleflight
+from services.summary_cache import hash_text
+from services.answer_cache import answer_cache
+from config.naver_stt_settings import settings, logger
 
-import json
 from typing import List
-from utils.redis_utils import r
-import uuid
 
 # 전역 저장소 (데모용)
 current_text: Optional[str] = None
@@ -16,24 +22,32 @@ current_links: List[Link] = []
 
 openai_service = OpenAIService()
 
+# 같은 문서에 같은 질문이 동시에 들어오면 한 번의 LLM 호출 결과를 함께 사용
+_ask_flight = create_singleflight("ask")
+
 # 전역변수로 context 불러오기
-# def load_content(inner_text: str, links: List[Link]):
+# async def load_content(inner_text: str, links: List[Link]):
 #     global current_text, current_links
 #     current_text = inner_text
 #     current_links = links
 #     return {"message": "Content loaded successfully", "links_count": len(current_links)}
 
-def load_content(inner_text: str, links: List[Link], expire: int = 3600):
-    session_id = str(uuid.uuid4())
+async def load_content(inner_text: str, links: List[Link], expire: int = 3600):
+    # 본문은 내용 해시 기준으로 한 번만 저장되고, 세션에는 포인터만 남는다
+    session_id, content_hash, created = await save_context(
+        inner_text,
+        [link.dict() for link in links],  # Link Pydantic 모델을 dict로 변환
+        expire
+    )
 
-    key = f"context:{session_id}"
+    # 링크 퍼지 매칭 색인을 미리 만들어 둔다 (이동 요청 시 바로 사용)
+    if get_cached_link_index(content_hash) is None:
+        cache_link_index(content_hash, LinkIndex(links))
 
-    context_data = {
-        "inner_text": inner_text,
-        "links": [link.dict() for link in links]  # Link Pydantic 모델을 dict로 변환
-    }
+    # 긴 본문은 로드 시점에 패시지 검색 색인을 만들어 둔다 (같은 문서는 한 번만)
+    if created and _uses_retrieval(inner_text):
+        await save_passage_index(content_hash, build_passage_index(inner_text, settings.RETRIEVAL_PASSAGE_CHARS), expire)
 
-    r.setex(key, expire, json.dumps(context_data, ensure_ascii=False))
     return {
         "status": "success",           # 처리 상태
         "context_session_id": session_id,      # 반드시 반환
@@ -41,84 +55,223 @@ def load_content(inner_text: str, links: List[Link], expire: int = 3600):
     }
 
 # redis를 context로 불러오는 메소드
-def get_content(session_id: str) -> dict:
-    key = f"context:{session_id}"
-    data = r.get(key)
-    if not data:
-        return {}
+async def get_content(session_id: str, with_index: bool = False) -> dict:
+    return await get_context(session_id, with_index)
+
+# 본문에 없는 내용일 때 모델이 답하도록 지시한 문구
+NOT_FOUND_ANSWER = "본문에는 없습니다. 해당 내용에 대해 찾아드릴까요? 네/아니요로 대답해주세요."
 
-    return json.loads(data)
 
-def handle_query(session_id:str, query: str):
+async def handle_query(session_id:str, query: str):
     # 전역변수로 불로오는 방식
     # global current_text, current_links
     #
     # if current_text is None:
     #     return {"error": "No content loaded yet"}
 
-    context = get_content(session_id)
+    context = await get_content(session_id, with_index=True)
+    if not context or "inner_text" not in context:
+        return {"error": "No content loaded yet"}
+
+    # 1) 이동 의도 판단: "보여줘", "열어줘" 등 이동 동사 포함 여부
+    if route_utterance(query).navigate:
+        return _navigate(query, context)
+
+    # 2) 이동 의도가 아니면 GPT로 문서 기반 답변 (캐시 → 동일 문서/질문의 동시 요청은 한 번만 호출)
+    return await _answer_query(context, query)
+
+
+async def handle_query_batch(session_id: str, queries: List[str]) -> dict:
+    """
+    같은 문서에 대한 여러 질문을 한 번에 처리합니다.
+
+    문서는 한 번만 불러오고, 이동 요청은 바로 처리하며, 나머지 질문은 동시 호출 상한 안에서 병렬로 답한다.
+    결과는 질문 순서대로 반환한다.
+    """
+    if len(queries) > settings.CONTENT_BATCH_MAX_QUERIES:
+        return {"error": f"한 번에 최대 {settings.CONTENT_BATCH_MAX_QUERIES}개의 질문만 처리할 수 있습니다."}
+
+    context = await get_content(session_id, with_index=True)
     if not context or "inner_text" not in context:
         return {"error": "No content loaded yet"}
 
-    inner_text: str = context["inner_text"]                         # <-- 수정 포인트
+    semaphore = asyncio.Semaphore(settings.CONTENT_BATCH_CONCURRENCY)
+
+    async def answer_one(query: str) -> dict:
+        if route_utterance(query).navigate:
+            return _navigate(query, context)
+        try:
+            async with semaphore:
+                # 같은 배치 안의 중복 질문도 한 번만 호출된다
+                return await _answer_query(context, query)
+        except Exception as e:
+            logger.error(f"일괄 질의 처리 중 오류: {str(e)}")
+            return {"error": f"답변 생성 중 오류: {str(e)}"}
+
+    results = await asyncio.gather(*(answer_one(query) for query in queries))
+    return {"status": "success", "results": list(results)}
+
+
+async def _answer_query(context: dict, query: str) -> dict:
+    # 같은 문서에 같은(비슷한) 질문을 한 적이 있으면 저장된 답변 사용 (pending 세션은 새로 만든다)
+    cached = await answer_cache.get(_content_hash(context), query)
+    if cached is not None:
+        return await _finalize_answer(query, cached)
+
+    return await _ask_flight.do(_ask_key(context, query), lambda: _answer(context, query))
+
+
+async def _answer(context: dict, query: str) -> dict:
+    document = await _select_document(context, query)
+    answer = await llm_gateway.chat("gpt-4o", messages=_build_answer_messages(document, query))
+    await answer_cache.set(_content_hash(context), query, answer)
+
+    # 3) "본문에는 없습니다" → pending_query 저장
+    return await _finalize_answer(query, answer)
+
+
+def _content_hash(context: dict) -> str:
+    # 포인터 도입 이전 형식 세션은 본문으로 해시를 만든다
+    return context.get("content_hash") or hash_text(context["inner_text"])
+
+
+def _ask_key(context: dict, query: str) -> str:
+    return f"{_content_hash(context)}:{hash_text(' '.join(query.split()))}"
+
+
+async def handle_query_stream(session_id: str, query: str):
+    """
+    handle_query의 스트리밍 버전.
+
+    답변 텍스트 조각(str)을 생성되는 대로 내보내고, 마지막에 handle_query와 같은 결과(dict)를 한 번 내보낸다.
+    이동 요청("보여줘" 등)은 LLM 호출 없이 결과만 즉시 내보낸다.
+    """
+    context = await get_content(session_id, with_index=True)
+    if not context or "inner_text" not in context:
+        yield {"error": "No content loaded yet"}
+        return
+
+    if route_utterance(query).navigate:
+        yield _navigate(query, context)
+        return
+
+    cached = await answer_cache.get(_content_hash(context), query)
+    if cached is not None:
+        if "해당 내용에 대해 찾아" not in cached:
+            yield cached
+        yield await _finalize_answer(query, cached)
+        return
+
+    document = await _select_document(context, query)
+    chunks: List[str] = []
+    held = True  # "본문에는 없습니다" 안내문일 수 있는 앞부분은 확인될 때까지 보류
+    async for delta in llm_gateway.chat_stream("gpt-4o", messages=_build_answer_messages(document, query)):
+        chunks.append(delta)
+        if not held:
+            yield delta
+            continue
+
+        head = "".join(chunks).lstrip()
+        if NOT_FOUND_ANSWER.startswith(head) or head.startswith(NOT_FOUND_ANSWER[:8]):
+            continue
+        held = False
+        yield head
+
+    # 안내문 여부와 pending 세션은 마지막 결과에서 알린다
+    answer = "".join(chunks)
+    await answer_cache.set(_content_hash(context), query, answer)
+    yield await _finalize_answer(query, answer)
+
+
+def _uses_retrieval(inner_text: str) -> bool:
+    return settings.RETRIEVAL_ENABLED and len(inner_text) >= settings.RETRIEVAL_MIN_TEXT_LENGTH
+
+
+async def _select_document(context: dict, query: str) -> str:
+    # 긴 본문은 질문과 관련된 상위 패시지만 프롬프트에 넣는다
+    inner_text: str = context["inner_text"]
+    if not _uses_retrieval(inner_text):
+        return inner_text
+
+    content_hash = context.get("content_hash")
+    index = context.get("passage_index")
+    if index is None:
+        # 색인이 없는 문서(이전 형식 세션 등)는 즉석에서 만들어 문서의 남은 TTL만큼 저장한다
+        index = build_passage_index(inner_text, settings.RETRIEVAL_PASSAGE_CHARS)
+        if content_hash:
+            await save_passage_index(content_hash, index)
+
+    passages = select_passages(inner_text, index, query, settings.RETRIEVAL_TOP_K)
+    logger.info(f"패시지 검색: {len(index['spans'])}개 중 {len(passages)}개 전송 ({len(inner_text)}자 → {sum(map(len, passages))}자)")
+    return "\n\n".join(passages)
+
+
+def _parse_links(context: dict) -> List[Link]:
     link_dicts = context.get("links", [])
-    links: List[Link] = [
+    return [
         (ld if isinstance(ld, Link) else Link(**ld)) for ld in link_dicts
     ]
 
 
-    # 1) 이동 의도 판단: "보여줘"라는 단어 포함 여부
-    if "보여줘" in query:
-        # best_link = find_best_link(query, current_links)
-        best_link = find_best_link(query, links)
-        if best_link:
-            return {
-                "status" : "success",
-                # "type": "navigation",
-                "response": f"{best_link.text} 페이지로 이동합니다.",
-                "url": best_link.url
-            }
+def _link_index(context: dict) -> LinkIndex:
+    # 같은 문서의 링크 색인은 프로세스 내에 캐시해 두고 재사용
+    content_hash = context.get("content_hash")
+    index = get_cached_link_index(content_hash) if content_hash else None
+    if index is None:
+        index = LinkIndex(_parse_links(context))
+        if content_hash:
+            cache_link_index(content_hash, index)
+    return index
+
+
+def _navigate(query: str, context: dict) -> dict:
+    # best_link = find_best_link(query, current_links)
+    best_link = _link_index(context).best(query)
+    if best_link:
         return {
-            "status": "success",
+            "status" : "success",
             # "type": "navigation",
-            "response": "이동할 링크가 없습니다."
+            "response": f"{best_link.text} 페이지로 이동합니다.",
+            "url": best_link.url
         }
+    return {
+        "status": "success",
+        # "type": "navigation",
+        "response": "이동할 링크가 없습니다."
+    }
 
-    # 2) 이동 의도가 아니면 GPT로 문서 기반 답변
-    response = openai.ChatCompletion.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "너는 사용자가 제공한 문서를 기반으로만 답해야 한다. "
-                    "사용자가 본문에 없는 내용을 추천해달라고 하거나, 알려달라고 요청하는 경우에도 본문에 없는 내용은 절대 말하지 마."
-                    "본문 안에 존재하는 내용일 경우에만 필요 시 간단히 요약해서 대답해줘."
-                    "문서에 없는 내용은 '본문에는 없습니다. 해당 내용에 대해 찾아드릴까요? 네/아니요로 대답해주세요.' 라고 반드시 답해라."
-                )
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"다음은 사용자가 제공한 문서입니다:\n\n"
-                    # f"{current_text}\n\n"
-                    f"{inner_text}\n\n"
-                    f"이 문서를 참고해서, 사용자의 질문에 답해줘.\n\n"
-                    f"질문: {query}"
-                )
-            }
-        ]
-    )
 
-    answer = response.choices[0].message.content
+def _build_answer_messages(inner_text: str, query: str) -> List[dict]:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "너는 사용자가 제공한 문서를 기반으로만 답해야 한다. "
+                "사용자가 본문에 없는 내용을 추천해달라고 하거나, 알려달라고 요청하는 경우에도 본문에 없는 내용은 절대 말하지 마."
+                "본문 안에 존재하는 내용일 경우에만 필요 시 간단히 요약해서 대답해줘."
+                f"문서에 없는 내용은 '{NOT_FOUND_ANSWER}' 라고 반드시 답해라."
+            )
+        },
+        {
+            "role": "user",
+            "content": (
+                f"다음은 사용자가 제공한 문서입니다:\n\n"
+                # f"{current_text}\n\n"
+                f"{inner_text}\n\n"
+                f"이 문서를 참고해서, 사용자의 질문에 답해줘.\n\n"
+                f"질문: {query}"
+            )
+        }
+    ]
+
 
-    # 3) "본문에는 없습니다" → pending_query 저장
+async def _finalize_answer(query: str, answer: str) -> dict:
     if "해당 내용에 대해 찾아" in answer:
-        session_id = save_pending_query(query)  # Redis에 저장
+        session_id = await save_pending_query(query)  # Redis에 저장
         return {
             "status": "success",
             # "type": "summary",
-            "response": "본문에는 없습니다. 해당 내용에 대해 찾아드릴까요? 네/아니요로 대답해주세요.",
+            "response": NOT_FOUND_ANSWER,
             "pending_session_id": session_id
         }
 
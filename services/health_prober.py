@@ -0,0 +1,90 @@
+import asyncio
+import time
+from typing import Optional
+
+from config.naver_stt_settings import settings, logger
+
+
+class HealthProber:
+    """업스트림(STT, OpenAI) 상태를 백그라운드에서 주기적으로 점검하고 결과를 캐시합니다.
+
+    /health, /ready 요청은 업스트림을 직접 호출하지 않고 이 캐시만 읽는다.
+    """
+
+    def __init__(self, interval: float = None, timeout: float = None):
+        self.interval = interval or settings.HEALTH_PROBE_INTERVAL
+        self.timeout = timeout or settings.HEALTH_PROBE_TIMEOUT
+        self.status = {
+            "stt_service_available": False,
+            "openai_service_available": False,
+        }
+        self.checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.checked_at is not None and all(self.status.values())
+
+    def snapshot(self) -> dict:
+        return {
+            **self.status,
+            "checked_at": self.checked_at,
+            "age_seconds": round(time.time() - self.checked_at, 1) if self.checked_at else None,
+        }
+
+    async def probe_once(self) -> dict:
+        stt_available, openai_available = await asyncio.gather(
+            self._probe(self._check_stt, "STT"),
+            self._probe(self._check_openai, "OpenAI"),
+        )
+        self.status = {
+            "stt_service_available": stt_available,
+            "openai_service_available": openai_available,
+        }
+        self.checked_at = time.time()
+        return self.status
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.warning(f"업스트림 상태 점검 실패: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def _probe(self, check, name: str) -> bool:
+        try:
+            return await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} 상태 점검 시간 초과")
+            return False
+        except Exception as e:
+            logger.warning(f"{name} 상태 점검 실패: {str(e)}")
+            return False
+
+    @staticmethod
+    async def _check_stt() -> bool:
+        from services.naver_stt_service import NaverSTTService
+        return await NaverSTTService().check_available()
+
+    @staticmethod
+    async def _check_openai() -> bool:
+        from services.openai_service import OpenAIService
+        return await OpenAIService().get_service_status()
+
+
+# 전역 상태 점검기 인스턴스
+health_prober = HealthProber()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+from config.naver_stt_settings import settings, logger
+from core.exceptions.stt_exceptions import LLMGatewayException
+from utils.metrics import track_upstream, record_tokens
+
+
+class LLMGateway:
+    """OpenAI Chat Completions 호출을 위한 공유 비동기 게이트웨이
+
+    모든 LLM 호출(요약, 문서 질의, 질문 분류)은 이 게이트웨이를 거친다.
+    keep-alive 커넥션 풀을 공유하고, 세마포어로 동시 호출 수를 제한한다.
+    """
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 max_concurrency: Optional[int] = None,
+                 max_connections: Optional[int] = None,
+                 max_keepalive_connections: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.base_url = (base_url or settings.OPENAI_API_BASE).rstrip('/')
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.max_connections = max_connections or settings.LLM_MAX_CONNECTIONS
+        self.max_keepalive_connections = (
+            max_keepalive_connections or settings.LLM_MAX_KEEPALIVE_CONNECTIONS
+        )
+        self.timeout = timeout or settings.LLM_TIMEOUT
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 첫 호출 시점에 커넥션 풀 생성 (이후 프로세스 수명 동안 재사용)
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+            )
+        return self._client
+
+    async def chat_completion(self, model: str, messages: List[dict], **params) -> dict:
+        """Chat Completions API를 호출하고 응답 JSON을 그대로 반환합니다."""
+        if not self.api_key:
+            raise LLMGatewayException("OPENAI_API_KEY가 설정되지 않았습니다.", code="invalid_api_key")
+
+        payload = {"model": model, "messages": messages, **params}
+
+        async with self._semaphore:
+            with track_upstream("openai", "chat_completion"):
+                try:
+                    response = await self.client.post("/chat/completions", json=payload)
+                except httpx.TimeoutException:
+                    raise LLMGatewayException("LLM 요청 시간 초과", code="timeout")
+                except httpx.HTTPError as e:
+                    raise LLMGatewayException(f"LLM 네트워크 오류: {str(e)}", code="network_error")
+
+                if response.status_code != 200:
+                    raise self._build_error(response)
+
+        data = response.json()
+        record_tokens(model, data.get("usage"))
+        return data
+
+    async def chat(self, model: str, messages: List[dict], **params) -> str:
+        """Chat Completions API를 호출하고 첫 번째 응답 메시지 본문만 반환합니다."""
+        data = await self.chat_completion(model, messages, **params)
+        return data["choices"][0]["message"]["content"]
+
+    async def chat_stream(self, model: str, messages: List[dict], **params) -> AsyncIterator[str]:
+        """stream=True로 Chat Completions API를 호출하고 생성되는 텍스트 조각을 순서대로 반환합니다."""
+        if not self.api_key:
+            raise LLMGatewayException("OPENAI_API_KEY가 설정되지 않았습니다.", code="invalid_api_key")
+
+        # include_usage: 마지막 청크에 토큰 사용량을 받는다
+        payload = {"model": model, "messages": messages, "stream": True,
+                   "stream_options": {"include_usage": True}, **params}
+
+        # 스트림이 끝날 때까지 동시 호출 슬롯을 점유한다
+        async with self._semaphore:
+            with track_upstream("openai", "chat_stream"):
+                try:
+                    async with self.client.stream("POST", "/chat/completions", json=payload) as response:
+                        if response.status_code != 200:
+                            await response.aread()
+                            raise self._build_error(response)
+
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                break
+
+                            chunk = json.loads(data)
+                            record_tokens(model, chunk.get("usage"))
+                            choices = chunk.get("choices") or []
+                            delta = choices[0].get("delta", {}).get("content") if choices else None
+                            if delta:
+                                yield delta
+                except httpx.TimeoutException:
+                    raise LLMGatewayException("LLM 요청 시간 초과", code="timeout")
+                except httpx.HTTPError as e:
+                    raise LLMGatewayException(f"LLM 네트워크 오류: {str(e)}", code="network_error")
+
+    async def list_models(self) -> dict:
+        """모델 목록을 조회합니다. (과금되지 않는 요청이라 상태 확인에 사용)"""
+        if not self.api_key:
+            raise LLMGatewayException("OPENAI_API_KEY가 설정되지 않았습니다.", code="invalid_api_key")
+
+        with track_upstream("openai", "list_models"):
+            try:
+                response = await self.client.get("/models")
+            except httpx.TimeoutException:
+                raise LLMGatewayException("LLM 요청 시간 초과", code="timeout")
+            except httpx.HTTPError as e:
+                raise LLMGatewayException(f"LLM 네트워크 오류: {str(e)}", code="network_error")
+
+            if response.status_code != 200:
+                raise self._build_error(response)
+
+        return response.json()
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    @staticmethod
+    def _build_error(response: httpx.Response) -> LLMGatewayException:
+        # OpenAI 오류 코드(rate_limit_exceeded, invalid_api_key 등)를 메시지에 포함시킨다
+        code = None
+        message = response.text
+        try:
+            error = response.json().get("error") or {}
+            code = error.get("code") or error.get("type")
+            message = error.get("message", message)
+        except ValueError:
+            pass
+
+        logger.error(f"LLM API 오류: {response.status_code}, {code}, {message}")
+        return LLMGatewayException(
+            f"{code}: {message}" if code else message,
+            code=code,
+            status_code=response.status_code,
+        )
+
+
+# 전역 게이트웨이 인스턴스
+llm_gateway = LLMGateway()
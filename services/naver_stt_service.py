@@ -1,6 +1,54 @@
-import requests
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+import httpx
+from fastapi import HTTPException
 from config.naver_stt_settings import settings, logger
 from models.stt_models import STTResponse
+from services.stt_cache import stt_cache
+from utils.audio_preprocess import PreprocessedAudio, encode_wav, split_at_silence, trim_silence
+from utils.metrics import track_upstream
+
+# 프로세스 전역에서 공유하는 keep-alive 커넥션 풀
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+
+
+def _pool_options() -> dict:
+  return {
+    "limits": httpx.Limits(
+        max_connections=settings.STT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.STT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.STT_KEEPALIVE_EXPIRY
+    ),
+    "timeout": httpx.Timeout(settings.STT_TIMEOUT, connect=10.0),
+    "http2": False
+  }
+
+
+def get_async_client() -> httpx.AsyncClient:
+  global _async_client
+  if _async_client is None or _async_client.is_closed:
+    _async_client = httpx.AsyncClient(**_pool_options())
+  return _async_client
+
+
+def get_sync_client() -> httpx.Client:
+  global _sync_client
+  if _sync_client is None or _sync_client.is_closed:
+    _sync_client = httpx.Client(**_pool_options())
+  return _sync_client
+
+
+async def close_clients() -> None:
+  global _async_client, _sync_client
+  if _async_client is not None and not _async_client.is_closed:
+    await _async_client.aclose()
+  if _sync_client is not None and not _sync_client.is_closed:
+    _sync_client.close()
+  _async_client = None
+  _sync_client = None
+
 
 class NaverSTTService:
 
@@ -18,36 +66,171 @@ class NaverSTTService:
       'Content-Type': 'application/octet-stream'
     }
 
+  async def convert_speech_to_text_async(self,
+      audio_data: Union[bytes, AsyncIterator[bytes]],
+      lang: str = 'Kor', content_length: int = None) -> dict:
+    # 메모리에 있는 오디오는 같은 녹음의 이전 인식 결과를 먼저 찾는다
+    cacheable = isinstance(audio_data, bytes)
+    if cacheable:
+      cached = await stt_cache.get(audio_data, lang)
+      if cached:
+        return cached
+
+    with track_upstream('naver_stt', 'recognize') as call:
+      result = await self._recognize_async(audio_data, lang, content_length)
+      if not result["success"]:
+        call.outcome = "error"
+
+    if cacheable:
+      await stt_cache.set(audio_data, lang, result)
+    return result
+
+  async def _recognize_async(self,
+      audio_data: Union[bytes, AsyncIterator[bytes]],
+      lang: str, content_length: Optional[int]) -> dict:
+    # audio_data가 청크 스트림이면 받은 순서대로 네이버로 흘려보낸다
+    headers = self.headers
+    if content_length is not None:
+      headers = {**self.headers, 'Content-Length': str(content_length)}
+
+    try:
+      response = await get_async_client().post(
+          self.api_url,
+          headers=headers,
+          params={'lang': lang},
+          content=audio_data
+      )
+      return self._parse_response(response)
+
+    except HTTPException:
+      # 스트리밍 중 업로드 검증 실패는 그대로 라우터로 전달
+      raise
+    except httpx.TimeoutException:
+      return {"success": False, "error": "요청 시간 초과"}
+    except httpx.HTTPError as e:
+      return {"success": False, "error": f"네트워크 오류: {str(e)}"}
+    except Exception as e:
+      return {"success": False, "error": f"처리 중 오류: {str(e)}"}
+
+  async def transcribe_long_async(self, audio: PreprocessedAudio,
+      lang: str = 'Kor') -> dict:
+    """긴 음성을 무음 지점에서 나눠 동시에 인식하고 순서대로 이어 붙입니다."""
+    rate = audio.sample_rate
+    bounds = split_at_silence(audio.samples, rate)
+    semaphore = asyncio.Semaphore(settings.STT_SEGMENT_CONCURRENCY)
+
+    async def _recognize(start: int, end: int) -> Optional[dict]:
+      segment = trim_silence(audio.samples[start:end], rate)
+      if segment is None:
+        return None  # 쉼만 있는 구간은 보내지 않는다
+      data = encode_wav(segment, rate)
+      async with semaphore:
+        return await self.convert_speech_to_text_async(data, lang, content_length=len(data))
+
+    results = await asyncio.gather(*(_recognize(start, end) for start, end in bounds))
+    logger.info(f"긴 음성 분할 인식: {audio.duration:.1f}초, {len(bounds)}개 구간")
+    return self._stitch_segments(bounds, results, rate, offset=audio.offset,
+      original_duration=audio.original_duration)
+
+  @staticmethod
+  def _stitch_segments(bounds: List[Tuple[int, int]], results: List[Optional[dict]],
+      rate: int, offset: float = 0.0, original_duration: Optional[float] = None) -> dict:
+    # 구간 시각은 업로드한 원본 기준 (전처리에서 잘라내거나 채운 앞부분 길이 offset을 더하고 원본 범위로 자른다)
+    limit = original_duration if original_duration is not None else float("inf")
+    segments = []
+    texts = []
+    weighted_confidence = 0.0
+    voiced_seconds = 0.0
+
+    for index, ((start, end), result) in enumerate(zip(bounds, results)):
+      if result is None:
+        continue
+      segment = {
+        "index": index,
+        "start": round(min(limit, max(0.0, offset + start / rate)), 2),
+        "end": round(min(limit, max(0.0, offset + end / rate)), 2),
+        "success": result["success"],
+      }
+      if result["success"]:
+        segment.update(text=result["text"], confidence=result["confidence"])
+        if result["text"]:
+          texts.append(result["text"].strip())
+        # 전체 신뢰도는 구간 길이로 가중 평균
+        weighted_confidence += result["confidence"] * (end - start) / rate
+        voiced_seconds += (end - start) / rate
+      else:
+        segment["error"] = result["error"]
+      segments.append(segment)
+
+    failures = [result for result in results if result and not result["success"]]
+    if failures and len(failures) == len(segments):
+      return {**failures[0], "segments": segments}
+
+    return {
+      "success": True,
+      "text": " ".join(texts),
+      "confidence": round(weighted_confidence / voiced_seconds, 4) if voiced_seconds else 0,
+      "segments": segments,
+    }
+
   def convert_speech_to_text(self, audio_data: bytes,
       lang: str = 'Kor') -> dict:
+    # 동기 호출용 얇은 래퍼 (동일한 풀 설정과 응답 처리 공유)
     try:
-      params = {'lang': lang}
-      response = requests.post(
+      response = get_sync_client().post(
           self.api_url,
           headers=self.headers,
-          params=params,
-          data=audio_data,
-          timeout=30
+          params={'lang': lang},
+          content=audio_data
       )
+      return self._parse_response(response)
 
-      if response.status_code == 200:
-        result = response.json()
-        return {
-          "success": True,
-          "text": result.get('text', ''),
-          "confidence": result.get('confidence', 0)
-        }
-      else:
-        logger.error(f"STT API 오류: {response.status_code}, {response.text}")
-        return {
-          "success": False,
-          "error": f"API 오류: {response.status_code}",
-          "details": response.text
-        }
-
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
       return {"success": False, "error": "요청 시간 초과"}
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
       return {"success": False, "error": f"네트워크 오류: {str(e)}"}
     except Exception as e:
       return {"success": False, "error": f"처리 중 오류: {str(e)}"}
+
+  async def warmup(self, connections: int = None) -> None:
+    """기동 시 커넥션을 미리 열어 TLS 핸드셰이크 비용을 첫 요청에서 제거합니다."""
+    connections = settings.STT_WARMUP_CONNECTIONS if connections is None else connections
+    if connections <= 0:
+      return
+
+    client = get_async_client()
+
+    async def _open():
+      try:
+        await client.head(self.api_url, headers=self.headers)
+      except httpx.HTTPError as e:
+        logger.warning(f"STT 커넥션 예열 실패: {str(e)}")
+
+    await asyncio.gather(*(_open() for _ in range(connections)))
+    logger.info(f"STT 커넥션 {connections}개 예열 완료")
+
+  async def check_available(self) -> bool:
+    """STT 엔드포인트에 도달 가능한지 확인합니다. (음성 인식 요청은 보내지 않음)"""
+    try:
+      response = await get_async_client().head(self.api_url, headers=self.headers)
+      return response.status_code < 500
+    except httpx.HTTPError as e:
+      logger.warning(f"STT 서비스 상태 확인 실패: {str(e)}")
+      return False
+
+  @staticmethod
+  def _parse_response(response: httpx.Response) -> dict:
+    if response.status_code == 200:
+      result = response.json()
+      return {
+        "success": True,
+        "text": result.get('text', ''),
+        "confidence": result.get('confidence', 0)
+      }
+
+    logger.error(f"STT API 오류: {response.status_code}, {response.text}")
+    return {
+      "success": False,
+      "error": f"API 오류: {response.status_code}",
+      "details": response.text
+    }
@@ -1,18 +1,59 @@
-import openai
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, List, Optional, Union
 from config.naver_stt_settings import settings, logger
 from models.stt_models import SummaryResponse
+from services.llm_gateway import llm_gateway
+from services.summary_cache import summary_cache
+from utils.singleflight import create_singleflight
+from utils.passage_index import split_passages
+from utils.token_budget import estimate_tokens, truncate_to_tokens
+
+# 같은 본문/언어/모델 요약이 동시에 들어오면 한 번의 LLM 호출 결과를 함께 사용
+_summary_flight = create_singleflight("summary")
 
 class OpenAIService:
     """OpenAI API를 활용한 텍스트 요약 서비스"""
+
+    # 프롬프트를 바꾸면 버전을 올려 기존 요약 캐시를 무효화한다
+    PROMPT_VERSION = "v1"
+
+    # 언어별 프롬프트 설정
+    PROMPTS = {
+        "ko": """당신은 뉴스 분석 AI입니다. 입력된 텍스트를 분석하여 다음과 같이 응답해주세요:
+
+**케이스 1: 검색 결과 페이지인 경우**
+- 텍스트에 "검색결과", "관련도순", "최신순" 등이 포함되어 있으면
+- "[주제] 관련 뉴스를 검색하면 다음과 같은 헤드라인들을 볼 수 있습니다:"로 시작
+- 발견된 뉴스 헤드라인들을 "첫째, [제목] - [한 줄 요약]" "둘째, [제목] - [한 줄 요약]" 형식으로 순서대로 나열
+- "더 자세한 정보가 필요한 뉴스가 있다면 해당 뉴스 내용을 알려주세요."로 마무리
+
+**케이스 2: 구체적인 뉴스 기사인 경우**
+- 특정 언론사 기사 내용이 포함되어 있으면
+- 기사의 핵심 내용을 3-4문장으로 간결하게 요약
+- 5W1H (누가, 언제, 어디서, 무엇을, 왜, 어떻게)를 중심으로 정리
+- 중요한 키워드와 수치는 정확히 포함
+
+현재 입력된 텍스트를 분석하여 적절한 형식으로 응답해주세요."""
+    }
+
+    # 긴 문서 분할 요약 시 청크별 프롬프트 (결과는 위 프롬프트로 다시 합쳐진다)
+    CHUNK_PROMPTS = {
+        "ko": """당신은 긴 문서의 일부를 요약하는 AI입니다. 입력은 전체 문서 중 {index}/{total}번째 부분입니다.
+- 핵심 사실, 인물, 날짜, 수치를 빠짐없이 3-5문장으로 정리하세요.
+- 뉴스 헤드라인 목록이면 각 헤드라인과 한 줄 요약을 그대로 유지하세요.
+- 이 부분에 없는 내용은 추측하지 마세요."""
+    }
+
+    # 분할 요약을 반복할 최대 횟수 (청크 요약을 합쳐도 길면 한 번 더 나눈다)
+    MAX_REDUCE_ROUNDS = 3
     
     def __init__(self):
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
         
         try:
-            # 단순한 방식으로 API 키 설정
-            openai.api_key = settings.OPENAI_API_KEY
+            # 모든 호출은 공유 LLM 게이트웨이(커넥션 풀)를 통해 전송
+            self.gateway = llm_gateway
             
             self.model = settings.OPENAI_MODEL
             self.max_summary_length = settings.MAX_SUMMARY_LENGTH
@@ -24,7 +65,7 @@ class OpenAIService:
             logger.error(f"OpenAI 서비스 초기화 실패: {str(e)}")
             raise ValueError(f"OpenAI 서비스 초기화 실패: {str(e)}")
     
-    def summarize_text(self, text: str, language: str = "ko") -> SummaryResponse:
+    async def summarize_text(self, text: str, language: str = "ko") -> SummaryResponse:
         """
         텍스트를 요약합니다.
         
@@ -38,100 +79,193 @@ class OpenAIService:
         try:
             # 입력 텍스트 길이 검증
             if len(text.strip()) < self.min_text_length:
-                return SummaryResponse(
-                    success=False,
-                    error=f"텍스트가 너무 짧습니다. 최소 {self.min_text_length}자 이상이어야 합니다."
-                )
+                return self._too_short_response()
             
-            # 요약 길이 설정
-            target_length = self.max_summary_length
+            # 동일 본문/언어/모델/프롬프트 요약이 캐시에 있으면 바로 반환
+            cached = await summary_cache.get(text, language, self.model, self.PROMPT_VERSION)
+            if cached:
+                logger.info(f"요약 캐시 적중: {len(text)}자")
+                return cached
+
+            key = summary_cache.make_key(text, language, self.model, self.PROMPT_VERSION)
+            return await _summary_flight.do(
+                key,
+                lambda: self._summarize(text, language),
+                encode=lambda result: result.dict(exclude={"original_text"}),
+                decode=lambda data: SummaryResponse(original_text=text, **data)
+            )
             
-            # 언어별 프롬프트 설정
-            prompts = {
-                "ko": """당신은 뉴스 분석 AI입니다. 입력된 텍스트를 분석하여 다음과 같이 응답해주세요:
+        except Exception as e:
+            return self._error_response(e)
 
-**케이스 1: 검색 결과 페이지인 경우**
-- 텍스트에 "검색결과", "관련도순", "최신순" 등이 포함되어 있으면
-- "[주제] 관련 뉴스를 검색하면 다음과 같은 헤드라인들을 볼 수 있습니다:"로 시작
-- 발견된 뉴스 헤드라인들을 "첫째, [제목] - [한 줄 요약]" "둘째, [제목] - [한 줄 요약]" 형식으로 순서대로 나열
-- "더 자세한 정보가 필요한 뉴스가 있다면 해당 뉴스 내용을 알려주세요."로 마무리
+    async def _summarize(self, text: str, language: str) -> SummaryResponse:
+        # 긴 문서는 청크 요약을 먼저 모은 뒤 그 결과를 최종 요약한다
+        source = await self._condense(text, language)
 
-**케이스 2: 구체적인 뉴스 기사인 경우**
-- 특정 언론사 기사 내용이 포함되어 있으면
-- 기사의 핵심 내용을 3-4문장으로 간결하게 요약
-- 5W1H (누가, 언제, 어디서, 무엇을, 왜, 어떻게)를 중심으로 정리
-- 중요한 키워드와 수치는 정확히 포함
+        # OpenAI API 호출 (공유 비동기 게이트웨이)
+        summary = await self.gateway.chat(self.model, **self._build_request(source, language))
 
-현재 입력된 텍스트를 분석하여 적절한 형식으로 응답해주세요."""
-            }
-            
-            system_prompt = prompts.get(language, prompts["ko"])
-            
-            # OpenAI API 호출 (구버전 방식)
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=min(target_length * 2, 1000),
-                temperature=0.3,
-                top_p=0.9
+        result = self._build_result(text, summary)
+        await summary_cache.set(text, language, self.model, self.PROMPT_VERSION, result)
+        return result
+
+    async def summarize_text_stream(self, text: str, language: str = "ko") -> AsyncIterator[Union[str, SummaryResponse]]:
+        """
+        텍스트를 스트리밍으로 요약합니다.
+
+        모델이 생성하는 텍스트 조각(str)을 도착하는 대로 내보내고,
+        마지막에 summarize_text와 동일한 SummaryResponse를 한 번 내보냅니다.
+        """
+        try:
+            if len(text.strip()) < self.min_text_length:
+                yield self._too_short_response()
+                return
+
+            cached = await summary_cache.get(text, language, self.model, self.PROMPT_VERSION)
+            if cached:
+                logger.info(f"요약 캐시 적중: {len(text)}자")
+                yield cached.summary
+                yield cached
+                return
+
+            # 청크 요약(map)은 한 번에 끝내고 최종 합치기 단계만 스트리밍
+            source = await self._condense(text, language)
+
+            chunks = []
+            async for delta in self.gateway.chat_stream(self.model, **self._build_request(source, language)):
+                chunks.append(delta)
+                yield delta
+
+            result = self._build_result(text, "".join(chunks))
+            await summary_cache.set(text, language, self.model, self.PROMPT_VERSION, result)
+            yield result
+
+        except Exception as e:
+            yield self._error_response(e)
+
+    def _is_long(self, text: str) -> bool:
+        return (len(text) > settings.SUMMARY_LONG_TEXT_CHARS
+                or estimate_tokens(text) > settings.SUMMARY_MAX_INPUT_TOKENS)
+
+    async def _condense(self, text: str, language: str) -> str:
+        """
+        최종 요약 프롬프트에 넣을 본문을 만듭니다.
+
+        짧은 본문은 그대로 반환하고, 긴 본문은 문단/문장 경계로 나눠 청크별 요약을 병렬로 만든 뒤 이어 붙인다.
+        이어 붙인 결과도 길면 같은 과정을 반복하고, 끝까지 길면 토큰 상한에 맞춰 자른다.
+        """
+        source = text
+        for _ in range(self.MAX_REDUCE_ROUNDS):
+            if not self._is_long(source):
+                return source
+            chunks = [source[start:end] for start, end in split_passages(source, self._chunk_chars())]
+            partials = await self._summarize_chunks(chunks, language)
+            logger.info(f"분할 요약: {len(source)}자 → 청크 {len(chunks)}개 → {sum(map(len, partials))}자")
+            source = "\n\n".join(partials)
+
+        return truncate_to_tokens(source, settings.SUMMARY_MAX_INPUT_TOKENS)
+
+    def _chunk_chars(self) -> int:
+        # 청크 하나가 입력 토큰 상한을 넘지 않도록 (한 글자 = 최대 1토큰으로 추정)
+        return max(1, min(settings.SUMMARY_CHUNK_CHARS, settings.SUMMARY_MAX_INPUT_TOKENS))
+
+    async def _summarize_chunks(self, chunks: List[str], language: str) -> List[str]:
+        # 요청 하나가 게이트웨이 동시 호출 슬롯을 독점하지 않도록 요청 단위로도 제한
+        semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+        prompt = self.CHUNK_PROMPTS.get(language, self.CHUNK_PROMPTS["ko"])
+
+        async def summarize_chunk(index: int, chunk: str) -> str:
+            async with semaphore:
+                summary = await self.gateway.chat(
+                    self.model,
+                    messages=[
+                        {"role": "system", "content": prompt.format(index=index, total=len(chunks))},
+                        {"role": "user", "content": chunk}
+                    ],
+                    max_tokens=settings.SUMMARY_CHUNK_MAX_TOKENS,
+                    temperature=0.3
+                )
+            return summary.strip()
+
+        # 결과는 원문 순서대로 합쳐진다
+        return await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks, start=1)))
+
+    def _build_request(self, text: str, language: str) -> dict:
+        # 요약 길이 설정
+        target_length = self.max_summary_length
+
+        system_prompt = self.PROMPTS.get(language, self.PROMPTS["ko"])
+
+        return {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
+            ],
+            "max_tokens": min(target_length * 2, 1000),
+            "temperature": 0.3,
+            "top_p": 0.9
+        }
+
+    def _build_result(self, text: str, summary: str) -> SummaryResponse:
+        summary = summary.strip()
+
+        # 결과 계산
+        original_length = len(text)
+        summary_length = len(summary)
+        compression_ratio = round((1 - summary_length / original_length) * 100, 2)
+        
+        logger.info(f"텍스트 요약 완료: {original_length}자 → {summary_length}자 (압축률: {compression_ratio}%)")
+        
+        return SummaryResponse(
+            success=True,
+            original_text=text,
+            summary=summary,
+            original_length=original_length,
+            summary_length=summary_length,
+            compression_ratio=compression_ratio
+        )
+
+    def _too_short_response(self) -> SummaryResponse:
+        return SummaryResponse(
+            success=False,
+            error=f"텍스트가 너무 짧습니다. 최소 {self.min_text_length}자 이상이어야 합니다."
+        )
+
+    def _error_response(self, e: Exception) -> SummaryResponse:
+        error_message = str(e)
+        logger.error(f"요약 처리 중 오류: {error_message}")
+        
+        # 오류 타입별 처리
+        if "rate_limit_exceeded" in error_message or "rate limit" in error_message.lower():
+            return SummaryResponse(
+                success=False,
+                error="API 사용량 한도를 초과했습니다. 잠시 후 다시 시도해주세요."
             )
-            
-            summary = response.choices[0].message.content.strip()
-            
-            # 결과 계산
-            original_length = len(text)
-            summary_length = len(summary)
-            compression_ratio = round((1 - summary_length / original_length) * 100, 2)
-            
-            logger.info(f"텍스트 요약 완료: {original_length}자 → {summary_length}자 (압축률: {compression_ratio}%)")
-            
+        elif "invalid_api_key" in error_message or "authentication" in error_message.lower():
             return SummaryResponse(
-                success=True,
-                original_text=text,
-                summary=summary,
-                original_length=original_length,
-                summary_length=summary_length,
-                compression_ratio=compression_ratio
+                success=False,
+                error="API 키 인증에 실패했습니다."
+            )
+        elif "model_not_found" in error_message or "model" in error_message.lower():
+            return SummaryResponse(
+                success=False,
+                error=f"지원하지 않는 모델입니다: {self.model}"
+            )
+        else:
+            return SummaryResponse(
+                success=False,
+                error=f"요약 처리 중 오류가 발생했습니다: {error_message}"
             )
-            
-        except Exception as e:
-            error_message = str(e)
-            logger.error(f"요약 처리 중 오류: {error_message}")
-            
-            # 오류 타입별 처리
-            if "rate_limit_exceeded" in error_message or "rate limit" in error_message.lower():
-                return SummaryResponse(
-                    success=False,
-                    error="API 사용량 한도를 초과했습니다. 잠시 후 다시 시도해주세요."
-                )
-            elif "invalid_api_key" in error_message or "authentication" in error_message.lower():
-                return SummaryResponse(
-                    success=False,
-                    error="API 키 인증에 실패했습니다."
-                )
-            elif "model_not_found" in error_message or "model" in error_message.lower():
-                return SummaryResponse(
-                    success=False,
-                    error=f"지원하지 않는 모델입니다: {self.model}"
-                )
-            else:
-                return SummaryResponse(
-                    success=False,
-                    error=f"요약 처리 중 오류가 발생했습니다: {error_message}"
-                )
     
-    def get_service_status(self) -> bool:
+    async def get_service_status(self) -> bool:
         """OpenAI 서비스 상태를 확인합니다."""
         try:
-            # 간단한 테스트 요청으로 서비스 상태 확인
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=1
-            )
+            # 과금되지 않는 모델 목록 조회로 키 사용 가능 여부 확인
+            models = await self.gateway.list_models()
+            model_ids = {m.get("id") for m in models.get("data", [])}
+            if model_ids and self.model not in model_ids:
+                # 별칭(gpt-4-turbo-preview 등)은 목록에 없어도 호출되므로 경고만 남긴다
+                logger.warning(f"OpenAI 모델 목록에 설정된 모델이 없습니다: {self.model}")
             return True
         except Exception as e:
             logger.warning(f"OpenAI 서비스 상태 확인 실패: {str(e)}")
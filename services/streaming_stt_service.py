@@ -0,0 +1,99 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from config.naver_stt_settings import settings, logger
+from core.exceptions.stt_exceptions import STTException
+from utils.audio_preprocess import encode_wav, resample
+from utils.utterance_segmenter import Utterance, UtteranceSegmenter
+
+
+class StreamingTranscriber:
+    """WebSocket으로 들어오는 PCM 프레임을 발화 단위로 잘라 말하는 도중에 인식합니다.
+
+    발화가 끝나는 즉시 인식 요청을 보내고(연결당 최대 STT_SEGMENT_CONCURRENCY개),
+    결과는 발화 순서대로 partial 메시지로, 스트림이 끝나면 전체를 final 메시지로 내보낸다.
+    """
+
+    def __init__(self, stt_service, lang: str, sample_rate: int):
+        self.stt_service = stt_service
+        self.lang = lang
+        self.sample_rate = sample_rate
+        self.segmenter = UtteranceSegmenter(sample_rate)
+        self.received = 0
+
+        self._semaphore = asyncio.Semaphore(settings.STT_SEGMENT_CONCURRENCY)
+        self._pending: "asyncio.Queue[Optional[asyncio.Task]]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    def feed(self, pcm: bytes) -> None:
+        self.received += len(pcm)
+        if self.received > settings.MAX_FILE_SIZE:
+            raise STTException("스트리밍 음성이 너무 깁니다. (최대 50MB)", code="AUDIO_TOO_LONG")
+
+        for utterance in self.segmenter.feed(pcm):
+            self._submit(utterance)
+
+    def finish(self) -> None:
+        utterance = self.segmenter.flush()
+        if utterance is not None:
+            self._submit(utterance)
+        self._pending.put_nowait(None)
+
+    async def results(self) -> AsyncIterator[dict]:
+        """발화별 partial 메시지를 순서대로 내보내고, 마지막에 final 메시지를 내보냅니다."""
+        segments = []
+        texts = []
+        while True:
+            task = await self._pending.get()
+            if task is None:
+                break
+
+            segment = await task
+            segment["index"] = len(segments)
+            segments.append(segment)
+            if segment["success"] and segment["text"]:
+                texts.append(segment["text"].strip())
+            yield {"type": "partial", **segment, "transcript": " ".join(texts)}
+
+        recognized = [s for s in segments if s["success"]]
+        if not recognized:
+            error = segments[0]["error"] if segments else "음성이 감지되지 않았습니다. 다시 녹음해주세요."
+            yield {"type": "final", "success": False, "error": error, "segments": segments}
+            return
+
+        voiced = sum(s["end"] - s["start"] for s in recognized)
+        yield {
+            "type": "final",
+            "success": True,
+            "text": " ".join(texts),
+            "confidence": round(sum(s["confidence"] * (s["end"] - s["start"]) for s in recognized) / voiced, 4)
+            if voiced else 0,
+            "segments": segments,
+        }
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _submit(self, utterance: Utterance) -> None:
+        task = asyncio.create_task(self._recognize(utterance))
+        self._tasks.append(task)
+        self._pending.put_nowait(task)
+
+    async def _recognize(self, utterance: Utterance) -> dict:
+        samples, rate = utterance.samples, self.sample_rate
+        if rate > settings.STT_TARGET_SAMPLE_RATE:
+            samples, rate = resample(samples, rate, settings.STT_TARGET_SAMPLE_RATE), settings.STT_TARGET_SAMPLE_RATE
+        data = encode_wav(samples, rate)
+
+        async with self._semaphore:
+            result = await self.stt_service.convert_speech_to_text_async(data, self.lang, content_length=len(data))
+
+        segment = {"start": utterance.start, "end": utterance.end, "success": result["success"]}
+        if result["success"]:
+            segment.update(text=result["text"], confidence=result["confidence"])
+        else:
+            logger.warning(f"스트리밍 발화 인식 실패: {result['error']}")
+            segment["error"] = result["error"]
+        return segment
@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import json
+from typing import Optional
+
+import numpy as np
+import redis
+
+from config.naver_stt_settings import settings, logger
+from utils.audio_preprocess import decode_wav, downmix, frame_energy_db, speech_mask
+from utils.audio_utils import sniff_audio_format
+from utils.metrics import record_cache
+from utils.redis_utils import store
+from utils.session_store import SessionStore, create_session_store
+
+# 지문 비트로 칠 프레임 간 에너지 상승 폭 (이보다 작은 변화는 잡음으로 보고 0)
+_FINGERPRINT_RISE_DB = 1.5
+# 프레임별 스펙트럼 모양을 볼 대역 경계 (Hz, 8kHz 녹음에서도 나오는 음성 대역)
+_FINGERPRINT_BAND_EDGES = (300, 500, 800, 1300, 2100, 3400)
+# 프레임에서 가장 센 대역보다 이만큼 약한 대역은 잡음으로 보고 같은 바닥값으로 맞춘다
+_FINGERPRINT_BAND_FLOOR_DB = 30.0
+# 이웃 대역보다 이만큼 이상 셀 때만 1 (비슷한 대역은 잡음에 따라 뒤집히지 않게 0)
+_FINGERPRINT_BAND_MARGIN_DB = 3.0
+
+
+def _band_bits(mono: np.ndarray, rate: int, frame_len: int, active: np.ndarray) -> np.ndarray:
+    """프레임마다 이웃한 대역보다 에너지가 뚜렷이 큰 대역을 1로 (음량과 무관, 무음 프레임은 0)"""
+    frames = mono[:active.size * frame_len].reshape(active.size, frame_len)
+    power = np.square(np.abs(np.fft.rfft(frames, axis=1)))
+    bins = np.searchsorted(np.fft.rfftfreq(frame_len, 1.0 / rate), _FINGERPRINT_BAND_EDGES)
+    bands = np.stack([power[:, lo:hi].sum(axis=1) for lo, hi in zip(bins[:-1], bins[1:])], axis=1)
+    floor = bands.max(axis=1, keepdims=True) * 10 ** (-_FINGERPRINT_BAND_FLOOR_DB / 10)
+    bands = np.maximum(bands, floor)
+    louder = bands[:, :-1] > bands[:, 1:] * 10 ** (_FINGERPRINT_BAND_MARGIN_DB / 10)
+    return louder & active[:, None]
+
+
+def audio_fingerprint(audio: bytes) -> Optional[str]:
+    """WAV의 대략적인 음향 지문 (길이 + 프레임 에너지 상승 비트열 + 프레임별 대역 비교 비트열)
+
+    음량 차이, 재인코딩, 약한 잡음에는 같은 값이 나오도록 크기 대신 변화 방향과 대역 간 대소만 본다.
+    길이(0.1초 단위)와 스펙트럼 모양을 함께 넣어 길이만 같은 다른 발화가 같은 지문이 되지 않게 한다.
+    WAV가 아니거나 너무 짧으면 None을 반환한다.
+    """
+    if sniff_audio_format(audio[:12]) != "wav":
+        return None
+    try:
+        samples, rate = decode_wav(audio)
+    except ValueError:
+        return None
+
+    mono = downmix(samples)
+    energy_db, frame_len = frame_energy_db(mono, rate, frame_ms=settings.STT_CACHE_FINGERPRINT_FRAME_MS)
+    if energy_db.size <= settings.STT_CACHE_FINGERPRINT_MIN_FRAMES:
+        return None
+    duration_ds = round(mono.size * 10 / rate)
+    rise_bits = np.diff(energy_db) > _FINGERPRINT_RISE_DB
+    band_bits = _band_bits(mono, rate, frame_len, speech_mask(energy_db))
+    return (f"{duration_ds}:{energy_db.size}:{np.packbits(rise_bits).tobytes().hex()}:"
+            f"{np.packbits(band_bits).tobytes().hex()}")
+
+
+class STTCache:
+    """정규화된 오디오 해시 기반 음성 인식 결과 캐시
+
+    키는 (언어, 오디오 바이트 해시)이며, /stt/ WAV는 전처리(모노/무음 제거/16kHz)를 마친 오디오로 해시해
+    같은 샘플레이트의 같은 녹음이면 앞뒤 무음 길이나 채널 수가 달라도 같은 키가 된다.
+    원본 샘플레이트가 다르면 바이트가 달라지므로 정확 키로는 맞지 않는다.
+    STT_CACHE_FINGERPRINT_ENABLED면 음향 지문으로도 한 번 더 찾아 거의 같은 녹음을 맞힌다.
+    """
+
+    KEY_PREFIX = "stt_cache:"
+    LRU_KEY = "stt_cache:lru"
+    HITS_KEY = "stt_cache:stats:hits"
+    FINGERPRINT_HITS_KEY = "stt_cache:stats:fingerprint_hits"
+    MISSES_KEY = "stt_cache:stats:misses"
+
+    def __init__(self, entries: SessionStore = None, counters: SessionStore = store,
+                 ttl: int = None, max_entries: int = None):
+        self.ttl = ttl or settings.STT_CACHE_TTL
+        self.max_entries = max_entries or settings.STT_CACHE_MAX_ENTRIES
+        self.entries = entries or create_session_store(max_entries=self.max_entries, lru_key=self.LRU_KEY)
+        self.counters = counters
+        self.enabled = settings.STT_CACHE_ENABLED
+        self.fingerprint_enabled = settings.STT_CACHE_FINGERPRINT_ENABLED
+
+    def make_keys(self, audio: bytes, lang: str) -> list:
+        keys = [f"{self.KEY_PREFIX}{lang}:{hashlib.sha256(audio).hexdigest()}"]
+        fingerprint = audio_fingerprint(audio) if self.fingerprint_enabled else None
+        if fingerprint:
+            digest = hashlib.sha256(fingerprint.encode("ascii")).hexdigest()
+            keys.append(f"{self.KEY_PREFIX}fp:{lang}:{digest}")
+        return keys
+
+    async def get(self, audio: bytes, lang: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        keys = await asyncio.to_thread(self.make_keys, audio, lang)
+        try:
+            raw = None
+            for index, key in enumerate(keys):
+                raw = await self.entries.get(key)
+                if raw:
+                    break
+            await self.counters.incr(self.MISSES_KEY if not raw else
+                                     self.HITS_KEY if index == 0 else self.FINGERPRINT_HITS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"STT 캐시 조회 실패: {str(e)}")
+            return None
+
+        record_cache("stt", bool(raw))
+        return json.loads(raw) if raw else None
+
+    async def set(self, audio: bytes, lang: str, result: dict) -> None:
+        if not self.enabled or not result.get("success"):
+            return
+
+        keys = await asyncio.to_thread(self.make_keys, audio, lang)
+        try:
+            await asyncio.gather(*(self.entries.set_json(key, result, self.ttl) for key in keys))
+        except redis.RedisError as e:
+            logger.warning(f"STT 캐시 저장 실패: {str(e)}")
+
+    async def stats(self) -> dict:
+        try:
+            (hits, fingerprint_hits, misses), size = await asyncio.gather(
+                self.counters.mget([self.HITS_KEY, self.FINGERPRINT_HITS_KEY, self.MISSES_KEY]),
+                self.entries.size(),
+            )
+        except redis.RedisError as e:
+            logger.warning(f"STT 캐시 통계 조회 실패: {str(e)}")
+            return {"enabled": self.enabled, "available": False}
+
+        hits = int(hits or 0)
+        fingerprint_hits = int(fingerprint_hits or 0)
+        misses = int(misses or 0)
+        total = hits + fingerprint_hits + misses
+        return {
+            "enabled": self.enabled,
+            "available": True,
+            "fingerprint_enabled": self.fingerprint_enabled,
+            "hits": hits,
+            "fingerprint_hits": fingerprint_hits,
+            "misses": misses,
+            "hit_ratio": round((hits + fingerprint_hits) / total, 4) if total else 0.0,
+            "size": size.get("entries", 0),
+            "max_entries": self.max_entries,
+        }
+
+
+# 전역 캐시 인스턴스
+stt_cache = STTCache()
@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import json
+from typing import Optional
+
+import redis
+
+from config.naver_stt_settings import settings, logger
+from models.stt_models import SummaryResponse
+from utils.metrics import record_cache
+from utils.redis_utils import store
+from utils.session_store import SessionStore, create_session_store
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """본문 해시 기반 요약 결과 캐시
+
+    키는 (본문 해시, 언어, 모델, 프롬프트 버전)으로 구성되며 TTL과 함께 저장된다.
+    크기 제한 LRU 저장소를 사용해 최대 개수를 넘으면 가장 오래 접근하지 않은 항목부터 제거한다.
+    """
+
+    KEY_PREFIX = "summary_cache:"
+    LRU_KEY = "summary_cache:lru"
+    HITS_KEY = "summary_cache:stats:hits"
+    MISSES_KEY = "summary_cache:stats:misses"
+
+    def __init__(self, entries: SessionStore = None, counters: SessionStore = store,
+                 ttl: int = None, max_entries: int = None):
+        self.ttl = ttl or settings.SUMMARY_CACHE_TTL
+        self.max_entries = max_entries or settings.SUMMARY_CACHE_MAX_ENTRIES
+        self.entries = entries or create_session_store(max_entries=self.max_entries, lru_key=self.LRU_KEY)
+        self.counters = counters
+        self.enabled = settings.SUMMARY_CACHE_ENABLED
+
+    def make_key(self, text: str, language: str, model: str, prompt_version: str) -> str:
+        return f"{self.KEY_PREFIX}{model}:{prompt_version}:{language}:{hash_text(text)}"
+
+    async def get(self, text: str, language: str, model: str, prompt_version: str) -> Optional[SummaryResponse]:
+        if not self.enabled:
+            return None
+
+        key = self.make_key(text, language, model, prompt_version)
+        try:
+            raw = await self.entries.get(key)
+            await self.counters.incr(self.HITS_KEY if raw else self.MISSES_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"요약 캐시 조회 실패: {str(e)}")
+            return None
+
+        record_cache("summary", bool(raw))
+        if not raw:
+            return None
+
+        data = json.loads(raw)
+        # 원문은 캐시에 저장하지 않고 요청 본문으로 채운다
+        return SummaryResponse(original_text=text, **data)
+
+    async def set(self, text: str, language: str, model: str, prompt_version: str,
+                  result: SummaryResponse) -> None:
+        if not self.enabled or not result.success:
+            return
+
+        key = self.make_key(text, language, model, prompt_version)
+        data = result.dict(exclude={"original_text"})
+        try:
+            await self.entries.set_json(key, data, self.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"요약 캐시 저장 실패: {str(e)}")
+
+    async def stats(self) -> dict:
+        try:
+            (hits, misses), size = await asyncio.gather(
+                self.counters.mget([self.HITS_KEY, self.MISSES_KEY]),
+                self.entries.size(),
+            )
+        except redis.RedisError as e:
+            logger.warning(f"요약 캐시 통계 조회 실패: {str(e)}")
+            return {"enabled": self.enabled, "available": False}
+
+        hits = int(hits or 0)
+        misses = int(misses or 0)
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "available": True,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "size": size.get("entries", 0),
+            "max_entries": self.max_entries,
+        }
+
+
+# 전역 캐시 인스턴스
+summary_cache = SummaryCache()
@@ -1,10 +1,43 @@
-import openai
 import json
-from utils.redis_utils import get_pending_query, clear_pending_query, r
+import re
+from typing import Optional
+from services.llm_gateway import llm_gateway
+from services.summary_cache import hash_text
+from utils.redis_utils import clear_pending_query, get_pending_and_context
+from services.news_service import save_news_session
 from utils.naver_news_service import search_naver_news
+from utils.intent_router import route_utterance
+from utils.query_classifier import classify_locally, get_cached_decision, cache_decision
+from utils.metrics import QUERY_CLASSIFICATIONS
+from config.naver_stt_settings import logger
 import uuid
 
-def classify_and_expand(original_query: str, context: str) -> dict:
+CATEGORIES = ("term", "article")
+_JSON_OBJECT_RE = re.compile(r"\{.*?\}", re.DOTALL)
+
+
+async def classify_and_expand(original_query: str, context: str, context_hash: Optional[str] = None) -> dict:
+    # (질문, 문서) 조합별로 한 번만 분류한다
+    context_hash = context_hash or hash_text(context)
+    cached = get_cached_decision(original_query, context_hash)
+    if cached:
+        QUERY_CLASSIFICATIONS.labels("cache").inc()
+        return cached
+
+    # 규칙으로 확실히 분류되면 LLM을 부르지 않는다 (애매한 경우만 LLM)
+    decision = classify_locally(original_query, context)
+    source = "rule"
+    if decision is None:
+        decision = await _classify_with_llm(original_query, context)
+        source = "llm"
+    QUERY_CLASSIFICATIONS.labels(source).inc()
+
+    if decision.get("category") in CATEGORIES:
+        cache_decision(original_query, context_hash, decision)
+    return decision
+
+
+async def _classify_with_llm(original_query: str, context: str) -> dict:
 
     prompt = (
         "너는 사용자의 질문을 'term' 또는 'article'로 분류해야 한다.\n"
@@ -20,20 +53,37 @@ def classify_and_expand(original_query: str, context: str) -> dict:
         "만약 사용자가 '이 기사'라고 말하면, 반드시 제공된 context(본문)을 '이 기사'로 간주하라.\n"
     )
 
-    response = openai.ChatCompletion.create(
-        model="gpt-4o-mini",
+    content = await llm_gateway.chat(
+        "gpt-4o-mini",
         messages=[
             {"role": "system", "content": prompt},
             {"role": "user", "content": f"질문: {original_query}\n\n본문: {context}"}
         ]
     )
-    return json.loads(response.choices[0].message.content.strip())
+    return _parse_decision(content)
+
+
+def _parse_decision(content: str) -> dict:
+    # 코드 블록이나 설명이 섞인 응답에서도 첫 JSON 객체만 읽는다. 읽지 못하면 빈 결과 (분류 실패로 처리)
+    match = _JSON_OBJECT_RE.search(content)
+    try:
+        data = json.loads(match.group(0) if match else content.strip())
+    except json.JSONDecodeError:
+        logger.warning(f"질문 분류 응답을 해석하지 못했습니다: {content[:200]}")
+        return {}
+
+    if not isinstance(data, dict) or data.get("category") not in CATEGORIES:
+        return {}
+    return data
+
 
+async def handle_yes_no(answer: str, pending_session_id: str, context_session_id: str):
+    # "네/예/응", "아니요/아뇨/괜찮아요" 등 답변 변형을 한 번에 판별
+    intent = route_utterance(answer).answer
 
-def handle_yes_no(answer: str, pending_session_id: str, context_session_id: str):
     # "아니요" 처리
-    if answer.strip() == "아니요":
-        clear_pending_query(pending_session_id)
+    if intent == "no":
+        await clear_pending_query(pending_session_id)
         return {
             "status": "success",
             # "type": "info",
@@ -41,8 +91,12 @@ def handle_yes_no(answer: str, pending_session_id: str, context_session_id: str)
         }
 
     # "네" 처리
-    if answer.strip() == "네":
-        pending = get_pending_query(pending_session_id)
+    if intent == "yes":
+        # pending query와 context 포인터를 한 번에 조회하고 문서를 이어서 읽는다 (두 번 왕복)
+        try:
+            pending, context = await get_pending_and_context(pending_session_id, context_session_id)
+        except json.JSONDecodeError:
+            pending, context = None, {}
 
         if not pending:
             return {
@@ -53,21 +107,14 @@ def handle_yes_no(answer: str, pending_session_id: str, context_session_id: str)
         original_query = pending["query"]
         # clear_pending_query(session_id)  # 사용 후 삭제 - 추후추가
 
-        # Redis에서 context 불러오기 (별도의 context 세션 ID 사용)
-        raw_context = r.get(f"context:{context_session_id}")
-        effective_context = ""
-        if raw_context:
-            try:
-                context_data = json.loads(raw_context)
-                effective_context = context_data.get("inner_text", "")
-            except json.JSONDecodeError:
-                effective_context = ""
+        # Redis에서 불러온 context (별도의 context 세션 ID 사용)
+        effective_context = context.get("inner_text", "")
 
         # Redis 기반 context 사용
-        result = classify_and_expand(original_query, effective_context)
+        result = await classify_and_expand(original_query, effective_context, context.get("content_hash"))
 
         category = result.get("category")
-        keyword = result.get("keyword", original_query)
+        keyword = result.get("keyword") or original_query
 
         # 클린 단어 하기 전 코드
         # if category == "term":
@@ -87,7 +134,7 @@ def handle_yes_no(answer: str, pending_session_id: str, context_session_id: str)
             }
 
         if category == "article":
-            articles = search_naver_news(keyword, display=4)
+            articles = await search_naver_news(keyword, display=4)
 
             if not articles:
                 return {
@@ -97,8 +144,7 @@ def handle_yes_no(answer: str, pending_session_id: str, context_session_id: str)
                 }
 
             news_session_id = str(uuid.uuid4())  # 새 ID 발급
-            news_key = f"news:{news_session_id}"
-            r.setex(news_key, 3600, json.dumps(articles, ensure_ascii=False))
+            await save_news_session(news_session_id, articles, 3600)
 
             titles_summary = []
             for idx, item in enumerate(articles, start=1):
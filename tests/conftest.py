@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+# 서비스 모듈은 import 시점에 자격 증명을 확인하므로 테스트용 값을 채운다 (외부로 호출하지는 않음)
+for _name in ("OPENAI_API_KEY", "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET",
+              "NAVER_NEWS_CLIENT_ID", "NAVER_NEWS_CLIENT_SECRET"):
+    os.environ.setdefault(_name, "test")
+os.environ.setdefault("SESSION_STORE_BACKEND", "memory")
+
+
+@pytest.fixture
+def anyio_backend():
+    # 서비스 코드가 asyncio API(create_task, shield 등)를 직접 쓰므로 asyncio 백엔드로만 돌린다
+    return "asyncio"
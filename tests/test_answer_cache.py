@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from services.answer_cache import AnswerCache, normalize_question
+from utils.session_store import MemorySessionStore
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingStore(MemorySessionStore):
+    """조회할 때 읽은 해시 필드 수를 기록하는 저장소"""
+
+    def __init__(self, max_entries: int):
+        super().__init__(max_entries)
+        self.read_sizes = []
+
+    async def hgetall(self, key):
+        fields = await super().hgetall(key)
+        self.read_sizes.append(len(fields))
+        return fields
+
+
+@pytest.fixture
+def cache():
+    cache = AnswerCache(threshold=0.85, max_entries=200, ttl=60, entries=MemorySessionStore(1000))
+    cache.enabled = True
+    return cache
+
+
+def test_normalize_question_drops_spacing_punctuation_and_particles():
+    assert normalize_question("경제 성장률 전망은?") == normalize_question("경제성장률 전망은")
+    assert normalize_question("GDP 전망") == normalize_question("gdp 전망")
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("경제 성장률 전망은?", "경제 성장률 전망은"),
+    ("경제 성장률 전망은?", "경제성장률 전망은?"),
+    ("부동산 대책의 단점은 무엇인가요", "부동산 대책 단점이 무엇인가요"),
+])
+async def test_spacing_and_particle_variants_hit(cache, cached, asked):
+    await cache.set("doc", cached, "cached answer")
+    assert await cache.get("doc", asked) == "cached answer"
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("한국 경제 성장률 전망은?", "미국 경제 성장률 전망은?"),
+    ("삼성전자의 올해 영업이익 전망은 어떻게 되나요", "LG전자의 올해 영업이익 전망은 어떻게 되나요"),
+    ("정부가 발표한 부동산 대책의 장점은 무엇인가요", "정부가 발표한 부동산 대책의 단점은 무엇인가요"),
+    ("수출 증가율 전망은?", "수입 증가율 전망은?"),
+])
+async def test_entity_and_antonym_swaps_miss(cache, cached, asked):
+    await cache.set("doc", cached, "cached answer")
+    assert await cache.get("doc", asked) is None
+
+
+async def test_answers_are_scoped_to_document(cache):
+    await cache.set("doc", "경제 성장률 전망은?", "cached answer")
+    assert await cache.get("other", "경제 성장률 전망은?") is None
+
+
+async def test_short_questions_only_match_exactly(cache):
+    await cache.set("doc", "물가는?", "cached answer")
+    assert await cache.get("doc", "물가는?") == "cached answer"
+    assert await cache.get("doc", "물가야?") is None
+
+
+async def test_different_numbers_miss(cache):
+    await cache.set("doc", "2023년 경제 성장률 전망은?", "cached answer")
+    assert await cache.get("doc", "2024년 경제 성장률 전망은?") is None
+
+
+async def test_concurrent_sets_keep_every_answer(cache):
+    questions = [f"{topic} 전망은 어떤가요" for topic in ("물가", "수출", "환율", "금리", "고용", "소비", "투자", "부채")]
+    await asyncio.gather(*(cache.set("doc", q, f"answer {i}") for i, q in enumerate(questions)))
+    assert [await cache.get("doc", q) for q in questions] == [f"answer {i}" for i in range(len(questions))]
+
+
+async def test_oldest_entries_are_evicted(cache):
+    cache.max_entries = 2
+    for topic in ("물가", "수출", "환율"):
+        await cache.set("doc", f"{topic} 전망은 어떤가요", topic)
+    assert [await cache.get("doc", f"{topic} 전망은 어떤가요") for topic in ("물가", "수출", "환율")] == \
+        [None, "수출", "환율"]
+
+
+async def test_disabled_cache_never_hits(cache):
+    await cache.set("doc", "경제 성장률 전망은?", "cached answer")
+    cache.enabled = False
+    assert await cache.get("doc", "경제 성장률 전망은?") is None
+
+
+async def test_lookup_reads_only_questions_with_same_content_words():
+    store = CountingStore(1000)
+    cache = AnswerCache(threshold=0.85, max_entries=200, ttl=60, entries=store)
+    cache.enabled = True
+    topics = ("물가", "수출", "환율", "금리", "고용", "소비", "투자", "부채", "임금", "세금")
+    for topic in topics:
+        await cache.set("doc", f"{topic} 전망은 어떤가요", topic)
+        await cache.set("doc", f"{topic} 정책의 효과는 무엇인가요", topic)
+
+    store.read_sizes.clear()
+    assert await cache.get("doc", "금리 전망은 어떤가요?") == "금리"
+    assert await cache.get("doc", "유가 전망은 어떤가요") is None
+    assert store.read_sizes == [1, 0]
+
+
+async def test_evicted_questions_are_removed_from_buckets():
+    store = CountingStore(1000)
+    cache = AnswerCache(threshold=0.85, max_entries=1, ttl=60, entries=store)
+    cache.enabled = True
+    await cache.set("doc", "물가 전망은 어떤가요", "첫 답")
+    await cache.set("doc", "수출 전망은 어떤가요", "둘째 답")
+
+    store.read_sizes.clear()
+    assert await cache.get("doc", "물가 전망은 어떤가요") is None
+    assert store.read_sizes == [0]
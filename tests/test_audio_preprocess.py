@@ -0,0 +1,98 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from config.naver_stt_settings import settings
+from services.naver_stt_service import NaverSTTService
+from utils.audio_preprocess import encode_wav, preprocess_audio, preprocess_wav
+
+RATE = 16000
+
+
+def tone(seconds: float, rate: int = RATE) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def silence(seconds: float, rate: int = RATE) -> np.ndarray:
+    return np.zeros(int(rate * seconds), np.float32)
+
+
+def test_offset_is_leading_silence_trimmed():
+    audio = preprocess_wav(encode_wav(np.concatenate([silence(3), tone(2)]), RATE))
+    # 음성 시작 3.0초에서 앞쪽 여유(STT_SILENCE_PADDING_MS=200)만큼 앞
+    assert audio.offset == pytest.approx(2.8, abs=1e-3)
+    assert audio.duration == pytest.approx(2.4, abs=1e-3)
+
+
+def test_segments_are_reported_in_original_timeline():
+    audio = preprocess_wav(encode_wav(np.concatenate([silence(3), tone(2)]), RATE))
+    result = NaverSTTService._stitch_segments(
+        [(0, RATE)], [{"success": True, "text": "안녕", "confidence": 0.9}], RATE, offset=audio.offset)
+    segment = result["segments"][0]
+    assert segment["start"] == round(audio.offset, 2)
+    assert segment["end"] == round(audio.offset + 1.0, 2)
+
+
+def stereo_wav(mono: np.ndarray, rate: int = RATE) -> bytes:
+    pcm = (np.clip(np.stack([mono, mono], axis=1), -1.0, 1.0) * 32767.0).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(2)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("rate", [16000, 48000])
+@pytest.mark.parametrize("lead, tail", [(1.01, 0.5), (2.337, 1.2), (0.05, 0.0), (0.0, 0.3)])
+def test_leading_silence_does_not_change_output(rate, lead, tail):
+    speech = tone(2, rate)
+    reference = preprocess_wav(encode_wav(np.concatenate([silence(1.0, rate), speech, silence(0.5, rate)]), rate))
+    shifted = preprocess_wav(encode_wav(np.concatenate([silence(lead, rate), speech, silence(tail, rate)]), rate))
+    assert shifted.data == reference.data
+    assert shifted.offset - reference.offset == pytest.approx(lead - 1.0, abs=1e-6)
+
+
+def test_channel_count_does_not_change_output():
+    speech = np.concatenate([silence(1.5), tone(2)])
+    assert preprocess_wav(stereo_wav(speech)).data == preprocess_wav(encode_wav(speech, RATE)).data
+
+
+def test_silent_audio_is_rejected():
+    assert preprocess_wav(encode_wav(silence(2), RATE)) is None
+
+
+async def chunked(data: bytes, size: int = 4096):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("known_length", [True, False])
+async def test_upload_within_cap_is_preprocessed(monkeypatch, known_length):
+    data = encode_wav(np.concatenate([silence(3), tone(2)]), RATE)
+    monkeypatch.setattr(settings, "STT_PREPROCESS_MAX_BYTES", len(data))
+    stream, size, prepared = await preprocess_audio(chunked(data), len(data) if known_length else None)
+    assert prepared is not None
+    assert await collect(stream) == prepared.data
+    assert size == len(prepared.data)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("known_length", [True, False])
+async def test_upload_over_cap_streams_unchanged(monkeypatch, known_length):
+    data = encode_wav(np.concatenate([silence(3), tone(2)]), RATE)
+    monkeypatch.setattr(settings, "STT_PREPROCESS_MAX_BYTES", len(data) - 1)
+    content_length = len(data) if known_length else None
+    stream, size, prepared = await preprocess_audio(chunked(data), content_length)
+    assert prepared is None
+    assert size == content_length
+    assert await collect(stream) == data
@@ -0,0 +1,65 @@
+import pytest
+
+from utils.intent_router import route_utterance, strip_navigation
+
+
+@pytest.mark.parametrize("utterance", [
+    "경제 기사 보여줘",
+    "경제기사보여줘",
+    "로그인 페이지 열어줘",
+    "공지사항으로 이동해 주세요",
+    "마이페이지 들어가줘",
+    "검색 버튼 눌러줘",
+])
+def test_navigation_verbs(utterance):
+    assert route_utterance(utterance).navigate
+
+
+@pytest.mark.parametrize("utterance", [
+    "장학금은 누가 줘?",
+    "월급은 회사가 줘?",
+    "지원금은 정부가 줘요?",
+    "용돈은 누가 줘",
+    "음악 틀어줘",
+    "이 문을 누가열어줘?",
+    "성장률 전망은?",
+])
+def test_questions_are_not_navigation(utterance):
+    assert not route_utterance(utterance).navigate
+
+
+def test_strip_navigation_keeps_question_text():
+    assert strip_navigation("경제 뉴스 보여줘") == "경제 뉴스"
+    assert strip_navigation("장학금은 누가 줘?") == "장학금은 누가 줘"
+
+
+@pytest.mark.parametrize("utterance, answer", [
+    ("네", "yes"),
+    ("네.", "yes"),
+    ("응 해줘", "yes"),
+    ("네 좀 찾아주세요", "yes"),
+    ("좋아요 부탁해요", "yes"),
+    ("아니요!", "no"),
+    ("아니 괜찮아", "no"),
+    ("필요 없어요", "no"),
+])
+def test_yes_no_answers(utterance, answer):
+    assert route_utterance(utterance).answer == answer
+
+
+@pytest.mark.parametrize("utterance", [
+    "어 잠깐만 뭐라고?",
+    "어 그거 말고 두 번째",
+    "이거 뭐야 알려줘",
+    "그 기사 찾아줘",
+    "번역 좀 해줘",
+    "아니 그게 아니라 경제 기사",
+    "네이버 뉴스",
+    "네 번째 기사",
+])
+def test_utterances_with_other_words_are_not_answers(utterance):
+    assert route_utterance(utterance).answer is None
+
+
+def test_ordinal_is_kept_when_answer_is_rejected():
+    assert route_utterance("어 그거 말고 두 번째").ordinal == 1
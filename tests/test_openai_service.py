@@ -0,0 +1,147 @@
+import asyncio
+import re
+
+import pytest
+
+from config.naver_stt_settings import settings
+from services import openai_service as openai_service_module
+from services.openai_service import OpenAIService
+from utils.token_budget import estimate_tokens
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeGateway:
+    """모델 목록 조회와 요약 호출을 흉내 내는 LLM 게이트웨이
+
+    청크 요약 요청에는 reply(청크 번호, 청크 본문)의 결과를, 최종 요약 요청에는 "최종 요약"을 돌려준다.
+    """
+
+    def __init__(self, model_ids=(), error: Exception = None, reply=None):
+        self.model_ids = model_ids
+        self.error = error
+        self.reply = reply or (lambda index, chunk: f"요약{index}")
+        self.chunks = []       # 청크 요약 요청으로 받은 본문
+        self.final = []        # 최종 요약 요청으로 받은 본문
+        self.active = 0
+        self.max_active = 0
+
+    async def list_models(self) -> dict:
+        if self.error is not None:
+            raise self.error
+        return {"data": [{"id": model_id} for model_id in self.model_ids]}
+
+    async def chat(self, model: str, messages: list, **params) -> str:
+        system, user = messages[0]["content"], messages[1]["content"]
+        match = re.search(r"(\d+)/(\d+)번째 부분", system)
+        if match is None:
+            self.final.append(user)
+            return "최종 요약"
+
+        index = int(match.group(1))
+        self.chunks.append(user)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # 뒤 청크가 먼저 끝나도 결과는 원문 순서로 합쳐져야 한다
+            await asyncio.sleep(0.001 * (int(match.group(2)) - index))
+            return self.reply(index, user)
+        finally:
+            self.active -= 1
+
+
+def make_service(gateway) -> OpenAIService:
+    service = OpenAIService()
+    service.gateway = gateway
+    return service
+
+
+async def test_status_is_up_when_model_is_listed():
+    service = make_service(FakeGateway(["gpt-4o", "gpt-4o-mini"]))
+    service.model = "gpt-4o"
+    assert await service.get_service_status() is True
+
+
+async def test_unlisted_model_alias_does_not_mark_service_down(caplog):
+    service = make_service(FakeGateway(["gpt-4o", "gpt-4-turbo"]))
+    service.model = "gpt-4-turbo-preview"
+    assert await service.get_service_status() is True
+    assert "gpt-4-turbo-preview" in caplog.text
+
+
+async def test_status_is_down_when_models_cannot_be_listed():
+    service = make_service(FakeGateway(error=RuntimeError("401 Unauthorized")))
+    assert await service.get_service_status() is False
+
+
+@pytest.fixture
+def long_text_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_LONG_TEXT_CHARS", 500)
+    monkeypatch.setattr(settings, "SUMMARY_CHUNK_CHARS", 200)
+    monkeypatch.setattr(settings, "SUMMARY_MAX_INPUT_TOKENS", 10000)
+    monkeypatch.setattr(settings, "SUMMARY_MAP_CONCURRENCY", 2)
+
+
+def sentences(count: int) -> str:
+    return " ".join(f"{i}번째 문장은 분할 요약 테스트를 위한 본문입니다." for i in range(count))
+
+
+async def test_short_text_is_not_split(long_text_settings):
+    gateway = FakeGateway()
+    text = sentences(5)
+    assert await make_service(gateway)._condense(text, "ko") == text
+    assert gateway.chunks == []
+
+
+async def test_long_text_is_summarized_per_chunk_in_order(long_text_settings):
+    gateway = FakeGateway()
+    text = sentences(40)
+    condensed = await make_service(gateway)._condense(text, "ko")
+
+    assert len(gateway.chunks) > 2
+    assert all(len(chunk) <= settings.SUMMARY_CHUNK_CHARS for chunk in gateway.chunks)
+    assert "".join(gateway.chunks).replace(" ", "") == text.replace(" ", "")
+    assert condensed == "\n\n".join(f"요약{i}" for i in range(1, len(gateway.chunks) + 1))
+
+
+async def test_chunk_size_follows_input_token_limit(long_text_settings, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_MAX_INPUT_TOKENS", 100)
+    gateway = FakeGateway()
+    await make_service(gateway)._condense(sentences(40), "ko")
+    assert all(estimate_tokens(chunk) <= 100 for chunk in gateway.chunks)
+
+
+async def test_chunk_summaries_respect_map_concurrency(long_text_settings):
+    gateway = FakeGateway()
+    await make_service(gateway)._condense(sentences(40), "ko")
+    assert len(gateway.chunks) > settings.SUMMARY_MAP_CONCURRENCY
+    assert gateway.max_active == settings.SUMMARY_MAP_CONCURRENCY
+
+
+async def test_reduce_stops_after_max_rounds_and_truncates(long_text_settings, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_MAX_INPUT_TOKENS", 300)
+    # 청크 요약이 줄어들지 않는 경우: MAX_REDUCE_ROUNDS번만 나눈 뒤 토큰 상한에 맞춰 자른다
+    gateway = FakeGateway(reply=lambda index, chunk: chunk)
+    service = make_service(gateway)
+    rounds = []
+    original = service._summarize_chunks
+
+    async def counting(chunks, language):
+        rounds.append(len(chunks))
+        return await original(chunks, language)
+
+    service._summarize_chunks = counting
+    condensed = await service._condense(sentences(40), "ko")
+
+    assert len(rounds) == OpenAIService.MAX_REDUCE_ROUNDS
+    assert estimate_tokens(condensed) <= 300
+    assert condensed.startswith("0번째 문장은")
+
+
+async def test_summarize_text_sends_condensed_text_to_final_call(long_text_settings, monkeypatch):
+    monkeypatch.setattr(openai_service_module.summary_cache, "enabled", False)
+    gateway = FakeGateway()
+    result = await make_service(gateway).summarize_text(sentences(41), "ko")
+
+    assert result.success and result.summary == "최종 요약"
+    assert gateway.final == ["\n\n".join(f"요약{i}" for i in range(1, len(gateway.chunks) + 1))]
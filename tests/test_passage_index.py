@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from config.naver_stt_settings import settings
+from services import content_service
+from utils import redis_utils
+from utils.passage_index import build_passage_index, search_passages, select_passages, split_passages
+from utils.session_store import MemorySessionStore
+
+pytestmark = pytest.mark.anyio
+
+PARAGRAPHS = [
+    "오늘 발표된 경제 동향 보고서의 주요 내용을 정리했습니다.",
+    "한국은행은 기준금리를 연 3.5%로 동결했습니다. 금리 동결은 여섯 번째입니다.",
+    "수출은 반도체 호조로 석 달 연속 증가했습니다.",
+    "서울 아파트 매매가격은 전주보다 소폭 올랐습니다.",
+    "정부는 내년 예산안을 다음 달 국회에 제출할 예정입니다.",
+]
+TEXT = "\n\n".join(PARAGRAPHS)
+
+
+def test_split_passages_respects_max_chars():
+    text = "가나다라마바사. " * 200
+    spans = split_passages(text, max_chars=100)
+    assert spans
+    assert all(end - start <= 100 for start, end in spans)
+    assert all(text[start:end].strip() for start, end in spans)
+
+
+def test_search_ranks_matching_passage_first():
+    index = build_passage_index(TEXT, max_chars=45)
+    assert select_passages(TEXT, index, "기준금리 동결", top_k=1) == [PARAGRAPHS[1]]
+    assert select_passages(TEXT, index, "반도체 수출 추이", top_k=1) == [PARAGRAPHS[2]]
+
+
+def test_search_returns_passages_in_document_order():
+    index = build_passage_index(TEXT, max_chars=45)
+    ranked = search_passages(index, "예산안 금리", top_k=2)
+    assert ranked == sorted(ranked)
+    assert [TEXT[slice(*index["spans"][i])] for i in ranked] == [PARAGRAPHS[1], PARAGRAPHS[4]]
+
+
+def test_search_without_matching_terms_falls_back_to_leading_passages():
+    index = build_passage_index(TEXT, max_chars=45)
+    assert search_passages(index, "xyz", top_k=2) == [0, 1]
+
+
+def test_index_stores_spans_instead_of_passage_text():
+    raw = json.dumps(build_passage_index(TEXT, max_chars=45), ensure_ascii=False)
+    assert PARAGRAPHS[1] not in raw
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = MemorySessionStore(100)
+    monkeypatch.setattr(redis_utils, "store", store)
+    monkeypatch.setattr(settings, "RETRIEVAL_ENABLED", True)
+    monkeypatch.setattr(settings, "RETRIEVAL_MIN_TEXT_LENGTH", 100)
+    monkeypatch.setattr(settings, "RETRIEVAL_PASSAGE_CHARS", 45)
+    monkeypatch.setattr(settings, "RETRIEVAL_TOP_K", 1)
+    return store
+
+
+async def test_select_document_uses_stored_index(store):
+    session_id = (await content_service.load_content(TEXT, [], expire=600))["context_session_id"]
+    context = await content_service.get_content(session_id, with_index=True)
+    assert context["passage_index"] is not None
+    assert await content_service._select_document(context, "기준금리 동결") == PARAGRAPHS[1]
+
+
+async def test_missing_index_is_rebuilt_with_document_ttl(store):
+    session_id, content_hash, _ = await redis_utils.save_context(TEXT, [], expire=120)
+    context = await content_service.get_content(session_id, with_index=True)
+    assert context["passage_index"] is None  # 색인 없이 저장된 이전 형식 문서
+
+    assert await content_service._select_document(context, "반도체 수출") == PARAGRAPHS[2]
+    assert await redis_utils.get_passage_index(content_hash) is not None
+    # 기본 3600초가 아니라 문서의 남은 TTL을 따른다
+    assert 115 <= await store.ttl(f"doc_index:{content_hash}") <= 120
+
+
+async def test_index_is_not_saved_after_document_expired(store):
+    session_id, content_hash, _ = await redis_utils.save_context(TEXT, [], expire=120)
+    context = await content_service.get_content(session_id, with_index=True)
+    await store.delete(f"doc:{content_hash}")
+
+    assert await content_service._select_document(context, "반도체 수출") == PARAGRAPHS[2]
+    assert await store.get(f"doc_index:{content_hash}") is None
+
+
+async def test_short_documents_are_sent_whole(store):
+    context = {"inner_text": PARAGRAPHS[0], "content_hash": "short"}
+    assert await content_service._select_document(context, "경제 동향") == PARAGRAPHS[0]
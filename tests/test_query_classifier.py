@@ -0,0 +1,47 @@
+import pytest
+
+from utils.query_classifier import classify_locally, content_words, extract_context_keyword
+
+ECONOMY_ARTICLE = "한국은행 기준금리 동결 결정. 한국은행은 오늘 기준금리를 동결했다. 기준금리 동결은 여섯 번째다."
+
+
+@pytest.mark.parametrize("query, keyword", [
+    ("인플레이션 뜻이 뭐야", "인플레이션"),
+    ("스태그플레이션의 의미", "스태그플레이션"),
+    ("디플레이션 정의 알려줘", "디플레이션"),
+    ("양적완화가 무슨 말이야", "양적완화"),
+    ("금리가 의미하는 게 뭐야", "금리"),
+])
+def test_term_questions(query, keyword):
+    assert classify_locally(query, ECONOMY_ARTICLE) == {"category": "term", "keyword": keyword}
+
+
+@pytest.mark.parametrize("query", [
+    "이거 관련 뉴스 더 찾아줘",
+    "최신 소식 알려줘",
+    "관련 기사를 보여줘",
+])
+def test_article_questions_use_context_keyword(query):
+    keyword = extract_context_keyword(ECONOMY_ARTICLE)
+    assert keyword and "기준금리" in keyword
+    assert classify_locally(query, ECONOMY_ARTICLE) == {"category": "article", "keyword": keyword}
+
+
+@pytest.mark.parametrize("query", [
+    "정의당 관련",          # "정의"
+    "사고방식이 궁금해",      # "사고"
+    "뜻밖의 결과는?",        # "뜻"
+    "의미심장한 발언",        # "의미"
+    "보도블록 공사",          # "보도"
+    "최근접 이웃 알고리즘",    # "최근"
+])
+def test_cue_embedded_in_other_words_falls_through_to_llm(query):
+    assert classify_locally(query, ECONOMY_ARTICLE) is None
+
+
+def test_mixed_cues_fall_through_to_llm():
+    assert classify_locally("인플레이션 뜻 관련 기사", ECONOMY_ARTICLE) is None
+
+
+def test_content_words_strip_particles_and_stopwords():
+    assert content_words("인플레이션이 뭐야? 경제 뉴스 알려줘") == ["인플레이션", "경제"]
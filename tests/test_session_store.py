@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from utils.session_store import MemorySessionStore, RedisSessionStore, StoreBatch
+
+pytestmark = pytest.mark.anyio
+
+BACKENDS = ["memory", "redis"]
+
+
+@pytest.fixture(params=BACKENDS)
+def make_store(request):
+    """같은 계약을 두 백엔드에 돌리기 위한 저장소 팩토리 (max_entries를 주면 크기 제한 LRU)"""
+    def factory(max_entries=None):
+        if request.param == "memory":
+            return MemorySessionStore(max_entries or 1000)
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        return RedisSessionStore(client, max_entries=max_entries, lru_key="test:lru")
+    return factory
+
+
+@pytest.fixture
+def store(make_store):
+    return make_store()
+
+
+async def test_set_get_and_nx(store):
+    assert await store.set("a", "1", 60) is True
+    assert await store.get("a") == "1"
+    assert await store.set("a", "2", 60, nx=True) is False
+    assert await store.get("a") == "1"
+    assert await store.get("missing") is None
+
+
+async def test_mget_mset_and_delete(store):
+    await store.mset({"a": "1", "b": "2"}, 60)
+    assert await store.mget(["a", "missing", "b"]) == ["1", None, "2"]
+    assert await store.mget([]) == []
+    assert await store.delete("a", "missing") == 1
+    assert await store.get("a") is None
+
+
+async def test_json_helpers(store):
+    await store.set_json("doc", {"text": "본문", "links": [1, 2]}, 60)
+    assert await store.get_json("doc") == {"text": "본문", "links": [1, 2]}
+    assert await store.mget_json(["doc", "missing"]) == [{"text": "본문", "links": [1, 2]}, None]
+
+
+async def test_values_expire(store):
+    await store.set("short", "1", 1)
+    await store.hset("hash", "field", "1", 1)
+    await asyncio.sleep(1.1)
+    assert await store.get("short") is None
+    assert await store.hgetall("hash") == {}
+
+
+async def test_touch_only_extends_ttl(store):
+    await store.set("a", "1", 100)
+    assert await store.touch("a", 50) is False
+    assert 95 <= await store.ttl("a") <= 100
+    assert await store.touch("a", 500) is True
+    assert 495 <= await store.ttl("a") <= 500
+    assert await store.touch("missing", 500) is False
+    assert await store.ttl("missing") is None
+
+
+async def test_counters_start_at_zero_and_never_expire(store):
+    assert await store.incr("hits") == 1
+    assert await store.incr("hits", 5) == 6
+    assert await store.get("hits") == "6"
+    assert await store.ttl("hits") is None
+
+
+async def test_hash_fields_are_independent(store):
+    assert await store.hset("h", "a", "1", 60) == 1
+    assert await store.hset("h", "b", "2", 60) == 2
+    assert await store.hset("h", "a", "3", 60) == 2
+    assert await store.hgetall("h") == {"a": "3", "b": "2"}
+    assert await store.hdel("h", "a", "missing") == 1
+    assert await store.hdel("h") == 0
+    assert await store.hgetall("h") == {"b": "2"}
+    assert 55 <= await store.ttl("h") <= 60
+
+
+@pytest.mark.parametrize("max_entries", [None, 100])
+async def test_batch_matches_individual_commands(make_store, max_entries):
+    # max_entries가 없으면 Redis는 파이프라인 한 번으로, 있으면 명령별로 처리한다 (결과 형태는 같아야 함)
+    store = make_store(max_entries)
+    await store.set("existing", "old", 100)
+    results = await store.execute(
+        StoreBatch()
+        .set("new", "1", 60, nx=True)
+        .set("existing", "2", 60, nx=True)
+        .touch("existing", 500)
+        .touch("new", 10)
+        .get("existing")
+        .get("missing")
+        .set_json("json", {"a": 1}, 60)
+    )
+    assert results == [True, False, True, False, "old", None, True]
+    assert await store.get_json("json") == {"a": 1}
+    assert 495 <= await store.ttl("existing") <= 500
+
+
+async def test_lru_evicts_least_recently_used(make_store):
+    store = make_store(max_entries=2)
+    await store.set("a", "1", 60)
+    await asyncio.sleep(0.01)
+    await store.set("b", "2", 60)
+    await asyncio.sleep(0.01)
+    assert await store.get("a") == "1"  # a를 최근에 쓴 항목으로 만든다
+    await asyncio.sleep(0.01)
+    await store.set("c", "3", 60)
+
+    assert await store.mget(["a", "b", "c"]) == ["1", None, "3"]
+    assert (await store.size())["entries"] == 2
+
+
+async def test_deleted_keys_do_not_count_toward_lru_limit(make_store):
+    store = make_store(max_entries=2)
+    await store.set("a", "1", 60)
+    await store.set("b", "2", 60)
+    await store.delete("a")
+    await store.set("c", "3", 60)
+    assert await store.mget(["b", "c"]) == ["2", "3"]
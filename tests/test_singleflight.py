@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+import redis
+
+from utils.session_store import MemorySessionStore
+from utils.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+class Upstream:
+    """호출 수를 세고, release가 풀릴 때까지 응답을 미루는 가짜 업스트림"""
+
+    def __init__(self, result="요약", error: Exception = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    # 모든 호출이 합류(또는 잠금 대기)할 때까지 이벤트 루프를 몇 바퀴 돌린다
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def distributed_workers(store, count: int = 2):
+    # 같은 저장소를 쓰는 워커 여러 개
+    workers = [SingleFlight("test", store=store, lock_ttl=5, result_ttl=5) for _ in range(count)]
+    for worker in workers:
+        worker.POLL_INTERVAL = 0.01
+    return workers
+
+
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    upstream = Upstream()
+    callers = [asyncio.create_task(flight.do("key", upstream)) for _ in range(10)]
+    await settle()
+    upstream.release.set()
+
+    assert await asyncio.gather(*callers) == ["요약"] * 10
+    assert upstream.calls == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 9, "inflight": 0}
+
+
+async def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    upstream = Upstream()
+    upstream.release.set()
+    await asyncio.gather(flight.do("a", upstream), flight.do("b", upstream))
+    assert upstream.calls == 2
+
+
+async def test_leader_exception_reaches_every_caller():
+    flight = SingleFlight()
+    upstream = Upstream(error=RuntimeError("업스트림 오류"))
+    callers = [asyncio.create_task(flight.do("key", upstream)) for _ in range(3)]
+    await settle()
+    upstream.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert upstream.calls == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "업스트림 오류" for r in results)
+
+
+async def test_cancelled_follower_does_not_cancel_others():
+    flight = SingleFlight()
+    upstream = Upstream()
+    leader = asyncio.create_task(flight.do("key", upstream))
+    await settle()
+    follower = asyncio.create_task(flight.do("key", upstream))
+    other = asyncio.create_task(flight.do("key", upstream))
+    await settle()
+
+    follower.cancel()
+    await settle()
+    upstream.release.set()
+
+    assert (await leader, await other) == ("요약", "요약")
+    assert follower.cancelled()
+    assert upstream.calls == 1
+
+
+async def test_distributed_workers_share_one_call():
+    store = MemorySessionStore(100)
+    first, second = distributed_workers(store)
+    upstream = Upstream({"summary": "요약"})
+
+    leader = asyncio.create_task(first.do("key", upstream))
+    await settle()
+    follower = asyncio.create_task(second.do("key", upstream))
+    await asyncio.sleep(0.05)
+    upstream.release.set()
+
+    assert await leader == await follower == {"summary": "요약"}
+    assert upstream.calls == 1
+    assert (first.calls, second.calls, second.coalesced) == (1, 0, 1)
+    assert await store.get("singleflight:test:lock:key") is None  # 실행이 끝나면 잠금을 푼다
+
+
+async def test_distributed_failure_is_not_shared():
+    store = MemorySessionStore(100)
+    first, second = distributed_workers(store)
+    failed = Upstream({"success": False})
+    retried = Upstream({"success": True})
+    retried.release.set()
+
+    def encode(result):
+        return result if result["success"] else None
+
+    leader = asyncio.create_task(first.do("key", failed, encode=encode))
+    await settle()
+    follower = asyncio.create_task(second.do("key", retried, encode=encode))
+    await asyncio.sleep(0.05)
+    failed.release.set()
+
+    assert await leader == {"success": False}
+    # 실패 결과는 공유하지 않으므로 기다리던 워커가 직접 실행한다
+    assert await follower == {"success": True}
+    assert retried.calls == 1
+
+
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    upstream = Upstream()
+    leader = asyncio.create_task(flight.do("key", upstream))
+    await settle()
+    followers = [asyncio.create_task(flight.do("key", upstream)) for _ in range(2)]
+    await settle()
+
+    leader.cancel()  # 먼저 요청한 클라이언트의 연결이 끊긴 경우
+    await settle()
+    upstream.release.set()
+
+    assert await asyncio.gather(*followers) == ["요약", "요약"]
+    assert leader.cancelled()
+    assert upstream.calls == 1
+
+
+class BrokenResultStore(MemorySessionStore):
+    """결과 저장만 실패하는 저장소"""
+
+    async def set_json(self, key, value, ttl, nx=False):
+        raise redis.RedisError("연결 끊김")
+
+
+async def test_result_is_returned_when_sharing_fails():
+    store = BrokenResultStore(100)
+    flight, = distributed_workers(store, count=1)
+    upstream = Upstream({"summary": "요약"})
+    upstream.release.set()
+
+    assert await flight.do("key", upstream) == {"summary": "요약"}
+    assert await store.get("singleflight:test:lock:key") is None
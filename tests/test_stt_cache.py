@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from services.stt_cache import STTCache, audio_fingerprint
+from utils.audio_preprocess import encode_wav, preprocess_wav
+from utils.session_store import MemorySessionStore
+
+RATE = 16000
+
+
+def utterance(freqs, amplitude: float = 0.3, noise: float = 0.0, rate: int = RATE) -> bytes:
+    """주파수마다 0.4초 소리와 0.2초 쉼을 이어 붙인 녹음을 전처리한 WAV"""
+    t = np.arange(int(rate * 0.4)) / rate
+    pause = np.zeros(int(rate * 0.2), np.float32)
+    parts = [pause]
+    for freq in freqs:
+        parts += [(amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32), pause]
+    samples = np.concatenate(parts)
+    if noise:
+        samples = samples + np.random.default_rng(0).normal(0, noise, samples.size).astype(np.float32)
+    return preprocess_wav(encode_wav(samples, rate)).data
+
+
+@pytest.fixture
+def cache():
+    cache = STTCache(entries=MemorySessionStore(100), counters=MemorySessionStore(100), ttl=60, max_entries=100)
+    cache.enabled = True
+    cache.fingerprint_enabled = True
+    return cache
+
+
+def test_same_length_different_utterances_have_different_fingerprints():
+    assert audio_fingerprint(utterance([440, 880, 1500])) != audio_fingerprint(utterance([1500, 440, 880]))
+
+
+def test_different_durations_have_different_fingerprints():
+    assert audio_fingerprint(utterance([440, 880, 1500])) != audio_fingerprint(utterance([440, 880, 1500, 440]))
+
+
+@pytest.mark.parametrize("variant", [{"amplitude": 0.1}, {"noise": 0.001}])
+def test_volume_and_light_noise_keep_fingerprint(variant):
+    assert audio_fingerprint(utterance([440, 880, 1500], **variant)) == audio_fingerprint(utterance([440, 880, 1500]))
+
+
+@pytest.mark.anyio
+async def test_different_utterance_does_not_hit_cached_transcript(cache):
+    await cache.set(utterance([440, 880, 1500]), "Kor", {"success": True, "text": "첫 번째 발화"})
+
+    assert await cache.get(utterance([1500, 440, 880]), "Kor") is None
+    assert (await cache.get(utterance([440, 880, 1500], amplitude=0.1), "Kor"))["text"] == "첫 번째 발화"
+    stats = await cache.stats()
+    assert (stats["hits"], stats["fingerprint_hits"], stats["misses"]) == (0, 1, 1)
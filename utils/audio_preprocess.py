@@ -0,0 +1,292 @@
+import asyncio
+import io
+import struct
+import wave
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from config.naver_stt_settings import settings, logger
+from utils.audio_utils import WAV_EXTENSIBLE, WAV_FLOAT, WAV_PCM, sniff_audio_format
+
+# 스트리밍 녹음기가 data 크기를 채우지 않고 남기는 값
+_UNKNOWN_DATA_SIZES = (0, 0xFFFFFFFF)
+
+# 구간 경계 후보로 볼 에너지 여유 (가장 조용한 지점 대비 dB)
+_QUIET_MARGIN_DB = 3.0
+
+
+@dataclass
+class PreprocessedAudio:
+    """전처리(모노 다운믹스, 무음 제거, 리샘플링)를 마친 PCM16 WAV"""
+    data: bytes
+    samples: np.ndarray       # 전처리된 모노 float32 샘플 (구간 분할용)
+    sample_rate: int
+    duration: float           # 전처리 후 길이 (초)
+    original_duration: float  # 업로드된 원본 길이 (초)
+    offset: float = 0.0       # 원본 기준 시각 = 전처리 후 시각 + offset (앞에 무음을 채웠으면 음수)
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """WAV(PCM 8/16/24/32비트, IEEE float)를 (샘플 수, 채널 수) float32 배열로 읽습니다.
+
+    값 범위는 -1.0 ~ 1.0이며, 해석할 수 없는 파일이면 ValueError를 던진다.
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("RIFF/WAVE 헤더가 없습니다.")
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack_from("<I", data, pos + 4)[0]
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            codec, channels, sample_rate, _, block_align, bits = struct.unpack_from("<HHIIHH", data, body)
+            if codec == WAV_EXTENSIBLE and chunk_size >= 26:
+                codec = struct.unpack_from("<H", data, body + 24)[0]
+            fmt = (codec, channels, sample_rate, block_align, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("fmt 청크가 data 청크보다 뒤에 있습니다.")
+            end = len(data) if chunk_size in _UNKNOWN_DATA_SIZES else min(body + chunk_size, len(data))
+            return _decode_samples(data[body:end], *fmt)
+        pos = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("data 청크가 없습니다.")
+
+
+def _decode_samples(raw: bytes, codec: int, channels: int, sample_rate: int,
+                    block_align: int, bits: int) -> Tuple[np.ndarray, int]:
+    if channels < 1 or sample_rate < 1 or block_align != channels * ((bits + 7) // 8):
+        raise ValueError("WAV 헤더 값이 올바르지 않습니다.")
+
+    raw = raw[:len(raw) - len(raw) % block_align]  # 잘린 마지막 프레임은 버린다
+    if codec == WAV_FLOAT and bits in (32, 64):
+        samples = np.frombuffer(raw, dtype="<f4" if bits == 32 else "<f8").astype(np.float32)
+    elif codec == WAV_PCM and bits == 8:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif codec == WAV_PCM and bits == 16:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif codec == WAV_PCM and bits == 24:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        # 상위 바이트를 int32의 최상위에 놓아 부호를 살린 뒤 2^31로 나눈다
+        samples = ((b[:, 0] << 8) | (b[:, 1] << 16) | (b[:, 2] << 24)).astype(np.float32) / 2147483648.0
+    elif codec == WAV_PCM and bits == 32:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"지원하지 않는 WAV 샘플 형식입니다: 코덱 {codec}, {bits}비트")
+
+    return samples.reshape(-1, channels), sample_rate
+
+
+def downmix(samples: np.ndarray) -> np.ndarray:
+    """여러 채널을 평균 내어 모노로 합칩니다."""
+    if samples.ndim == 1:
+        return samples
+    if samples.shape[1] == 1:
+        return samples[:, 0]
+    return samples.mean(axis=1, dtype=np.float32)
+
+
+def resample(mono: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """FFT 대역 제한 리샘플링 (나이퀴스트 위 성분을 잘라 앨리어싱 없이 다운샘플)"""
+    if src_rate == dst_rate or mono.size == 0:
+        return mono
+
+    n_out = max(1, int(round(mono.size * dst_rate / src_rate)))
+    spectrum = np.fft.rfft(mono)
+    bins = n_out // 2 + 1
+    if bins <= spectrum.size:
+        spectrum = spectrum[:bins]
+    else:
+        spectrum = np.concatenate([spectrum, np.zeros(bins - spectrum.size, dtype=spectrum.dtype)])
+    return (np.fft.irfft(spectrum, n_out) * (n_out / mono.size)).astype(np.float32)
+
+
+def frame_energy_db(mono: np.ndarray, sample_rate: int, frame_ms: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """프레임별 RMS 에너지(dBFS)와 프레임 길이(샘플 수)를 계산합니다."""
+    frame_len = max(1, sample_rate * (frame_ms or settings.STT_VAD_FRAME_MS) // 1000)
+    n_frames = mono.size // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32), frame_len
+
+    frames = mono[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10)), frame_len
+
+
+def speech_mask(energy_db: np.ndarray) -> np.ndarray:
+    """음성 프레임 여부 (고정 임계값과 최대 에너지 대비 상대 임계값 중 높은 쪽 기준)"""
+    if energy_db.size == 0:
+        return np.zeros(0, dtype=bool)
+    threshold = max(settings.STT_SILENCE_THRESHOLD_DB, float(energy_db.max()) - settings.STT_VAD_DYNAMIC_RANGE_DB)
+    return energy_db > threshold
+
+
+def speech_bounds(mono: np.ndarray, sample_rate: int) -> Optional[Tuple[int, int]]:
+    """음성 구간의 (시작, 끝) 샘플 위치 (여유 미포함). 음성 구간이 없으면 None
+
+    프레임 단위로 찾은 음성 구간을 고정 임계값(STT_SILENCE_THRESHOLD_DB)을 처음/마지막으로 넘는 샘플로
+    좁혀, 앞뒤 무음 길이가 달라 프레임 경계가 어긋나도 같은 녹음이면 같은 위치가 나온다.
+    """
+    energy_db, frame_len = frame_energy_db(mono, sample_rate)
+    voiced = np.flatnonzero(speech_mask(energy_db))
+    if voiced.size == 0:
+        return None
+
+    padding = sample_rate * settings.STT_SILENCE_PADDING_MS // 1000
+    lo = max(0, voiced[0] * frame_len - padding)
+    hi = min(mono.size, (voiced[-1] + 1) * frame_len + padding)
+    loud = np.flatnonzero(np.abs(mono[lo:hi]) > 10.0 ** (settings.STT_SILENCE_THRESHOLD_DB / 20.0))
+    if loud.size == 0:
+        return int(voiced[0] * frame_len), int((voiced[-1] + 1) * frame_len)
+    return int(lo + loud[0]), int(lo + loud[-1] + 1)
+
+
+def trim_silence(mono: np.ndarray, sample_rate: int) -> Optional[np.ndarray]:
+    """앞뒤 무음을 STT_SILENCE_PADDING_MS 여유만 남기고 잘라냅니다. 음성 구간이 없으면 None을 반환합니다."""
+    bounds = speech_bounds(mono, sample_rate)
+    if bounds is None:
+        return None
+    padding = sample_rate * settings.STT_SILENCE_PADDING_MS // 1000
+    return mono[max(0, bounds[0] - padding):min(mono.size, bounds[1] + padding)]
+
+
+def split_at_silence(mono: np.ndarray, sample_rate: int,
+                     max_seconds: Optional[float] = None) -> List[Tuple[int, int]]:
+    """긴 음성을 max_seconds 이하 구간으로 나눕니다. 반환값: (시작, 끝) 샘플 위치 목록
+
+    경계는 각 구간 후반부에서 가장 조용한 쉼(STT_SEGMENT_MIN_SILENCE_MS 이동 평균 에너지 최소)이라
+    단어 중간이 아닌 쉼에서 잘리고, 마지막 구간이 지나치게 짧아지지 않도록 한다.
+    """
+    max_len = int(sample_rate * (max_seconds or settings.STT_SEGMENT_MAX_SECONDS))
+    if mono.size <= max_len:
+        return [(0, mono.size)]
+
+    energy_db, frame_len = frame_energy_db(mono, sample_rate)
+    window = max(1, settings.STT_SEGMENT_MIN_SILENCE_MS // settings.STT_VAD_FRAME_MS)
+    smoothed = np.convolve(energy_db, np.full(window, 1.0 / window), mode="same")
+
+    max_frames = max(2, max_len // frame_len)
+    n_frames = energy_db.size
+    bounds = []
+    start = 0
+    while mono.size - start * frame_len > max_len:
+        hi = min(start + max_frames, n_frames - max_frames // 4)
+        lo = min(start + max_frames // 2, hi - 1)
+        # 비슷하게 조용한 지점이 여럿이면 가장 늦은 곳에서 잘라 구간 수를 줄인다
+        quiet = np.flatnonzero(smoothed[lo:hi] <= smoothed[lo:hi].min() + _QUIET_MARGIN_DB)
+        cut = lo + int(quiet[-1])
+        bounds.append((start * frame_len, cut * frame_len))
+        start = cut
+    bounds.append((start * frame_len, mono.size))
+    return bounds
+
+
+def load_wav_mono(data: bytes) -> Tuple[np.ndarray, int]:
+    """WAV를 모노로 읽습니다. (샘플, 샘플레이트)"""
+    samples, rate = decode_wav(data)
+    return downmix(samples), rate
+
+
+def encode_wav(mono: np.ndarray, sample_rate: int) -> bytes:
+    """float32 모노 샘플을 PCM16 WAV로 인코딩합니다."""
+    pcm = (np.clip(mono, -1.0, 1.0) * 32767.0).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def preprocess_wav(data: bytes) -> Optional[PreprocessedAudio]:
+    """WAV를 모노로 바꾸고 앞뒤 무음을 잘라낸 뒤 목표 샘플레이트로 낮춥니다. 음성이 없으면 None
+
+    음성 시작/끝 샘플에서 정확히 STT_SILENCE_PADDING_MS만큼 앞뒤를 남기고(모자라면 0으로 채움)
+    자른 구간만 리샘플링하므로, 같은 녹음이면 앞뒤 무음 길이나 (같은 신호가 담긴) 채널 수가 달라도
+    결과 바이트가 같다. 샘플레이트가 다른 원본끼리는 같은 바이트가 보장되지 않는다.
+    """
+    mono, rate = load_wav_mono(data)
+    original_duration = mono.size / rate
+    bounds = speech_bounds(mono, rate)
+    if bounds is None:
+        return None
+
+    padding = rate * settings.STT_SILENCE_PADDING_MS // 1000
+    start, end = bounds[0] - padding, bounds[1] + padding
+    speech = np.concatenate([
+        np.zeros(max(0, -start), dtype=np.float32),
+        mono[max(0, start):min(mono.size, end)],
+        np.zeros(max(0, end - mono.size), dtype=np.float32),
+    ])
+
+    # 업샘플링은 정보 없이 크기만 늘리므로 하지 않는다
+    target_rate = settings.STT_TARGET_SAMPLE_RATE
+    if rate > target_rate:
+        speech = resample(speech, rate, target_rate)
+    return PreprocessedAudio(
+        data=encode_wav(speech, min(rate, target_rate)),
+        samples=speech,
+        sample_rate=min(rate, target_rate),
+        duration=speech.size / min(rate, target_rate),
+        original_duration=original_duration,
+        offset=start / rate,
+    )
+
+
+async def preprocess_audio(chunks: AsyncIterator[bytes], content_length: Optional[int] = None
+                           ) -> Tuple[AsyncIterator[bytes], Optional[int], Optional[PreprocessedAudio]]:
+    """업로드 스트림이 STT_PREPROCESS_MAX_BYTES 이하의 WAV면 전처리한 오디오로 바꾸고, 아니면 그대로 흘려보냅니다.
+
+    반환값: (업로드할 스트림, 업로드 크기, 전처리 결과)
+    전처리하지 않으면 크기는 입력값 그대로이고 전처리 결과는 None이다.
+    """
+    try:
+        head = await chunks.__anext__()
+    except StopAsyncIteration:
+        head = b""
+
+    max_bytes = settings.STT_PREPROCESS_MAX_BYTES
+    if (not settings.STT_PREPROCESS_ENABLED or sniff_audio_format(head) != "wav"
+            or (content_length and content_length > max_bytes)):
+        return _prepend(head, chunks), content_length, None
+
+    # 뒤쪽 무음을 찾으려면 전체가 필요하므로 STT_PREPROCESS_MAX_BYTES까지만 모은다
+    # 크기를 모르는 업로드가 상한을 넘으면 모은 부분과 나머지를 그대로 흘려보낸다 (메모리는 상한까지만 사용)
+    parts = [head]
+    buffered = len(head)
+    async for chunk in chunks:
+        parts.append(chunk)
+        buffered += len(chunk)
+        if buffered > max_bytes:
+            logger.info(f"오디오 전처리 생략: {buffered} bytes 이상 (상한 {max_bytes} bytes)")
+            return _prepend(b"".join(parts), chunks), content_length, None
+    data = b"".join(parts)
+    del parts
+
+    try:
+        result = await asyncio.to_thread(preprocess_wav, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"WAV 파일을 해석할 수 없습니다: {str(e)}")
+
+    if result is None:
+        raise HTTPException(status_code=400, detail="음성이 감지되지 않았습니다. 다시 녹음해주세요.")
+
+    logger.info(
+        f"오디오 전처리: {len(data)} → {len(result.data)} bytes, "
+        f"{result.original_duration:.2f} → {result.duration:.2f}초, {result.sample_rate}Hz"
+    )
+    return _prepend(result.data), len(result.data), result
+
+
+async def _prepend(head: bytes, rest: Optional[AsyncIterator[bytes]] = None) -> AsyncIterator[bytes]:
+    if head:
+        yield head
+    if rest is not None:
+        async for chunk in rest:
+            yield chunk
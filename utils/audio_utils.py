@@ -0,0 +1,169 @@
+import struct
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from config.naver_stt_settings import settings
+from core.exceptions.stt_exceptions import AudioStreamValidator
+
+# 형식/코덱 판별에 필요한 최소 헤더 길이 (WAV fmt 청크, Ogg 첫 패킷까지)
+AUDIO_HEADER_SIZE = 64
+
+# 클로바 CSR이 받는 컨테이너 형식
+SUPPORTED_FORMATS = ("wav", "mp3", "aac", "ac3", "ogg", "flac")
+# 로컬에서 해석/변환할 수 있는 WAV 코덱 (1: PCM, 3: IEEE float)
+WAV_PCM = 1
+WAV_FLOAT = 3
+WAV_EXTENSIBLE = 0xFFFE
+SUPPORTED_WAV_CODECS = (WAV_PCM, WAV_FLOAT)
+
+
+@dataclass
+class AudioHeader:
+    """파일 앞부분에서 읽은 오디오 형식 정보 (헤더로 알 수 없는 값은 None)"""
+    format: str
+    codec: Optional[str] = None
+    channels: Optional[int] = None
+    sample_rate: Optional[int] = None
+    bits_per_sample: Optional[int] = None
+    wav_codec: Optional[int] = None
+
+
+def sniff_audio_format(header: bytes) -> Optional[str]:
+    """파일 앞부분(매직 바이트)으로 오디오 컨테이너 형식을 판별합니다."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:3] == b"ID3":
+        return "mp3"
+    if header[:6] == b"#!AMR\n":
+        return "amr"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if header[4:8] == b"ftyp":
+        return "m4a"
+    if header[:2] == b"\x0b\x77":
+        return "ac3"
+    if len(header) >= 2 and header[0] == 0xFF:
+        # MPEG 프레임 싱크: layer 비트가 00이면 AAC(ADTS), 아니면 MP3
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"
+        if header[1] & 0xE0 == 0xE0 and _valid_mpeg_frame(header):
+            return "mp3"
+    return None
+
+
+def _valid_mpeg_frame(header: bytes) -> bool:
+    # 예약된 버전/레이어/비트레이트/샘플레이트 값이면 MP3 프레임이 아니다
+    if len(header) < 3:
+        return True
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate = header[2] >> 4
+    sample_rate = (header[2] >> 2) & 0x03
+    return version != 0x01 and layer != 0x00 and bitrate != 0x0F and sample_rate != 0x03
+
+
+def inspect_audio_header(header: bytes) -> Optional[AudioHeader]:
+    """컨테이너 형식과 (헤더에 있으면) 코덱, 채널 수, 샘플레이트를 읽습니다."""
+    fmt = sniff_audio_format(header)
+    if fmt == "wav":
+        return _inspect_wav(header)
+    if fmt == "ogg":
+        return AudioHeader(format="ogg", codec=_ogg_codec(header))
+    if fmt == "flac" and len(header) >= 26:
+        # STREAMINFO: 샘플레이트 20비트, 채널 수-1 3비트, 샘플당 비트-1 5비트
+        info = int.from_bytes(header[18:22], "big")
+        return AudioHeader(format="flac", codec="flac", sample_rate=info >> 12,
+                           channels=((info >> 9) & 0x07) + 1, bits_per_sample=((info >> 4) & 0x1F) + 1)
+    return AudioHeader(format=fmt, codec=fmt) if fmt else None
+
+
+def _inspect_wav(header: bytes) -> AudioHeader:
+    pos = 12
+    while pos + 8 <= len(header):
+        chunk_id = header[pos:pos + 4]
+        chunk_size = struct.unpack_from("<I", header, pos + 4)[0]
+        if chunk_id == b"fmt " and pos + 24 <= len(header):
+            codec, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", header, pos + 8)
+            if codec == WAV_EXTENSIBLE and pos + 34 <= len(header):
+                codec = struct.unpack_from("<H", header, pos + 32)[0]  # SubFormat GUID 앞 2바이트
+            return AudioHeader(format="wav", codec="pcm" if codec == WAV_PCM else "float" if codec == WAV_FLOAT else None,
+                               channels=channels, sample_rate=sample_rate, bits_per_sample=bits, wav_codec=codec)
+        pos += 8 + chunk_size + (chunk_size & 1)
+    # fmt 청크가 헤더 범위 밖에 있으면 코덱은 본문을 읽을 때 확인한다
+    return AudioHeader(format="wav")
+
+
+def _ogg_codec(header: bytes) -> Optional[str]:
+    if len(header) < 28:
+        return None
+    packet = header[27 + header[26]:]
+    if packet.startswith(b"\x01vorbis"):
+        return "vorbis"
+    if packet.startswith(b"OpusHead"):
+        return "opus"
+    if packet.startswith(b"\x7fFLAC"):
+        return "flac"
+    if packet.startswith(b"Speex"):
+        return "speex"
+    return None
+
+
+def unsupported_reason(info: Optional[AudioHeader]) -> Optional[str]:
+    """업로드 전에 거를 입력이면 사유를, 보낼 수 있으면 None을 반환합니다."""
+    if info is None:
+        return "지원하지 않는 오디오 형식입니다."
+    if info.format not in SUPPORTED_FORMATS:
+        return f"지원하지 않는 오디오 형식입니다: {info.format} (지원: {', '.join(SUPPORTED_FORMATS)})"
+    if info.format == "wav" and info.wav_codec is not None:
+        if info.wav_codec not in SUPPORTED_WAV_CODECS:
+            return f"지원하지 않는 WAV 코덱입니다: 0x{info.wav_codec:04x} (PCM, IEEE float만 지원)"
+        if not info.channels or not info.sample_rate or not info.bits_per_sample:
+            return "WAV 헤더가 올바르지 않습니다."
+    return None
+
+
+async def validated_audio_stream(chunks: AsyncIterator[bytes],
+                                 expected_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """업로드 청크를 검사하면서 그대로 흘려보내는 스트림을 엽니다.
+
+    헤더(형식)와 선언된 크기는 업스트림 요청을 열기 전에 먼저 검사하고,
+    실제 누적 크기는 청크가 지나갈 때마다 검사합니다.
+    """
+    validator = AudioStreamValidator(expected_size)
+
+    # 형식 판별이 가능할 만큼 헤더를 먼저 모은다
+    head = b""
+    exhausted = False
+    while len(head) < AUDIO_HEADER_SIZE:
+        try:
+            head += await chunks.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            break
+
+    validator.feed(head)
+
+    async def _stream() -> AsyncIterator[bytes]:
+        if head:
+            yield head
+        if not exhausted:
+            async for chunk in chunks:
+                validator.feed(chunk)
+                yield chunk
+        validator.finish()
+
+    return _stream()
+
+
+async def iter_upload_chunks(upload, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """UploadFile을 고정 크기 청크로 읽습니다. (파일 전체를 메모리에 올리지 않음)"""
+    chunk_size = chunk_size or settings.STT_STREAM_CHUNK_SIZE
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
@@ -0,0 +1,207 @@
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class AhoCorasick(Generic[T]):
+    """여러 패턴을 한 번의 순회로 찾는 Aho-Corasick 오토마톤 (생성 시 한 번만 컴파일)"""
+
+    def __init__(self, patterns: Dict[str, T]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, T]]] = [[]]  # 상태별 (패턴 길이, 값)
+
+        for pattern, value in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), value))
+
+        # 실패 링크를 너비 우선으로 연결하고 접미사 패턴의 출력을 합친다 (루트 자식의 실패 링크는 루트)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def search(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """일치하는 모든 (시작, 끝, 값)을 끝 위치 순으로 반환합니다."""
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, value in self._out[state]:
+                yield i - length + 1, i + 1, value
+
+
+@dataclass(frozen=True)
+class _Cue:
+    kind: str                   # navigate / ordinal / yes / no
+    value: Optional[int] = None  # ordinal: 0부터 시작하는 위치 (-1은 마지막)
+    left_boundary: bool = False  # 앞이 어절 경계여야 함 ("11번" 안의 "1번" 제외)
+    right_boundary: bool = False  # 뒤도 어절 경계여야 함 ("네이버" 안의 "네" 제외)
+
+
+@dataclass
+class Intent:
+    """발화 하나에서 찾은 음성 명령 의도"""
+    navigate: bool = False          # 이동 동사 ("보여줘", "열어줘" 등)
+    ordinal: Optional[int] = None   # 순서 지정 (0부터, -1은 마지막)
+    answer: Optional[str] = None    # 네/아니요 답변 ("yes" / "no")
+
+
+# "보여줘"는 기존 동작대로 붙여 쓴 발화("경제보여줘")도 인정하고,
+# 나머지는 앞이 어절 경계일 때만 이동으로 본다. ("누가 줘"의 "가 줘" 같은 오인식 방지를 위해
+# 단독 "가줘"는 넣지 않는다)
+NAVIGATION_VERBS = [
+    "보여줘", "보여 줘", "보여주세요", "보여 주세요", "보여줄래",
+]
+
+BOUNDED_NAVIGATION_VERBS = [
+    "열어줘", "열어 줘", "열어주세요", "열어 주세요", "이동해줘", "이동해 줘", "이동해주세요", "이동해 주세요",
+    "들어가줘", "들어가 줘", "눌러줘", "눌러 줘", "클릭해줘", "클릭해 줘",
+]
+
+YES_WORDS = [
+    "네", "넵", "네네", "예", "응", "응응", "어", "그래", "그래요", "좋아", "좋아요", "맞아", "맞아요", "알려줘", "알려주세요",
+    "찾아줘", "찾아 줘", "찾아주세요", "부탁해", "부탁해요", "해줘", "해 줘", "yes", "ok", "okay", "오케이", "ㅇㅇ",
+]
+
+NO_WORDS = [
+    "아니요", "아니오", "아뇨", "아니", "아니야", "아니에요", "싫어", "싫어요", "됐어", "됐어요", "괜찮아", "괜찮아요",
+    "필요없어", "필요 없어", "필요없어요", "필요 없어요", "안 해", "안해", "그만", "no", "ㄴㄴ",
+]
+
+# 네/아니요 단서 외에 답변 발화에 함께 와도 되는 말 (이 밖의 말이 섞이면 답변으로 보지 않는다)
+ANSWER_FILLERS = {"요", "좀", "음", "그럼", "please"}
+
+# 고유어 서수 (첫 번째 ~ 열 번째)
+KOREAN_ORDINALS = {"첫": 0, "두": 1, "세": 2, "네": 3, "다섯": 4, "여섯": 5, "일곱": 6, "여덟": 7, "아홉": 8, "열": 9}
+KOREAN_ORDINAL_NOUNS = {"첫째": 0, "둘째": 1, "셋째": 2, "넷째": 3, "다섯째": 4, "여섯째": 5, "일곱째": 6, "여덟째": 7,
+                        "아홉째": 8, "열째": 9}
+ORDINAL_SUFFIXES = ("번째", " 번째", "번", " 번")
+MAX_NUMERIC_ORDINAL = 30
+
+
+def _build_patterns() -> Dict[str, _Cue]:
+    patterns: Dict[str, _Cue] = {}
+    for verb in NAVIGATION_VERBS:
+        patterns[verb] = _Cue("navigate")
+    for verb in BOUNDED_NAVIGATION_VERBS:
+        patterns[verb] = _Cue("navigate", left_boundary=True)
+    for word in YES_WORDS:
+        patterns[word] = _Cue("yes", left_boundary=True, right_boundary=True)
+    for word in NO_WORDS:
+        patterns[word] = _Cue("no", left_boundary=True, right_boundary=True)
+
+    for word, index in KOREAN_ORDINALS.items():
+        for suffix in ORDINAL_SUFFIXES:
+            patterns[word + suffix] = _Cue("ordinal", index, left_boundary=True)
+    for word, index in KOREAN_ORDINAL_NOUNS.items():
+        patterns[word] = _Cue("ordinal", index, left_boundary=True)
+    for number in range(1, MAX_NUMERIC_ORDINAL + 1):
+        for suffix in ORDINAL_SUFFIXES:
+            patterns[f"{number}{suffix}"] = _Cue("ordinal", number - 1, left_boundary=True)
+    for word in ("처음", "맨 처음", "맨앞", "맨 앞"):
+        patterns[word] = _Cue("ordinal", 0, left_boundary=True)
+    for word in ("마지막", "맨 마지막", "맨끝", "맨 끝", "맨뒤", "맨 뒤"):
+        patterns[word] = _Cue("ordinal", -1, left_boundary=True)
+    return patterns
+
+
+_PATTERNS = _build_patterns()
+_MATCHER: AhoCorasick[_Cue] = AhoCorasick(_PATTERNS)
+
+
+def normalize_utterance(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    return pos <= 0 or pos >= len(text) or not text[pos].isalnum()
+
+
+def _matches(text: str) -> List[Tuple[int, int, _Cue]]:
+    # 경계 조건을 만족하는 일치 중 가장 왼쪽, 같은 위치면 가장 긴 것을 겹치지 않게 고른다
+    candidates = [
+        (start, end, cue) for start, end, cue in _MATCHER.search(text)
+        if (not cue.left_boundary or _is_boundary(text, start - 1))
+        and (not cue.right_boundary or _is_boundary(text, end))
+    ]
+    candidates.sort(key=lambda m: (m[0], m[0] - m[1]))
+
+    selected = []
+    last_end = 0
+    for start, end, cue in candidates:
+        if start >= last_end:
+            selected.append((start, end, cue))
+            last_end = end
+    return selected
+
+
+def route_utterance(utterance: str) -> Intent:
+    """발화를 한 번 훑어 이동 / 순서 / 네·아니요 의도를 모두 찾습니다.
+
+    네/아니요는 발화 전체가 답변 단서(와 ANSWER_FILLERS)로만 이뤄졌을 때만 인정한다.
+    ("어 잠깐만 뭐라고?", "이거 뭐야 알려줘"처럼 다른 말이 섞이면 답변이 아님)
+    """
+    text = normalize_utterance(utterance)
+    intent = Intent()
+    answers = set()
+    rest = []
+    last_end = 0
+    for start, end, cue in _matches(text):
+        if cue.kind == "navigate":
+            intent.navigate = True
+        elif cue.kind == "ordinal":
+            if intent.ordinal is None:
+                intent.ordinal = cue.value
+        else:
+            answers.add(cue.kind)
+            rest.append(text[last_end:start])
+            last_end = end
+    rest.append(text[last_end:])
+    if any(word not in ANSWER_FILLERS for word in " ".join(rest).split()):
+        return intent
+
+    # "아니 괜찮아" 처럼 부정이 하나라도 있으면 부정으로 본다
+    if "no" in answers:
+        intent.answer = "no"
+    elif "yes" in answers:
+        intent.answer = "yes"
+    return intent
+
+
+def strip_navigation(utterance: str) -> str:
+    """정규화한 발화에서 이동 동사를 지웁니다. (링크 텍스트 매칭용)"""
+    text = normalize_utterance(utterance)
+    parts = []
+    last_end = 0
+    for start, end, cue in _matches(text):
+        if cue.kind == "navigate":
+            parts.append(text[last_end:start])
+            last_end = end
+    parts.append(text[last_end:])
+    return _SPACE_RE.sub(" ", " ".join(parts)).strip()
@@ -1,10 +1,127 @@
-from typing import List, Optional
-from rapidfuzz import process
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
 from models.content_model import Link
+from utils.metrics import record_cache
+from utils.intent_router import strip_navigation
+
+# 유사도 임계값 (이 점수를 넘어야 일치로 본다)
+LINK_SCORE_THRESHOLD = 60
+# 문자 bigram 겹침 기준으로 추린 뒤 정밀 비교할 후보 수
+PREFILTER_LIMIT = 64
+# 프로세스 내 링크 색인 캐시 크기 (문서 내용 해시 기준)
+LINK_INDEX_CACHE_SIZE = 256
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def normalize_query(query: str) -> str:
+    # 이동 동사는 음성 명령 라우터와 같은 목록으로 지운다
+    return normalize_text(strip_navigation(query))
+
+
+def _bigrams(text: str) -> set:
+    compact = text.replace(" ", "")
+    if len(compact) < 2:
+        return {compact} if compact else set()
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+class LinkIndex:
+    """링크 텍스트 퍼지 매칭 색인 (본문 로드 시 한 번 생성)
+
+    같은 텍스트를 가진 링크는 하나의 후보로 묶어 모두 보존하고,
+    질의 시에는 정확 일치 → bigram 후보 추림 → rapidfuzz 일괄 비교 순으로 찾는다.
+    """
+
+    def __init__(self, links: List[Link]):
+        self.links = links
+        self.texts: List[str] = []                 # 정규화된 고유 링크 텍스트
+        self.members: List[List[int]] = []         # 텍스트별 링크 위치 목록 (중복 텍스트 보존)
+        self.by_text: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}   # bigram → 텍스트 번호
+
+        for pos, link in enumerate(links):
+            text = normalize_text(link.text)
+            if not text:
+                continue
+            idx = self.by_text.get(text)
+            if idx is None:
+                idx = len(self.texts)
+                self.by_text[text] = idx
+                self.texts.append(text)
+                self.members.append([])
+                for gram in _bigrams(text):
+                    self.postings.setdefault(gram, []).append(idx)
+            self.members[idx].append(pos)
+
+    def candidates(self, query: str, limit: int = 5,
+                   threshold: float = LINK_SCORE_THRESHOLD) -> List[Tuple[List[Link], float]]:
+        """질의와 비슷한 링크 텍스트 후보를 (같은 텍스트의 링크 목록, 점수)로 반환합니다."""
+        normalized = normalize_query(query)
+        if not normalized or not self.texts:
+            return []
+
+        exact = self.by_text.get(normalized)
+        if exact is not None:
+            return [(self._links_of(exact), 100.0)]
+
+        pool = self._prefilter(normalized)
+        choices = {i: self.texts[i] for i in pool} if pool else self.texts
+        matches = process.extract(normalized, choices, scorer=fuzz.WRatio, processor=None,
+                                  limit=limit, score_cutoff=threshold)
+        # score_cutoff는 경계값을 포함하므로 기존 동작(임계값 초과만 인정)에 맞춰 같은 점수는 뺀다
+        return [(self._links_of(key), score) for _, score, key in matches if score > threshold]
+
+    def best(self, query: str, threshold: float = LINK_SCORE_THRESHOLD) -> Optional[Link]:
+        matches = self.candidates(query, limit=1, threshold=threshold)
+        if not matches:
+            return None
+        # 텍스트가 같은 링크가 여러 개면 페이지에서 먼저 나온 링크
+        return matches[0][0][0]
+
+    def _prefilter(self, normalized: str) -> Optional[List[int]]:
+        # 후보가 적으면 전체를 그대로 비교 (겹치는 bigram이 없을 때도 전체 비교)
+        if len(self.texts) <= PREFILTER_LIMIT:
+            return None
+
+        overlap: Counter = Counter()
+        for gram in _bigrams(normalized):
+            overlap.update(self.postings.get(gram, ()))
+        return [i for i, _ in overlap.most_common(PREFILTER_LIMIT)]
+
+    def _links_of(self, idx: int) -> List[Link]:
+        return [self.links[pos] for pos in self.members[idx]]
+
+
+# 문서 내용 해시 → LinkIndex (프로세스 내 LRU)
+_index_cache: "OrderedDict[str, LinkIndex]" = OrderedDict()
+
+
+def get_cached_link_index(cache_key: str) -> Optional[LinkIndex]:
+    index = _index_cache.get(cache_key)
+    record_cache("link_index", index is not None)
+    if index is not None:
+        _index_cache.move_to_end(cache_key)
+    return index
+
+
+def cache_link_index(cache_key: str, index: LinkIndex) -> None:
+    _index_cache[cache_key] = index
+    _index_cache.move_to_end(cache_key)
+    if len(_index_cache) > LINK_INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+
 
 def find_best_link(query: str, links: List[Link]) -> Optional[Link]:
-    candidates = {link.text: link for link in links}
-    best_match, score, _ = process.extractOne(query, candidates.keys())
-    if score > 60:  # 유사도 임계값
-        return candidates[best_match]
-    return None
\ No newline at end of file
+    return LinkIndex(links).best(query)
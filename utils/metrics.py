@@ -0,0 +1,106 @@
+import functools
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# 라우트 지연 시간 (StreamingResponse는 응답 헤더를 보낼 때까지의 시간)
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "라우트별 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "처리 중인 요청 수",
+    ["method"],
+)
+
+# 업스트림 호출 지연 시간 (openai, naver_stt, naver_news, redis)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "업스트림 호출 시간",
+    ["upstream", "operation", "outcome"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "upstream_requests_in_flight",
+    "진행 중인 업스트림 호출 수",
+    ["upstream"],
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "모델별 사용 토큰 수",
+    ["model", "kind"],  # kind: prompt / completion
+)
+
+# 적중률 = hit / (hit + miss)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "캐시 조회 결과",
+    ["cache", "result"],  # result: hit / miss
+)
+
+# 로컬 분류 적중률 = rule / (rule + llm)
+QUERY_CLASSIFICATIONS = Counter(
+    "query_classifications_total",
+    "네/아니요 후속 질문 분류 경로",
+    ["source"],  # source: rule / llm / cache
+)
+
+SINGLEFLIGHT_REQUESTS = Counter(
+    "singleflight_requests_total",
+    "요청 합치기 결과",
+    ["name", "result"],  # result: leader / coalesced
+)
+
+
+class UpstreamCall:
+    """track_upstream 블록 안에서 호출 결과(outcome)를 바꿀 때 사용"""
+
+    def __init__(self):
+        self.outcome = "ok"
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str) -> Iterator[UpstreamCall]:
+    """블록 실행 시간을 업스트림 지연 시간으로 기록합니다. 예외가 나면 outcome=error."""
+    call = UpstreamCall()
+    in_flight = UPSTREAM_IN_FLIGHT.labels(upstream)
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.outcome = "error"
+        raise
+    finally:
+        in_flight.dec()
+        UPSTREAM_LATENCY.labels(upstream, operation, call.outcome).observe(time.perf_counter() - start)
+
+
+def timed_upstream(upstream: str, operation: Optional[str] = None):
+    """비동기 함수 호출을 track_upstream으로 감싸는 데코레이터"""
+    def decorator(fn):
+        name = operation or fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with track_upstream(upstream, name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_tokens(model: str, usage: Optional[dict]) -> None:
+    if not usage:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(usage.get("prompt_tokens") or 0)
+    LLM_TOKENS.labels(model, "completion").inc(usage.get("completion_tokens") or 0)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
@@ -1,18 +1,96 @@
-import requests
+import hashlib
+from typing import Optional
+
+import httpx
+import redis
+
+from config.naver_stt_settings import logger
 from config.news_settings import news_settings  # ✅ 새 설정 import
+from utils.metrics import track_upstream, record_cache
+from utils.redis_utils import store
+from utils.singleflight import SingleFlight
+
+CACHE_KEY_PREFIX = "news_search:"
+
+# 프로세스 전역에서 공유하는 keep-alive 커넥션 풀
+_client: Optional[httpx.AsyncClient] = None
+
+# 같은 키워드로 동시에 들어온 검색은 한 번의 API 호출로 합친다
+_search_flight = SingleFlight()
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers={
+                "X-Naver-Client-Id": news_settings.NAVER_CLIENT_ID,
+                "X-Naver-Client-Secret": news_settings.NAVER_CLIENT_SECRET,
+            },
+            limits=httpx.Limits(max_connections=news_settings.NEWS_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(news_settings.NEWS_TIMEOUT),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
 
-def search_naver_news(keyword: str, display: int = 4) -> list:
+
+def _cache_key(keyword: str, display: int) -> str:
+    normalized = " ".join(keyword.split()).lower()
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}{display}:{digest}"
+
+
+async def search_naver_news(keyword: str, display: int = 4) -> list:
     """
     네이버 뉴스 검색 API 호출 (Naver Developers)
+    키워드별 결과를 짧게 캐시하고, 같은 키워드의 동시 검색은 한 번의 호출로 합친다.
     """
-    url = "https://openapi.naver.com/v1/search/news.json"
-    headers = {
-        "X-Naver-Client-Id": news_settings.NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": news_settings.NAVER_CLIENT_SECRET,
-    }
+    key = _cache_key(keyword, display)
+    try:
+        cached = await store.get_json(key)
+    except redis.RedisError as e:
+        logger.warning(f"뉴스 검색 캐시 조회 실패: {str(e)}")
+        cached = None
+    record_cache("news_search", cached is not None)
+    if cached is not None:
+        return cached
+
+    return await _search_flight.do(key, lambda: _fetch_and_cache(key, keyword, display))
+
+
+async def _fetch_and_cache(key: str, keyword: str, display: int) -> list:
+    articles = await _fetch(keyword, display)
+    # 호출 실패(빈 결과)는 캐시하지 않아 다음 요청에서 다시 시도한다
+    if articles:
+        try:
+            await store.set_json(key, articles, news_settings.NEWS_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"뉴스 검색 캐시 저장 실패: {str(e)}")
+    return articles
+
+
+async def _fetch(keyword: str, display: int) -> list:
     params = {"query": keyword, "display": display, "sort": "sim"}
 
-    res = requests.get(url, headers=headers, params=params)
+    with track_upstream("naver_news", "search") as call:
+        try:
+            res = await get_client().get(news_settings.NAVER_NEWS_URL, params=params)
+        except httpx.TimeoutException:
+            call.outcome = "timeout"
+            logger.warning(f"❌ 네이버 뉴스 API 시간 초과: {keyword}")
+            return []
+        except httpx.HTTPError as e:
+            call.outcome = "error"
+            logger.warning(f"❌ 네이버 뉴스 API 연결 실패: {str(e)}")
+            return []
+        if res.status_code != 200:
+            call.outcome = "error"
 
     if res.status_code == 200:
         data = res.json()
@@ -24,5 +102,5 @@ def search_naver_news(keyword: str, display: int = 4) -> list:
             })
         return articles
     else:
-        print("❌ 네이버 뉴스 API 호출 실패:", res.status_code, res.text)
+        logger.warning(f"❌ 네이버 뉴스 API 호출 실패: {res.status_code} {res.text}")
         return []
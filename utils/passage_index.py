@@ -0,0 +1,121 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+INDEX_VERSION = 1
+
+# 문단/줄바꿈/문장 끝을 패시지 분할 경계로 사용
+_BOUNDARY_RE = re.compile(r"\n\s*\n|\n|(?<=[.!?。])\s+")
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """한국어 조사/어미 변화에 강하도록 어절 단위 문자 bigram으로 토큰화합니다."""
+    tokens = []
+    for word in _NON_WORD_RE.split(text.lower()):
+        if not word:
+            continue
+        if len(word) == 1:
+            tokens.append(word)
+            continue
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def split_passages(text: str, max_chars: int = 400) -> List[Tuple[int, int]]:
+    """본문을 최대 max_chars 길이의 패시지로 나누고 (시작, 끝) 위치 목록을 반환합니다."""
+    segments = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(text):
+        if match.start() > start:
+            segments.append((start, match.start()))
+        start = match.end()
+    if start < len(text):
+        segments.append((start, len(text)))
+
+    spans = []
+    current = None
+    for seg_start, seg_end in segments:
+        # 한 문장이 너무 길면 강제로 자른다
+        while seg_end - seg_start > max_chars:
+            if current:
+                spans.append(current)
+                current = None
+            spans.append((seg_start, seg_start + max_chars))
+            seg_start += max_chars
+
+        if current and seg_end - current[0] <= max_chars:
+            current = (current[0], seg_end)
+        else:
+            if current:
+                spans.append(current)
+            current = (seg_start, seg_end)
+    if current:
+        spans.append(current)
+
+    return [(s, e) for s, e in spans if text[s:e].strip()]
+
+
+def build_passage_index(text: str, max_chars: int = 400) -> dict:
+    """본문 로드 시 한 번 만들어 두는 BM25 색인 (JSON 직렬화 가능)
+
+    패시지 본문은 중복 저장하지 않고 원문 내 위치(span)만 저장한다.
+    """
+    spans = split_passages(text, max_chars)
+    term_freqs: List[Dict[str, int]] = []
+    lengths: List[int] = []
+    doc_freq: Counter = Counter()
+
+    for start, end in spans:
+        tokens = tokenize(text[start:end])
+        tf = Counter(tokens)
+        term_freqs.append(dict(tf))
+        lengths.append(len(tokens))
+        doc_freq.update(tf.keys())
+
+    return {
+        "version": INDEX_VERSION,
+        "spans": spans,
+        "tfs": term_freqs,
+        "lengths": lengths,
+        "df": dict(doc_freq),
+        "avgdl": (sum(lengths) / len(lengths)) if lengths else 0.0,
+    }
+
+
+def search_passages(index: dict, query: str, top_k: int = 4) -> List[int]:
+    """질의와 가장 관련 있는 패시지 번호를 최대 top_k개, 본문 순서대로 반환합니다."""
+    n = len(index["spans"])
+    if n == 0:
+        return []
+
+    query_terms = set(tokenize(query))
+    df = index["df"]
+    avgdl = index["avgdl"] or 1.0
+
+    scores = []
+    for i, (tf, length) in enumerate(zip(index["tfs"], index["lengths"])):
+        score = 0.0
+        for term in query_terms:
+            freq = tf.get(term)
+            if not freq:
+                continue
+            idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * freq * (BM25_K1 + 1) / (freq + BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl))
+        scores.append((score, i))
+
+    ranked = [i for score, i in sorted(scores, key=lambda x: (-x[0], x[1])) if score > 0][:top_k]
+    if not ranked:
+        # 일치하는 어휘가 없으면 문서 앞부분을 보낸다 (보통 제목/리드 문단)
+        ranked = list(range(min(top_k, n)))
+    return sorted(ranked)
+
+
+def select_passages(text: str, index: dict, query: str, top_k: int = 4) -> List[str]:
+    spans = index["spans"]
+    return [text[spans[i][0]:spans[i][1]] for i in search_passages(index, query, top_k)]
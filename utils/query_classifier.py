@@ -0,0 +1,137 @@
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import List, Optional
+
+from utils.metrics import record_cache
+
+# 분류 단서 (한쪽 단서만 있을 때만 로컬에서 확정)
+TERM_CUES = ("뜻", "의미", "정의", "용어", "단어", "어원", "개념", "무슨 말")
+ARTICLE_CUES = ("기사", "뉴스", "소식", "속보", "보도", "사건", "사고", "이슈", "최근", "최신")
+
+# 키워드에서 제외할 말 (질문 어미, 지시어, 단서어 등)
+STOPWORDS = {
+    "뭐야", "뭐예요", "뭔가요", "뭔데", "무엇", "무엇인가요", "뭐지", "뭐", "알려줘", "알려주세요", "알려", "궁금해",
+    "궁금합니다", "찾아줘", "찾아주세요", "보여줘", "보여주세요", "설명해줘", "설명", "관련", "관련된", "대해", "대해서",
+    "대한", "어떤", "무슨", "있어", "있나요", "있는", "좀", "더", "이", "그", "저", "이거", "그거", "저거", "여기",
+    "내용", "본문", "다른", "같은", "것", "수", "등", "및", "또", "또는", "그리고", "하지만", "위해", "통해",
+    "했다", "한다", "있다", "없다", "된다", "밝혔다", "말했다", "기자", "오늘", "지난", "이번", "올해",
+    *TERM_CUES, *ARTICLE_CUES,
+}
+
+# 어절 끝에서 떼어낼 조사 (긴 것부터 시도, 남는 어간이 두 글자 이상일 때만)
+_PARTICLE_RE = re.compile(
+    r"^(?P<stem>.{2,}?)(에서는|으로는|이라는|이라고|에게서|라는|라고|이란|에서|으로|에게|까지|부터|처럼|보다|이랑|하고"
+    r"|란|은|는|이|가|을|를|의|에|도|만|로|와|과)$"
+)
+
+_WORD_RE = re.compile(r"[가-힣a-z0-9]+")
+
+# 단서어 뒤에 붙어도 단서로 보는 조사/어미 ("뜻이", "의미하는", "기사를"). "정의당", "사고방식", "뜻밖"처럼
+# 다른 글자가 이어지면 다른 단어다
+_CUE_ENDINGS = {
+    "", "은", "는", "이", "가", "을", "를", "의", "에", "도", "만", "로", "으로", "와", "과", "란", "이란", "라는",
+    "이라는", "라고", "이라고", "에서", "야", "이야", "예요", "이에요", "인가요", "하는", "한", "해", "해요", "합니다",
+}
+
+# 문맥 키워드 추출 시 앞부분(제목/리드)에 주는 가중치와 읽을 최대 길이
+TITLE_CHARS = 200
+TITLE_WEIGHT = 3
+CONTEXT_SCAN_CHARS = 6000
+
+# 프로세스 내 분류 결과 캐시 크기 ((질문, 문서 해시) 기준)
+DECISION_CACHE_SIZE = 4096
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def strip_particle(word: str) -> str:
+    match = _PARTICLE_RE.match(word)
+    return match.group("stem") if match else word
+
+
+def content_words(text: str) -> List[str]:
+    """조사를 떼고 불용어/한 글자 단어를 뺀 내용어 목록 (등장 순서 유지)"""
+    words = []
+    for word in _WORD_RE.findall(_normalize(text)):
+        stem = strip_particle(word)
+        if len(stem) >= 2 and stem not in STOPWORDS and not stem.isdigit():
+            words.append(stem)
+    return words
+
+
+def extract_context_keyword(context: str, limit: int = 2) -> Optional[str]:
+    """본문에서 가장 주된 내용어를 뽑습니다. (앞부분 단어에 가중치)"""
+    counts: Counter = Counter(content_words(context[:CONTEXT_SCAN_CHARS]))
+    for word in content_words(context[:TITLE_CHARS]):
+        counts[word] += TITLE_WEIGHT
+    if not counts:
+        return None
+    return " ".join(word for word, _ in counts.most_common(limit))
+
+
+def _has_cue(words: List[str], cue: str) -> bool:
+    # 단서어는 어절 단위로 맞춘다: 앞 어절들은 그대로, 마지막 어절은 뒤에 조사/어미만 붙을 수 있다
+    *head, last = cue.split()
+    for i in range(len(head), len(words)):
+        word = words[i]
+        if (word.startswith(last) and word[len(last):] in _CUE_ENDINGS
+                and words[i - len(head):i] == head):
+            return True
+    return False
+
+
+def _count_cues(words: List[str], cues) -> int:
+    return sum(1 for cue in cues if _has_cue(words, cue))
+
+
+def classify_locally(query: str, context: str) -> Optional[dict]:
+    """
+    규칙으로 질문을 'term' / 'article'로 분류하고 검색 키워드를 뽑습니다.
+
+    한쪽 단서만 있고 키워드를 뽑을 수 있을 때만 결과를 반환하며, 애매하면 None (LLM으로 넘김).
+    """
+    words = _WORD_RE.findall(_normalize(query))
+    term_hits = _count_cues(words, TERM_CUES)
+    article_hits = _count_cues(words, ARTICLE_CUES)
+    if bool(term_hits) == bool(article_hits):
+        return None
+
+    if term_hits:
+        # 'term'은 본문을 무시하고 질문에서 키워드를 뽑는다 ("인플레이션 뜻이 뭐야" → 인플레이션)
+        words = content_words(query)
+        if not words:
+            return None
+        return {"category": "term", "keyword": words[0]}
+
+    # 'article'은 본문의 주된 단어, 본문이 없으면 질문의 내용어를 키워드로 쓴다
+    keyword = extract_context_keyword(context) if context.strip() else None
+    if keyword is None:
+        words = content_words(query)
+        if not words:
+            return None
+        keyword = " ".join(words[:2])
+    return {"category": "article", "keyword": keyword}
+
+
+# (질문, 문서 해시) → 분류 결과 (프로세스 내 LRU)
+_decision_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+def get_cached_decision(query: str, context_hash: str) -> Optional[dict]:
+    key = (" ".join(query.split()), context_hash)
+    decision = _decision_cache.get(key)
+    record_cache("query_classifier", decision is not None)
+    if decision is not None:
+        _decision_cache.move_to_end(key)
+    return decision
+
+
+def cache_decision(query: str, context_hash: str, decision: dict) -> None:
+    key = (" ".join(query.split()), context_hash)
+    _decision_cache[key] = decision
+    _decision_cache.move_to_end(key)
+    if len(_decision_cache) > DECISION_CACHE_SIZE:
+        _decision_cache.popitem(last=False)
@@ -1,22 +1,101 @@
 import uuid
-import redis
 import json
+import hashlib
+from typing import Optional, Tuple
 
-# Redis 클라이언트 초기화
-r = redis.Redis(host="localhost", port=6379, db=0, decode_responses=True)
+from utils.session_store import StoreBatch, session_store
+
+# 세션 저장소 (SESSION_STORE_BACKEND에 따라 Redis 또는 프로세스 내 LRU)
+store = session_store
+
+
+async def close_store():
+    await store.close()
 
 # pending query 저장 (TTL 기본 300초 = 5분)
-def save_pending_query(query: str, ttl: int = 300) -> str:
+async def save_pending_query(query: str, ttl: int = 300) -> str:
     session_id = str(uuid.uuid4())  # 고유 세션 ID 생성
     data = {"query": query}
-    r.setex(f"pending:{session_id}", ttl, json.dumps(data))
+    await store.set_json(f"pending:{session_id}", data, ttl)
     return session_id
 
 # pending query 불러오기
-def get_pending_query(session_id: str):
-    raw = r.get(f"pending:{session_id}")
-    return json.loads(raw) if raw else None
+async def get_pending_query(session_id: str):
+    return await store.get_json(f"pending:{session_id}")
 
 # pending query 삭제
-def clear_pending_query(session_id: str):
-    r.delete(f"pending:{session_id}")
+async def clear_pending_query(session_id: str):
+    await store.delete(f"pending:{session_id}")
+
+
+# 본문 문서 저장 (내용 해시 기준으로 한 번만 저장, 세션 키에는 해시 포인터만 저장)
+# 반환값: (세션 ID, 내용 해시, 새로 저장된 문서인지 여부)
+async def save_context(inner_text: str, links: list, expire: int = 3600) -> tuple:
+    document = json.dumps({"inner_text": inner_text, "links": links}, ensure_ascii=False)
+    content_hash = hashlib.sha256(document.encode("utf-8")).hexdigest()
+    session_id = str(uuid.uuid4())
+
+    # 같은 문서가 이미 있으면 본문은 다시 쓰지 않고 TTL만 연장 (줄이지는 않음)
+    # 네 명령을 한 번의 파이프라인(한 커넥션, 한 번의 왕복)으로 보낸다
+    created, _, _, _ = await store.execute(
+        StoreBatch()
+        .set(f"doc:{content_hash}", document, expire, nx=True)
+        .touch(f"doc:{content_hash}", expire)
+        .touch(f"doc_index:{content_hash}", expire)
+        .set_json(f"context:{session_id}", {"doc": content_hash}, expire)
+    )
+    return session_id, content_hash, bool(created)
+
+# 세션 ID로 본문 문서 불러오기 (포인터 → 문서 해석, 두 번 왕복)
+# with_index=True면 패시지 검색 색인도 문서와 같은 왕복에서 함께 읽는다
+async def get_context(session_id: str, with_index: bool = False) -> dict:
+    raw = await store.get(f"context:{session_id}")
+    return await _resolve_context(raw, with_index)
+
+# pending query와 본문 포인터를 한 번의 왕복(mget)으로 읽고, pending이 있으면 포인터가 가리키는
+# 문서를 한 번 더 읽는다 (모두 두 번 왕복, 네/아니요 처리용)
+async def get_pending_and_context(pending_session_id: str, context_session_id: str) -> Tuple[Optional[dict], dict]:
+    raw_pending, raw_context = await store.mget([f"pending:{pending_session_id}", f"context:{context_session_id}"])
+
+    pending = json.loads(raw_pending) if raw_pending else None
+    if not pending:
+        return None, {}
+    return pending, await _resolve_context(raw_context)
+
+async def _resolve_context(raw: Optional[str], with_index: bool = False) -> dict:
+    if not raw:
+        return {}
+
+    pointer = json.loads(raw)
+    if "doc" not in pointer:
+        # 포인터 도입 이전에 저장된 세션은 본문을 그대로 담고 있다
+        return pointer
+
+    content_hash = pointer["doc"]
+    if with_index:
+        document, raw_index = await store.mget([f"doc:{content_hash}", f"doc_index:{content_hash}"])
+    else:
+        document, raw_index = await store.get(f"doc:{content_hash}"), None
+
+    if not document:
+        return {}
+
+    context = json.loads(document)
+    context["content_hash"] = content_hash
+    if with_index:
+        context["passage_index"] = json.loads(raw_index) if raw_index else None
+    return context
+
+
+# 본문 패시지 검색 색인 저장/조회 (문서와 같은 내용 해시 사용)
+# expire를 주지 않으면 문서의 남은 TTL을 따른다 (색인이 문서보다 오래 남거나 먼저 사라지지 않도록)
+async def save_passage_index(content_hash: str, index: dict, expire: Optional[int] = None):
+    if expire is None:
+        expire = await store.ttl(f"doc:{content_hash}")
+        if not expire:
+            return  # 문서가 이미 만료되었으면 색인도 저장하지 않는다
+    await store.set_json(f"doc_index:{content_hash}", index, expire)
+
+async def get_passage_index(content_hash: str):
+    return await store.get_json(f"doc_index:{content_hash}")
+
@@ -0,0 +1,372 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config.naver_stt_settings import settings
+from utils.metrics import timed_upstream
+
+
+class StoreBatch:
+    """한 번의 왕복으로 보낼 명령 묶음 (SessionStore.execute로 실행)
+
+    각 명령의 결과는 같은 이름의 SessionStore 메서드와 같은 형태로 순서대로 반환된다.
+    """
+
+    def __init__(self):
+        self.ops: List[Tuple] = []
+
+    def get(self, key: str) -> "StoreBatch":
+        self.ops.append(("get", key))
+        return self
+
+    def set(self, key: str, value: str, ttl: int, nx: bool = False) -> "StoreBatch":
+        self.ops.append(("set", key, value, ttl, nx))
+        return self
+
+    def set_json(self, key: str, value: Any, ttl: int, nx: bool = False) -> "StoreBatch":
+        return self.set(key, json.dumps(value, ensure_ascii=False), ttl, nx=nx)
+
+    def touch(self, key: str, ttl: int) -> "StoreBatch":
+        self.ops.append(("touch", key, ttl))
+        return self
+
+
+class SessionStore(ABC):
+    """세션 상태(context:, pending:, news: 등) 저장소 인터페이스
+
+    값은 문자열로 저장하며, JSON 값은 *_json 헬퍼를 사용한다.
+    max_entries가 주어지면 마지막 접근 시각 기준 LRU로 크기를 제한한다.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def mget(self, keys: Sequence[str]) -> List[Optional[str]]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int, nx: bool = False) -> bool:
+        """값을 저장합니다. nx=True면 키가 없을 때만 저장하고, 저장 여부를 반환합니다."""
+
+    @abstractmethod
+    async def mset(self, mapping: Dict[str, str], ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> int:
+        ...
+
+    @abstractmethod
+    async def touch(self, key: str, ttl: int) -> bool:
+        """남은 TTL이 ttl보다 짧으면 ttl로 연장합니다. (줄이지는 않음)"""
+
+    @abstractmethod
+    async def ttl(self, key: str) -> Optional[int]:
+        """남은 TTL(초)을 반환합니다. 키가 없거나 만료 시각이 없으면 None"""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1) -> int:
+        ...
+
+    @abstractmethod
+    async def hset(self, key: str, field: str, value: str, ttl: int) -> int:
+        """해시의 필드 하나를 저장하고 키 TTL을 ttl로 맞춥니다. 저장 후 필드 수를 반환합니다."""
+
+    @abstractmethod
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    async def hdel(self, key: str, *fields: str) -> int:
+        ...
+
+    @abstractmethod
+    async def size(self) -> dict:
+        """저장된 항목 수와 사용량을 보고합니다."""
+
+    async def close(self) -> None:
+        pass
+
+    async def execute(self, batch: StoreBatch) -> List[Any]:
+        """명령 묶음을 실행합니다. 기본 구현은 명령을 차례로 호출한다."""
+        return [await getattr(self, op)(*args) for op, *args in batch.ops]
+
+    async def get_json(self, key: str) -> Any:
+        raw = await self.get(key)
+        return json.loads(raw) if raw else None
+
+    async def mget_json(self, keys: Sequence[str]) -> List[Any]:
+        return [json.loads(raw) if raw else None for raw in await self.mget(keys)]
+
+    async def set_json(self, key: str, value: Any, ttl: int, nx: bool = False) -> bool:
+        return await self.set(key, json.dumps(value, ensure_ascii=False), ttl, nx=nx)
+
+
+class RedisSessionStore(SessionStore):
+    """Redis 백엔드 (여러 워커/컨테이너가 세션을 공유)"""
+
+    def __init__(self, client, max_entries: Optional[int] = None, lru_key: Optional[str] = None):
+        self.client = client
+        self.max_entries = max_entries
+        self.lru_key = lru_key
+
+    @timed_upstream("redis")
+    async def get(self, key: str) -> Optional[str]:
+        if not self.max_entries:
+            return await self.client.get(key)
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.zadd(self.lru_key, {key: time.time()}, xx=True)  # 접근 시각 갱신
+            value, _ = await pipe.execute()
+        return value
+
+    @timed_upstream("redis")
+    async def mget(self, keys: Sequence[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        return await self.client.mget(list(keys))
+
+    @timed_upstream("redis")
+    async def set(self, key: str, value: str, ttl: int, nx: bool = False) -> bool:
+        if not self.max_entries:
+            return bool(await self.client.set(key, value, ex=ttl, nx=nx))
+
+        now = time.time()
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl, nx=nx)
+            pipe.zadd(self.lru_key, {key: now})
+            pipe.zremrangebyscore(self.lru_key, "-inf", now - ttl)  # TTL 만료된 항목 정리
+            pipe.zcard(self.lru_key)
+            stored, _, _, count = await pipe.execute()
+
+        # 최대 개수 초과분은 가장 오래 접근하지 않은 항목부터 제거
+        overflow = count - self.max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in await self.client.zpopmin(self.lru_key, overflow)]
+            if evicted:
+                await self.client.delete(*evicted)
+        return bool(stored)
+
+    @timed_upstream("redis")
+    async def mset(self, mapping: Dict[str, str], ttl: int) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+    @timed_upstream("redis")
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        if self.max_entries:
+            await self.client.zrem(self.lru_key, *keys)
+        return await self.client.delete(*keys)
+
+    @timed_upstream("redis")
+    async def touch(self, key: str, ttl: int) -> bool:
+        return bool(await self.client.expire(key, ttl, gt=True))
+
+    @timed_upstream("redis")
+    async def ttl(self, key: str) -> Optional[int]:
+        remaining = await self.client.ttl(key)
+        return remaining if remaining >= 0 else None
+
+    @timed_upstream("redis")
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return await self.client.incrby(key, amount)
+
+    @timed_upstream("redis")
+    async def hset(self, key: str, field: str, value: str, ttl: int) -> int:
+        # 필드 단위 저장이라 같은 키에 동시에 써도 서로의 필드를 덮어쓰지 않는다
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, field, value)
+            pipe.expire(key, ttl)
+            pipe.hlen(key)
+            _, _, count = await pipe.execute()
+        return count
+
+    @timed_upstream("redis")
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return await self.client.hgetall(key)
+
+    @timed_upstream("redis")
+    async def hdel(self, key: str, *fields: str) -> int:
+        if not fields:
+            return 0
+        return await self.client.hdel(key, *fields)
+
+    @timed_upstream("redis")
+    async def size(self) -> dict:
+        if self.max_entries:
+            return {"backend": "redis", "entries": await self.client.zcard(self.lru_key),
+                    "max_entries": self.max_entries}
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.dbsize()
+            pipe.info("memory")
+            entries, memory = await pipe.execute()
+        return {"backend": "redis", "entries": entries, "used_memory_bytes": memory.get("used_memory")}
+
+    @timed_upstream("redis")
+    async def execute(self, batch: StoreBatch) -> List[Any]:
+        if self.max_entries:
+            # LRU 접근 기록이 필요한 저장소는 명령별 처리를 따른다
+            return await super().execute(batch)
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for op, *args in batch.ops:
+                if op == "get":
+                    pipe.get(args[0])
+                elif op == "set":
+                    key, value, ttl, nx = args
+                    pipe.set(key, value, ex=ttl, nx=nx)
+                elif op == "touch":
+                    pipe.expire(args[0], args[1], gt=True)
+            results = await pipe.execute()
+        return [result if op == "get" else bool(result) for (op, *_), result in zip(batch.ops, results)]
+
+    async def close(self) -> None:
+        await self.client.connection_pool.disconnect()
+
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내 LRU 백엔드 (단일 노드 배포나 Redis 없는 테스트용)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()  # 키 → (값, 만료 시각)
+
+    def _live(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _put(self, key: str, value: Any, expires_at: float) -> None:
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._live(key)
+        return None if entry is None else entry[0]
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[str]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: str, ttl: int, nx: bool = False) -> bool:
+        if nx and self._live(key) is not None:
+            return False
+        self._put(key, value, time.time() + ttl)
+        return True
+
+    async def mset(self, mapping: Dict[str, str], ttl: int) -> None:
+        expires_at = time.time() + ttl
+        for key, value in mapping.items():
+            self._put(key, value, expires_at)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def touch(self, key: str, ttl: int) -> bool:
+        entry = self._live(key)
+        if entry is None:
+            return False
+        expires_at = time.time() + ttl
+        if expires_at <= entry[1]:
+            return False
+        self._data[key] = (entry[0], expires_at)
+        return True
+
+    async def ttl(self, key: str) -> Optional[int]:
+        entry = self._live(key)
+        if entry is None or entry[1] == float("inf"):
+            return None
+        return max(0, int(entry[1] - time.time()))
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        entry = self._live(key)
+        value = (int(entry[0]) if entry else 0) + amount
+        # 카운터는 만료시키지 않는다
+        self._put(key, str(value), entry[1] if entry else float("inf"))
+        return value
+
+    async def hset(self, key: str, field: str, value: str, ttl: int) -> int:
+        entry = self._live(key)
+        fields = dict(entry[0]) if entry else {}
+        fields[field] = value
+        self._put(key, fields, time.time() + ttl)
+        return len(fields)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        entry = self._live(key)
+        return dict(entry[0]) if entry else {}
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        entry = self._live(key)
+        if entry is None:
+            return 0
+        remaining = {f: v for f, v in entry[0].items() if f not in fields}
+        self._data[key] = (remaining, entry[1])
+        return len(entry[0]) - len(remaining)
+
+    async def size(self) -> dict:
+        now = time.time()
+        live = [(k, v) for k, (v, exp) in self._data.items() if exp > now]
+        return {
+            "backend": "memory",
+            "entries": len(live),
+            "max_entries": self.max_entries,
+            "approx_bytes": sum(len(k) + (sum(map(len, v.values())) if isinstance(v, dict) else len(v))
+                                for k, v in live),
+        }
+
+
+_redis_client = None
+
+
+def _get_redis_client():
+    # 모든 Redis 저장소가 하나의 커넥션 풀을 공유한다
+    global _redis_client
+    if _redis_client is None:
+        from redis import asyncio as aioredis
+
+        pool = aioredis.ConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            decode_responses=True,
+        )
+        _redis_client = aioredis.Redis(connection_pool=pool)
+    return _redis_client
+
+
+def create_session_store(max_entries: Optional[int] = None, lru_key: Optional[str] = None,
+                         backend: Optional[str] = None) -> SessionStore:
+    """설정(SESSION_STORE_BACKEND)에 맞는 저장소를 만듭니다.
+
+    max_entries를 주면 크기 제한 LRU 저장소가 되며, Redis 백엔드에서는 lru_key에 접근 시각을 기록한다.
+    """
+    backend = backend or settings.SESSION_STORE_BACKEND
+    if backend == "memory":
+        return MemorySessionStore(max_entries or settings.SESSION_STORE_MAX_ENTRIES)
+    if backend == "redis":
+        return RedisSessionStore(_get_redis_client(), max_entries=max_entries, lru_key=lru_key)
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {backend}")
+
+
+# 전역 세션 저장소 인스턴스
+session_store = create_session_store()
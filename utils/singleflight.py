@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import redis
+
+from config.naver_stt_settings import settings, logger
+from utils.metrics import SINGLEFLIGHT_REQUESTS
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나의 실행으로 합칩니다.
+
+    먼저 들어온 호출이 실행을 시작하고, 실행 중에 들어온 같은 키의 호출은 그 결과(또는 예외)를 함께 받는다.
+    실행은 호출자와 분리된 태스크라 어느 호출이 취소되어도 다른 호출에는 영향이 없다.
+    결과를 보관하지는 않으므로 실행이 끝난 뒤 들어온 호출은 다시 실행된다.
+
+    store(세션 저장소)를 주면 워커 간에도 합친다. 잠금을 얻은 워커만 실행해 결과를 잠시 저장하고,
+    다른 워커는 잠금이 풀릴 때까지 결과를 기다렸다가 가져간다. 결과를 받지 못하면 직접 실행한다.
+    """
+
+    POLL_INTERVAL = 0.05  # 초
+
+    def __init__(self, name: str = "default", store=None,
+                 lock_ttl: Optional[int] = None, result_ttl: Optional[int] = None):
+        self.name = name
+        self.store = store
+        self.lock_ttl = lock_ttl or settings.SINGLEFLIGHT_LOCK_TTL
+        self.result_ttl = result_ttl or settings.SINGLEFLIGHT_RESULT_TTL
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0       # 실제 실행 횟수
+        self.coalesced = 0   # 진행 중인 실행에 합류한 횟수
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                 encode: Optional[Callable[[Any], Optional[dict]]] = None,
+                 decode: Optional[Callable[[dict], Any]] = None) -> Any:
+        """key로 fn 실행을 합칩니다.
+
+        encode/decode는 워커 간 공유 시 결과를 JSON 값으로 바꾸는 함수이며,
+        encode가 None을 돌려주면 (실패 결과 등) 다른 워커와 공유하지 않는다.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            SINGLEFLIGHT_REQUESTS.labels(self.name, "coalesced").inc()
+        else:
+            # 실행은 호출자와 분리된 태스크로 돌린다
+            # 먼저 들어온 호출(클라이언트 연결 끊김 등)이 취소되어도 합류한 호출은 결과를 받는다
+            task = asyncio.create_task(self._run(key, fn, encode, decode))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, fn, encode, decode) -> Any:
+        try:
+            if self.store is not None:
+                return await self._do_distributed(str(key), fn, encode or (lambda v: v), decode or (lambda v: v))
+            self.calls += 1
+            SINGLEFLIGHT_REQUESTS.labels(self.name, "leader").inc()
+            return await fn()
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _do_distributed(self, key: str, fn, encode, decode) -> Any:
+        lock_key = f"singleflight:{self.name}:lock:{key}"
+        result_key = f"singleflight:{self.name}:result:{key}"
+
+        try:
+            locked = await self.store.set(lock_key, uuid.uuid4().hex, self.lock_ttl, nx=True)
+        except redis.RedisError as e:
+            logger.warning(f"요청 합치기 잠금 실패 ({self.name}): {str(e)}")
+            locked = True  # 저장소 장애 시에는 합치지 않고 바로 실행
+
+        if not locked:
+            shared = await self._wait_for_result(lock_key, result_key, decode)
+            if shared is not None:
+                self.coalesced += 1
+                SINGLEFLIGHT_REQUESTS.labels(self.name, "coalesced").inc()
+                return shared
+
+        self.calls += 1
+        SINGLEFLIGHT_REQUESTS.labels(self.name, "leader").inc()
+        try:
+            result = await fn()
+            value = encode(result)
+            if value is not None:
+                try:
+                    await self.store.set_json(result_key, value, self.result_ttl)
+                except redis.RedisError as e:
+                    # 공유만 못 할 뿐 결과는 이미 있으므로 그대로 돌려준다 (기다리던 워커는 직접 실행)
+                    logger.warning(f"요청 합치기 결과 저장 실패 ({self.name}): {str(e)}")
+            return result
+        finally:
+            if locked:
+                try:
+                    await self.store.delete(lock_key)
+                except redis.RedisError as e:
+                    logger.warning(f"요청 합치기 잠금 해제 실패 ({self.name}): {str(e)}")
+
+    async def _wait_for_result(self, lock_key: str, result_key: str, decode) -> Any:
+        # 다른 워커가 실행 중: 결과가 저장되거나 잠금이 풀릴 때까지 기다린다
+        deadline = time.monotonic() + self.lock_ttl
+        try:
+            while time.monotonic() < deadline:
+                raw_result, lock = await self.store.mget([result_key, lock_key])
+                if raw_result:
+                    return decode(json.loads(raw_result))
+                if not lock:
+                    return None
+                await asyncio.sleep(self.POLL_INTERVAL)
+        except redis.RedisError as e:
+            logger.warning(f"요청 합치기 결과 조회 실패 ({self.name}): {str(e)}")
+        return None
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced, "inflight": len(self._inflight)}
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # 기다리던 호출이 모두 취소된 뒤 실패해도 "exception was never retrieved" 경고가 남지 않도록 읽어둔다
+    if not task.cancelled():
+        task.exception()
+
+
+def create_singleflight(name: str) -> SingleFlight:
+    """설정(SINGLEFLIGHT_DISTRIBUTED)에 따라 프로세스 내 또는 워커 간 SingleFlight를 만듭니다."""
+    if settings.SINGLEFLIGHT_DISTRIBUTED:
+        from utils.redis_utils import store
+        return SingleFlight(name, store=store)
+    return SingleFlight(name)
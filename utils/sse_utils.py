@@ -0,0 +1,7 @@
+import json
+
+
+def format_sse(event: str, data) -> str:
+    """Server-Sent Events 한 건을 직렬화합니다. (data는 JSON으로 인코딩)"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
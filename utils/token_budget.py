@@ -0,0 +1,26 @@
+import math
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 토큰 수를 보수적으로 추정합니다.
+
+    영문/숫자 등 ASCII는 약 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰으로 계산한다.
+    """
+    ascii_count = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_count / 4) + (len(text) - ascii_count)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 뒷부분을 잘라냅니다."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 앞부분 길이에 대해 추정치가 단조 증가하므로 이분 탐색
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low]
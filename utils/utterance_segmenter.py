@@ -0,0 +1,132 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from config.naver_stt_settings import settings
+from utils.audio_preprocess import frame_energy_db
+
+
+@dataclass
+class Utterance:
+    """스트림에서 잘라낸 발화 한 개 (시작/끝은 스트림 시작 기준 초)"""
+    start: float
+    end: float
+    samples: np.ndarray
+
+
+class UtteranceSegmenter:
+    """PCM16 모노 스트림에서 발화 경계를 찾는 에너지 기반 엔드포인터
+
+    프레임 에너지가 임계값(고정 임계값과 지금까지의 최대 에너지 대비 상대 임계값 중 높은 쪽)을 넘으면
+    발화가 시작되고, STT_WS_END_SILENCE_MS 동안 조용하면 끝난 것으로 본다.
+    쉼 없이 STT_SEGMENT_MAX_SECONDS를 넘기면 그 자리에서 자른다.
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, sample_rate * settings.STT_VAD_FRAME_MS // 1000)
+
+        frame_ms = settings.STT_VAD_FRAME_MS
+        self.end_frames = max(1, settings.STT_WS_END_SILENCE_MS // frame_ms)
+        self.min_voiced_frames = max(1, settings.STT_WS_MIN_SPEECH_MS // frame_ms)
+        self.max_frames = max(1, int(settings.STT_SEGMENT_MAX_SECONDS * 1000) // frame_ms)
+        self.padding_frames = settings.STT_SILENCE_PADDING_MS // frame_ms
+
+        self._leftover = b""                      # 샘플 경계에 걸친 바이트
+        self._samples = np.empty(0, np.float32)   # 프레임 경계에 걸친 샘플
+        self._position = 0                        # 지금까지 처리한 프레임 수
+        self._peak_db = settings.STT_SILENCE_THRESHOLD_DB
+
+        self._preroll = deque(maxlen=self.padding_frames or 1)
+        self._frames: List[np.ndarray] = []
+        self._start = 0
+        self._voiced = 0
+        self._silence = 0
+        self._in_speech = False
+
+    def feed(self, pcm: bytes) -> List[Utterance]:
+        """PCM16LE 바이트를 받아 이번에 끝난 발화 목록을 반환합니다."""
+        data = self._leftover + pcm
+        usable = len(data) - len(data) % 2
+        self._leftover = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+        samples = np.concatenate([self._samples, samples]) if self._samples.size else samples
+        n_frames = samples.size // self.frame_len
+        self._samples = samples[n_frames * self.frame_len:]
+        if n_frames == 0:
+            return []
+
+        # 에너지는 한 번에 계산하고, 상태 전이만 프레임 단위로 따라간다
+        energy_db, _ = frame_energy_db(samples[:n_frames * self.frame_len], self.sample_rate)
+        frames = samples[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        self._peak_db = max(self._peak_db, float(energy_db.max()))
+        threshold = max(settings.STT_SILENCE_THRESHOLD_DB, self._peak_db - settings.STT_VAD_DYNAMIC_RANGE_DB)
+
+        finished = []
+        for frame, voiced in zip(frames, energy_db > threshold):
+            utterance = self._step(frame, bool(voiced))
+            if utterance is not None:
+                finished.append(utterance)
+            self._position += 1
+        return finished
+
+    def flush(self) -> Optional[Utterance]:
+        """스트림이 끝났을 때 진행 중인 발화를 마무리합니다."""
+        if self._samples.size:
+            self._frames.append(self._samples)
+            self._samples = np.empty(0, np.float32)
+        return self._finish(trailing_silence=self._silence) if self._in_speech else None
+
+    def _step(self, frame: np.ndarray, voiced: bool) -> Optional[Utterance]:
+        if not self._in_speech:
+            if not voiced:
+                if self.padding_frames:
+                    self._preroll.append(frame)
+                return None
+            # 발화 시작: 앞쪽 여유 프레임을 함께 붙인다
+            self._in_speech = True
+            self._frames = list(self._preroll)
+            self._start = self._position - len(self._preroll)
+            self._preroll.clear()
+            self._voiced = 0
+            self._silence = 0
+
+        self._frames.append(frame)
+        if voiced:
+            self._voiced += 1
+            self._silence = 0
+        else:
+            self._silence += 1
+
+        if self._silence >= self.end_frames:
+            return self._finish(trailing_silence=self._silence)
+        if len(self._frames) >= self.max_frames:
+            # 쉼 없이 길어지면 자르고 바로 다음 발화를 이어 받는다
+            utterance = self._finish(trailing_silence=0)
+            self._in_speech = True
+            self._frames = []
+            self._start = self._position + 1
+            return utterance
+        return None
+
+    def _finish(self, trailing_silence: int) -> Optional[Utterance]:
+        # 끝쪽 무음은 여유 프레임만 남기고 버린다
+        keep = len(self._frames) - max(0, trailing_silence - self.padding_frames)
+        frames = self._frames[:keep]
+        voiced = self._voiced
+
+        self._in_speech = False
+        self._frames = []
+        self._voiced = 0
+        self._silence = 0
+
+        if voiced < self.min_voiced_frames or not frames:
+            return None  # 클릭음 같은 짧은 소리는 버린다
+
+        samples = np.concatenate(frames)
+        start = self._start * self.frame_len / self.sample_rate
+        return Utterance(start=round(start, 2), end=round(start + samples.size / self.sample_rate, 2),
+                         samples=samples)